@@ -0,0 +1,200 @@
+"""
+HTTP/2 against HTTP/1.1 at high concurrency, with a local TLS stand-in for
+the API that answers every request after a fixed delay (the latency of the
+API) and counts the connections it accepts:
+
+    python benchmarks/http2.py [--workers 64] [--calls 2000] [--delay 0.02]
+
+Needs httpx[http2] and openssl (for a throwaway certificate). Async
+transports are measured when aiohttp is installed.
+"""
+import argparse, asyncio, json, multiprocessing, os, ssl, subprocess, sys, \
+    tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from wowza import Client, LiveStreams
+from wowza.http2 import Http2Transport, AsyncHttp2Transport
+from wowza.transport import RequestsTransport
+
+BODY = json.dumps({'live_stream': {'state': 'started'}}).encode('utf-8')
+HTTP1_RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n' \
+    b'Content-Length: %d\r\n\r\n%s' % (len(BODY), BODY)
+
+
+def certificate(directory):
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+        '-keyout', key, '-out', cert, '-days', '1', '-subj', '/CN=localhost',
+        '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'],
+        check=True, capture_output=True)
+    return cert, key
+
+
+class StandIn(asyncio.Protocol):
+    """
+    Answers GETs over HTTP/2 or HTTP/1.1, depending on ALPN
+    """
+
+    def __init__(self, delay, connections):
+        self.delay = delay
+        self.connections = connections
+
+    def connection_made(self, transport):
+        import h2.config, h2.connection
+        self.transport = transport
+        self.loop = asyncio.get_event_loop()
+        with self.connections.get_lock():
+            self.connections.value += 1
+        ssl_object = transport.get_extra_info('ssl_object')
+        self.h2 = None
+        self.buffer = b''
+        if ssl_object.selected_alpn_protocol() == 'h2':
+            self.h2 = h2.connection.H2Connection(
+                h2.config.H2Configuration(client_side=False))
+            self.h2.initiate_connection()
+            transport.write(self.h2.data_to_send())
+
+    def data_received(self, data):
+        if self.h2 is None:
+            self.buffer += data
+            while b'\r\n\r\n' in self.buffer:
+                head, _, self.buffer = self.buffer.partition(b'\r\n\r\n')
+                self.loop.call_later(self.delay, self._write, HTTP1_RESPONSE)
+            return
+        import h2.events
+        for event in self.h2.receive_data(data):
+            if isinstance(event, h2.events.StreamEnded):
+                self.loop.call_later(self.delay, self._respond, event.stream_id)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self._write(self.h2.data_to_send())
+
+    def _respond(self, stream_id):
+        self.h2.send_headers(stream_id, [(':status', '200'),
+            ('content-type', 'application/json'),
+            ('content-length', str(len(BODY)))])
+        self.h2.send_data(stream_id, BODY, end_stream=True)
+        self._write(self.h2.data_to_send())
+
+    def _write(self, data):
+        if data and not self.transport.is_closing():
+            self.transport.write(data)
+
+
+def serve(cert, key, delay, port, connections):
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    context.set_alpn_protocols(['h2', 'http/1.1'])
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(loop.create_server(
+        lambda: StandIn(delay, connections), '127.0.0.1', 0, ssl=context,
+        backlog=1024))
+    port.value = server.sockets[0].getsockname()[1]
+    loop.run_forever()
+
+
+def run_sync(transport, base_url, workers, calls):
+    live_streams = LiveStreams(client=Client(base_url=base_url, api_key='key',
+        access_key='secret', transport=transport))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: live_streams.info('abc', 'state'),
+            range(calls)))
+    elapsed = time.perf_counter() - started
+    transport.close()
+    return elapsed
+
+
+def run_async(make_transport, base_url, workers, calls):
+    from wowza.aio import LiveStreams as AsyncLiveStreams
+    from wowza.aio.client import AsyncClient
+
+    async def main():
+        transport = make_transport()
+        live_streams = AsyncLiveStreams(client=AsyncClient(base_url=base_url,
+            api_key='key', access_key='secret', transport=transport))
+        limit = asyncio.Semaphore(workers)
+
+        async def call():
+            async with limit:
+                await live_streams.info('abc', 'state')
+
+        started = time.perf_counter()
+        await asyncio.gather(*[call() for _ in range(calls)])
+        elapsed = time.perf_counter() - started
+        await transport.close()
+        return elapsed
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=64)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--delay', type=float, default=0.02)
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp()
+    cert, key = certificate(directory)
+    port = multiprocessing.Value('i', 0)
+    connections = multiprocessing.Value('i', 0)
+    server = multiprocessing.Process(target=serve, daemon=True,
+        args=(cert, key, args.delay, port, connections))
+    server.start()
+    while not port.value:
+        time.sleep(0.01)
+    base_url = 'https://127.0.0.1:{}/api/v1/'.format(port.value)
+
+    def context():
+        # A context per transport: httpx sets its ALPN protocols on it
+        return ssl.create_default_context(cafile=cert)
+
+    def requests_transport():
+        # The pool of the current default: extra workers open throwaway
+        # connections
+        transport = RequestsTransport()
+        transport.session.trust_env = False
+        transport.session.verify = cert
+        return transport
+
+    runs = [
+        ('requests HTTP/1.1', lambda: run_sync(requests_transport(), base_url,
+            args.workers, args.calls)),
+        ('httpx HTTP/2', lambda: run_sync(Http2Transport(verify=context(),
+            max_connections=4), base_url, args.workers, args.calls)),
+    ]
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp = None
+    if aiohttp is not None:
+        from wowza.aio.transport import AiohttpTransport
+
+        def aiohttp_transport():
+            transport = AiohttpTransport()
+            transport._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ssl=context()))
+            return transport
+
+        runs += [
+            ('aiohttp HTTP/1.1', lambda: run_async(aiohttp_transport, base_url,
+                args.workers, args.calls)),
+            ('httpx HTTP/2 async', lambda: run_async(lambda: AsyncHttp2Transport(
+                verify=context(), max_connections=4), base_url, args.workers,
+                args.calls)),
+        ]
+    print('{} calls, {} at a time, {:.0f} ms of latency'.format(args.calls,
+        args.workers, args.delay * 1000))
+    for name, run in runs:
+        before = connections.value
+        elapsed = run()
+        print('{:<20} {:>7.0f} calls/s {:>5} connections'.format(name,
+            args.calls / elapsed, connections.value - before))
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Time `import wowza` takes in a fresh interpreter, as reported by
+python -X importtime (best of several runs):
+
+    python benchmarks/import_time.py [runs]
+
+It took ~90ms when the package imported requests and built a session,
+~35ms without.
+"""
+import os, subprocess, sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def import_time():
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+        'import wowza'], cwd=ROOT, capture_output=True, text=True,
+        check=True).stderr
+    line = [l for l in stderr.splitlines() if l.endswith('| wowza')][0]
+    return int(line.split('|')[1]) / 1e6
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    timings = [import_time() for _ in range(runs)]
+    print('import wowza: {:.1f} ms (best of {}), {:.1f} ms (worst)'.format(
+        min(timings) * 1000, runs, max(timings) * 1000))
+
+
+if __name__ == '__main__':
+    main()
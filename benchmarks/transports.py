@@ -0,0 +1,59 @@
+"""
+Per-call overhead of the transports, against a local stand-in for the API
+and in memory (the cost of the library alone):
+
+    python benchmarks/transports.py [calls]
+"""
+import json, os, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from wowza import Client, LiveStreams
+from wowza.transport import RequestsTransport, Urllib3Transport, MemoryTransport
+
+BODY = json.dumps({'live_stream': {'state': 'started'}}).encode('utf-8')
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        # One write for the status line, headers and body: separate small
+        # writes run into delayed ACKs and measure those instead
+        self.wfile.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+            b'Content-Length: %d\r\n\r\n%s' % (len(BODY), BODY))
+
+
+def measure(transport, base_url, calls):
+    live_streams = LiveStreams(client=Client(base_url=base_url, api_key='key',
+        access_key='secret', transport=transport))
+    live_streams.info('abc', 'state')
+    started = time.perf_counter()
+    for _ in range(calls):
+        live_streams.info('abc', 'state')
+    elapsed = time.perf_counter() - started
+    transport.close()
+    return elapsed / calls * 1e6
+
+
+def main(calls=2000):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = 'http://127.0.0.1:{}/api/v1/'.format(server.server_address[1])
+    results = [
+        ('requests', measure(RequestsTransport(), base_url, calls)),
+        ('urllib3', measure(Urllib3Transport(), base_url, calls)),
+        ('memory', measure(MemoryTransport(lambda *request: (200, BODY, {})),
+            base_url, calls)),
+    ]
+    server.shutdown()
+    for name, micros in results:
+        print('{:<10} {:>8.1f} us/call'.format(name, micros))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
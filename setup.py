@@ -2,7 +2,7 @@ from distutils.core import setup
 
 setup(
     name = 'wowza',
-    packages = ['wowza'],
+    packages = ['wowza', 'wowza.aio'],
     version = '0.5.0',
     description = 'Python API wrapper for Wowza API',
     license = 'MIT',
@@ -12,5 +12,11 @@ setup(
     download_url = 'https://github.com/atlusio/wowza/archive/0.5.0.tar.gz',
     keywords = 'wowza api wrapper python live streaming',
     classifiers = [],
-    install_requires = ['vcrpy', 'requests', 'pytest']
+    install_requires = ['vcrpy', 'requests', 'pytest'],
+    extras_require = {
+        'aio': ['aiohttp'],
+        'http2': ['httpx[http2]'],
+        'orjson': ['orjson'],
+        'stats': ['numpy']
+    }
 )
@@ -0,0 +1,94 @@
+import json, os, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+
+os.environ.setdefault('WOWZA_API_KEY', 'test-api-key')
+os.environ.setdefault('WOWZA_ACCESS_KEY', 'test-access-key')
+
+
+class StubApi(object):
+    """
+    Minimal stand-in for the Wowza API, served from a local thread.
+    Responses are registered per (method, path); every request received is
+    recorded in #requests as (method, path, headers, body).
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = 'http://127.0.0.1:{}/api/v1/'.format(
+            self.server.server_address[1])
+
+    def add(self, method, path, body=None, status=200, headers=None):
+        """
+        Registers a response. body can be a dict, bytes, or a callable
+        taking the request and returning (status, body, headers).
+        """
+        self.routes[(method, '/api/v1/' + path)] = (status, body, headers or {})
+
+    def paged(self, key, total):
+        """
+        Returns a route serving total records in pages
+        """
+        def route(handler, body):
+            query = parse_qs(urlparse(handler.path).query)
+            page, per_page = int(query['page'][0]), int(query['per_page'][0])
+            start = (page - 1) * per_page
+            records = [{'id': 'r{}'.format(i)}
+                for i in range(start, min(start + per_page, total))]
+            return 200, {key: records}, {}
+        return route
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('content-length') or 0)
+                body = self.rfile.read(length) if length else b''
+                path = self.path.split('?')[0]
+                with api.lock:
+                    api.requests.append(
+                        (self.command, path, dict(self.headers), body))
+                route = api.routes.get((self.command, path))
+                if route is None:
+                    status, payload, headers = 404, {'meta': {
+                        'status': 404, 'code': 'ERR-404-RecordNotFound',
+                        'message': 'The requested resource couldn\'t be found.'
+                    }}, {}
+                else:
+                    status, payload, headers = route
+                    if callable(payload):
+                        status, payload, headers = payload(self, body)
+                if isinstance(payload, (dict, list)):
+                    payload = json.dumps(payload).encode('utf-8')
+                payload = payload or b''
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        return Handler
+
+
+@pytest.fixture
+def api():
+    stub = StubApi()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
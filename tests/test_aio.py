@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from wowza import aio
+from wowza.exceptions import InvalidStateChange, MissingParameter
+
+
+def run(coroutine):
+    async def runner():
+        try:
+            return await coroutine
+        finally:
+            await aio.close()
+    return asyncio.run(runner())
+
+
+def test_aio_stream_info(api):
+    """
+    Tests that the async classes build the same paths as the sync ones
+    """
+    api.add('GET', 'live_streams/abc123/state',
+        {'live_stream': {'state': 'started'}})
+    live_streams = aio.LiveStreams(base_url=api.url)
+    response = run(live_streams.info('abc123', 'state'))
+    assert response == {'live_stream': {'state': 'started'}}
+    assert api.requests[0][0] == 'GET'
+
+
+def test_aio_stream_stop_not_running(api):
+    """
+    Tests that the pre-flight state check is awaited before stopping
+    """
+    api.add('GET', 'live_streams/abc123/state',
+        {'live_stream': {'state': 'stopped'}})
+    live_streams = aio.LiveStreams(base_url=api.url)
+    with pytest.raises(InvalidStateChange):
+        run(live_streams.stop('abc123'))
+    assert len(api.requests) == 1
+
+
+def test_aio_concurrent_calls(api):
+    """
+    Tests that many calls can be in flight on one event loop
+    """
+    api.add('GET', 'transcoders/t1', {'transcoder': {'id': 't1'}})
+    transcoders = aio.Transcoders(base_url=api.url + 'transcoders/')
+
+    async def gather():
+        return await asyncio.gather(
+            *[transcoders.info('t1') for _ in range(20)])
+
+    responses = run(gather())
+    assert len(responses) == 20
+    assert all(r['transcoder']['id'] == 't1' for r in responses)
+
+
+def test_aio_validation_is_shared():
+    """
+    Tests that validation errors are raised before any request is made
+    """
+    with pytest.raises(MissingParameter):
+        aio.Transcoders().create({'name': 'Test'})
+
+
+def test_aio_delete_returns_response(api):
+    api.add('DELETE', 'stream_targets/st1', b'', status=204)
+    stream_targets = aio.StreamTargets(base_url=api.url + 'stream_targets/')
+    response = run(stream_targets.delete('st1'))
+    assert response.status_code == 204
@@ -0,0 +1,71 @@
+import asyncio, threading, time
+import pytest
+from wowza import LiveStreams
+from wowza.bulk import run_many
+from wowza.exceptions import RecordNotFound, DeadlineExceeded, \
+    DeadlineInFlight
+
+
+def test_start_many(api):
+    """
+    Tests that a failing id is reported without aborting the batch
+    """
+    for stream_id in ['a', 'b', 'c']:
+        api.add('PUT', 'live_streams/{}/start'.format(stream_id),
+            {'live_stream': {'id': stream_id, 'state': 'starting'}})
+    live_streams = LiveStreams(base_url=api.url)
+    result = live_streams.start_many(['a', 'b', 'missing', 'c', 'a'])
+    assert sorted(result.results) == ['a', 'b', 'c']
+    assert isinstance(result.errors['missing'], RecordNotFound)
+    assert not result.ok
+    assert len(api.requests) == 4
+
+
+def test_run_many_concurrency_limit():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def work(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return i
+
+    result = run_many(work, range(40), max_workers=4)
+    assert len(result.results) == 40
+    assert peak[0] <= 4
+
+
+def test_run_many_deadline():
+    def work(i):
+        time.sleep(0.5 if i else 0)
+        return i
+
+    started = time.time()
+    result = run_many(work, [0, 1, 2, 3], max_workers=2, deadline=0.1)
+    assert time.time() - started < 0.4
+    assert result.results == {0: 0}
+    assert isinstance(result.errors[1], DeadlineInFlight)
+    # Never started
+    assert isinstance(result.errors[3], DeadlineExceeded)
+    assert not isinstance(result.errors[3], DeadlineInFlight)
+
+
+def test_aio_run_many():
+    aio_bulk = pytest.importorskip('wowza.aio.bulk')
+
+    async def work(i):
+        if i == 'bad':
+            raise RecordNotFound({'message': 'nope'})
+        await asyncio.sleep(0.5 if i == 'slow' else 0)
+        return i
+
+    result = asyncio.run(aio_bulk.run_many(work, ['a', 'bad', 'slow', 'late'],
+        max_workers=1, deadline=0.1))
+    assert result.results == {'a': 'a'}
+    assert isinstance(result.errors['bad'], RecordNotFound)
+    assert isinstance(result.errors['slow'], DeadlineInFlight)
+    assert not isinstance(result.errors['late'], DeadlineInFlight)
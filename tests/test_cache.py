@@ -0,0 +1,163 @@
+import asyncio, threading, time
+import pytest
+from wowza import Client, LiveStreams, StreamTargets
+from wowza.cache import ResponseCache, MISS
+
+
+def test_cache_ttl_and_lru():
+    cache = ResponseCache(default_ttl=60, ttls=[(r'/state$', 0.05)],
+        max_entries=2)
+    cache.set('a/state', 'a/state', {'state': 'started'})
+    cache.set('b', 'b', 1)
+    assert cache.get('a/state') == {'state': 'started'}
+    time.sleep(0.06)
+    assert cache.get('a/state') is MISS
+    cache.set('c', 'c', 2)
+    cache.set('d', 'd', 3)
+    assert cache.get('b') is MISS
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['evictions'] == 1 and stats['size'] == 2
+
+
+def test_cache_invalidation():
+    base = 'https://api/api/v1/'
+    cache = ResponseCache(default_ttl=60)
+    for path in ['live_streams/', 'live_streams/abc', 'live_streams/abc/state',
+        'transcoders/abc/state', 'live_streams/xyz', 'players/p1']:
+        cache.set(base + path, base + path, path)
+    cache.invalidate(base + 'live_streams/abc/start', base)
+    assert cache.get(base + 'live_streams/abc') is MISS
+    assert cache.get(base + 'live_streams/abc/state') is MISS
+    assert cache.get(base + 'transcoders/abc/state') is MISS
+    assert cache.get(base + 'live_streams/') is MISS
+    assert cache.get(base + 'live_streams/xyz') == 'live_streams/xyz'
+    assert cache.get(base + 'players/p1') == 'players/p1'
+
+
+def test_cache_skips_responses_older_than_invalidation():
+    base = 'https://api/api/v1/'
+    cache = ResponseCache(default_ttl=60)
+    generation = cache.generation()
+    cache.invalidate(base + 'live_streams/abc', base)
+    for path in ['live_streams/abc', 'live_streams/xyz']:
+        cache.set(base + path, base + path, path, generation=generation)
+    assert cache.get(base + 'live_streams/abc') is MISS
+    assert cache.get(base + 'live_streams/xyz') == 'live_streams/xyz'
+    generation = cache.generation()
+    cache.clear()
+    cache.set(base + 'players/p1', base + 'players/p1', 1, generation=generation)
+    assert cache.get(base + 'players/p1') is MISS
+
+
+def test_read_racing_update(api):
+    """
+    Tests that a GET answered before a PATCH but finishing after it doesn't
+    cache the body from before the change
+    """
+    answered, updated = threading.Event(), threading.Event()
+    state = {'name': 'a'}
+
+    def read(request, data):
+        body = {'stream_target': dict(state)}
+        answered.set()
+        updated.wait(1)
+        return 200, body, {}
+
+    def update(request, data):
+        state['name'] = 'b'
+        return 200, {'stream_target': dict(state)}, {}
+
+    api.add('GET', 'stream_targets/st1', read)
+    api.add('PATCH', 'stream_targets/st1', update)
+    stream_targets = StreamTargets(client=Client(base_url=api.url,
+        cache=ResponseCache(default_ttl=60)))
+    reader = threading.Thread(target=stream_targets.info, args=('st1',))
+    reader.start()
+    answered.wait(1)
+    stream_targets.update('st1', {'name': 'b'})
+    updated.set()
+    reader.join()
+    assert stream_targets.info('st1') == {'stream_target': {'name': 'b'}}
+
+
+def test_client_cache(api):
+    api.add('GET', 'stream_targets/st1', {'stream_target': {'name': 'a'}})
+    api.add('PATCH', 'stream_targets/st1', {'stream_target': {'name': 'b'}})
+    cache = ResponseCache(default_ttl=60)
+    client = Client(base_url=api.url, cache=cache)
+    stream_targets = StreamTargets(client=client)
+    for _ in range(5):
+        assert stream_targets.info('st1') == {'stream_target': {'name': 'a'}}
+    assert len(api.requests) == 1
+    stream_targets.update('st1', {'name': 'b'})
+    stream_targets.info('st1')
+    assert len(api.requests) == 3
+    assert cache.stats()['hits'] == 4
+
+
+def etag_route(state):
+    def handler(request, data):
+        if request.headers.get('If-None-Match') == state['etag']:
+            return 304, b'', {'ETag': state['etag']}
+        return 200, {'stream_target': {'name': state['name']}}, \
+            {'ETag': state['etag']}
+    return handler
+
+
+def test_conditional_revalidation(api):
+    state = {'etag': '"v1"', 'name': 'a'}
+    api.add('GET', 'stream_targets/st1', etag_route(state))
+    cache = ResponseCache(default_ttl=0)
+    stream_targets = StreamTargets(client=Client(base_url=api.url, cache=cache))
+    first = stream_targets.info('st1')
+    for _ in range(3):
+        assert stream_targets.info('st1') is first
+    assert len(api.requests) == 4
+    assert 'If-None-Match' not in api.requests[0][2]
+    assert all(r[2]['If-None-Match'] == '"v1"' for r in api.requests[1:])
+    assert cache.stats()['revalidations'] == 3
+
+    state.update(etag='"v2"', name='b')
+    assert stream_targets.info('st1') == {'stream_target': {'name': 'b'}}
+    assert stream_targets.info('st1') == {'stream_target': {'name': 'b'}}
+    assert api.requests[-1][2]['If-None-Match'] == '"v2"'
+
+
+def test_conditional_last_modified(api):
+    stamp = 'Wed, 21 Oct 2026 07:28:00 GMT'
+
+    def handler(request, data):
+        if request.headers.get('If-Modified-Since') == stamp:
+            return 304, b'', {}
+        return 200, {'player': {'id': 'p1'}}, {'Last-Modified': stamp}
+
+    api.add('GET', 'players/p1', handler)
+    cache = ResponseCache(default_ttl=0)
+    client = Client(base_url=api.url, cache=cache)
+    client.request('GET', api.url + 'players/p1')
+    assert client.request('GET', api.url + 'players/p1') == {'player': {'id': 'p1'}}
+    assert cache.stats()['revalidations'] == 1
+
+    # Without revalidation, nothing is kept at a ttl of 0
+    cache = ResponseCache(default_ttl=0, revalidate=False)
+    client = Client(base_url=api.url, cache=cache)
+    client.request('GET', api.url + 'players/p1')
+    client.request('GET', api.url + 'players/p1')
+    assert 'If-Modified-Since' not in api.requests[-1][2]
+    assert cache.stats()['size'] == 0
+
+
+def test_aio_conditional_revalidation(api):
+    pytest.importorskip('aiohttp')
+    from wowza.aio.client import AsyncClient
+    state = {'etag': '"v1"', 'name': 'a'}
+    api.add('GET', 'stream_targets/st1', etag_route(state))
+    cache = ResponseCache(default_ttl=0)
+
+    async def poll():
+        async with AsyncClient(base_url=api.url, cache=cache) as client:
+            return [await client.request('GET', api.url + 'stream_targets/st1')
+                for _ in range(3)]
+
+    assert asyncio.run(poll()) == [{'stream_target': {'name': 'a'}}] * 3
+    assert cache.stats()['revalidations'] == 2
@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from wowza import Client, LiveStreams, Transcoders
+from wowza.transport import RequestsTransport
+
+
+def test_client_injection(api):
+    """
+    Tests that endpoint instances share the transport of their client
+    """
+    api.add('GET', 'live_streams/', {'live_streams': []})
+    api.add('GET', 'transcoders/', {'transcoders': []})
+    client = Client(base_url=api.url, api_key='key', access_key='secret')
+    live_streams = LiveStreams(client=client)
+    transcoders = Transcoders(client=client)
+    assert live_streams.client.transport is transcoders.client.transport
+    assert transcoders.base_url == api.url + 'transcoders/'
+    assert live_streams.info() == {'live_streams': []}
+    assert transcoders.info() == {'transcoders': []}
+    assert api.requests[0][2]['wsc-api-key'] == 'key'
+
+
+def test_transport_pool_options():
+    transport = RequestsTransport(pool_connections=2, max_connections=30)
+    adapter = transport.session.get_adapter('https://api.cloud.wowza.com/')
+    assert adapter._pool_maxsize == 30
+    assert adapter._pool_block is True
+    transport.close()
+
+
+def test_transport_per_thread_sessions():
+    transport = RequestsTransport(per_thread=True)
+    sessions = []
+
+    def get_session():
+        sessions.append(transport.session)
+        assert transport.session is sessions[-1]
+
+    threads = [threading.Thread(target=get_session) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(map(id, sessions))) == 4
+    transport.close()
+
+
+def test_client_thread_pool(api):
+    """
+    Tests a client shared by more workers than the default pool size
+    """
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    with Client(base_url=api.url, pool_maxsize=32, per_thread=True) as client:
+        live_streams = LiveStreams(client=client)
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            responses = list(executor.map(
+                lambda _: live_streams.info('abc', 'state'), range(64)))
+    assert len(responses) == 64
+    assert len(api.requests) == 64
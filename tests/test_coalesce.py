@@ -0,0 +1,88 @@
+import asyncio, threading, time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from wowza import Client, LiveStreams
+from wowza.coalesce import SingleFlight
+from wowza.exceptions import RecordNotFound
+
+
+def slow(body, status=200, delay=0.3):
+    def handler(request, data):
+        time.sleep(delay)
+        return status, body, {}
+    return handler
+
+
+def test_concurrent_gets_share_one_request(api):
+    api.add('GET', 'live_streams/abc/state',
+        slow({'live_stream': {'state': 'started'}}))
+    single_flight = SingleFlight()
+    live_streams = LiveStreams(client=Client(base_url=api.url,
+        single_flight=single_flight))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(
+            lambda _: live_streams.info('abc', 'state'), range(8)))
+    assert all(r == {'live_stream': {'state': 'started'}} for r in responses)
+    assert len(api.requests) == 1
+    assert single_flight.shared == 7
+    assert single_flight.in_flight() == 0
+    # Nothing is kept once the response is in
+    live_streams.info('abc', 'state')
+    assert len(api.requests) == 2
+
+
+def test_errors_and_other_requests(api):
+    api.add('GET', 'live_streams/gone', slow({'meta': {'status': 404,
+        'code': 'ERR-404-RecordNotFound', 'message': 'Not found'}}, 404))
+    api.add('PUT', 'live_streams/abc/start', slow({'live_stream': {}}, delay=0.1))
+    client = Client(base_url=api.url, single_flight=SingleFlight())
+    live_streams = LiveStreams(client=client)
+
+    def info(_):
+        with pytest.raises(RecordNotFound):
+            live_streams.info('gone')
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(info, range(4)))
+        list(executor.map(lambda _: live_streams.start('abc'), range(3)))
+    assert [r[0] for r in api.requests].count('GET') == 1
+    assert [r[0] for r in api.requests].count('PUT') == 3
+
+
+def test_credentials_in_key(api):
+    api.add('GET', 'live_streams/abc', slow({'live_stream': {}}))
+    single_flight = SingleFlight()
+    clients = [Client(base_url=api.url, api_key=key, access_key='access',
+        single_flight=single_flight) for key in ('one', 'one', 'two')]
+    threads = [threading.Thread(target=LiveStreams(client=c).info, args=('abc',))
+        for c in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(r[2]['wsc-api-key'] for r in api.requests) == ['one', 'two']
+
+
+def test_aio_single_flight(api):
+    aio = pytest.importorskip('wowza.aio')
+    from wowza.aio.client import AsyncClient
+    from wowza.aio.coalesce import SingleFlight as AsyncSingleFlight
+    api.add('GET', 'live_streams/abc/state',
+        slow({'live_stream': {'state': 'started'}}))
+
+    async def poll():
+        client = AsyncClient(base_url=api.url, single_flight=AsyncSingleFlight())
+        live_streams = aio.LiveStreams(client=client)
+        try:
+            first = asyncio.ensure_future(live_streams.info('abc', 'state'))
+            await asyncio.sleep(0.05)
+            # A cancelled caller doesn't cancel the request for the others
+            first.cancel()
+            return await asyncio.gather(
+                *[live_streams.info('abc', 'state') for _ in range(5)])
+        finally:
+            await client.close()
+
+    responses = asyncio.run(poll())
+    assert responses == [{'live_stream': {'state': 'started'}}] * 5
+    assert len(api.requests) == 1
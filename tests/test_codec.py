@@ -0,0 +1,49 @@
+import pytest
+from wowza import LiveStreams
+from wowza.codec import get_codec, StdlibCodec, OrjsonCodec, orjson
+
+
+def test_get_codec_by_name():
+    assert isinstance(get_codec('json'), StdlibCodec)
+    with pytest.raises(ValueError):
+        get_codec('yaml')
+
+
+def test_get_codec_auto():
+    expected = OrjsonCodec if orjson is not None else StdlibCodec
+    assert isinstance(get_codec(), expected)
+    assert get_codec('auto') is get_codec()
+
+
+@pytest.mark.parametrize('name', ['json', 'orjson'])
+def test_codec_round_trip(name):
+    if name == 'orjson':
+        pytest.importorskip('orjson')
+    codec = get_codec(name)
+    payload = {'live_stream': {'name': 'Test é', 'aspect_ratio_width': 1280}}
+    data = codec.dumps(payload)
+    assert isinstance(data, bytes)
+    assert codec.loads(data) == payload
+
+
+def test_custom_codec(api):
+    """
+    Tests that a resource encodes and decodes through its codec
+    """
+    class CountingCodec(StdlibCodec):
+        calls = []
+
+        def dumps(self, obj):
+            self.calls.append('dumps')
+            return StdlibCodec.dumps(self, obj)
+
+        def loads(self, data):
+            assert isinstance(data, bytes)
+            self.calls.append('loads')
+            return StdlibCodec.loads(self, data)
+
+    api.add('PATCH', 'live_streams/abc', {'live_stream': {'id': 'abc'}})
+    live_streams = LiveStreams(base_url=api.url, codec=CountingCodec())
+    live_streams.update('abc', {'name': 'Test'})
+    assert CountingCodec.calls == ['dumps', 'loads']
+    assert api.requests[0][3] == b'{"live_stream":{"name":"Test"}}'
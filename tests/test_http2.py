@@ -0,0 +1,134 @@
+import asyncio, json, multiprocessing, shutil, ssl, time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from wowza import Client, LiveStreams
+from wowza.exceptions import RecordNotFound
+
+pytest.importorskip('httpx')
+pytest.importorskip('h2')
+
+from wowza.http2 import Http2Transport, AsyncHttp2Transport
+
+
+def test_http2_transport(api):
+    # The stub only speaks HTTP/1.1: this covers the plumbing, the
+    # transport falling back to it
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    api.add('PATCH', 'live_streams/abc', {'live_stream': {'name': 'b'}})
+    api.add('GET', 'live_streams/', {'live_streams': [{'id': 'a'}, {'id': 'b'}]})
+    client = Client(base_url=api.url, transport=Http2Transport())
+    live_streams = LiveStreams(client=client)
+    assert live_streams.info('abc', 'state') == {'live_stream': {'state': 'started'}}
+    live_streams.update('abc', {'name': 'b'})
+    assert json.loads(api.requests[1][3]) == {'live_stream': {'name': 'b'}}
+    with pytest.raises(RecordNotFound):
+        live_streams.info('nope')
+    assert [r['id'] for r in live_streams.iter_live_streams(stream=True)] \
+        == ['a', 'b']
+    client.close()
+
+
+def test_async_http2_transport(api):
+    aio = pytest.importorskip('wowza.aio')
+    from wowza.aio.client import AsyncClient
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    api.add('GET', 'live_streams/', {'live_streams': [{'id': 'a'}]})
+
+    async def run():
+        client = AsyncClient(base_url=api.url, transport=transport)
+        live_streams = aio.LiveStreams(client=client)
+        try:
+            states = await asyncio.gather(
+                *[live_streams.info('abc', 'state') for _ in range(5)])
+            records = [r async for r in live_streams.iter_live_streams(stream=True)]
+            closing = set(transport._closing)
+            with pytest.raises(RecordNotFound):
+                await live_streams.info('nope')
+            return states, records, closing
+        finally:
+            await client.close()
+
+    transport = AsyncHttp2Transport()
+    states, records, closing = asyncio.run(run())
+    # Streamed responses are closed along with the transport
+    assert all(task.done() for task in closing) and not transport._closing
+    assert states == [{'live_stream': {'state': 'started'}}] * 5
+    assert records == [{'id': 'a'}]
+
+
+@pytest.fixture(scope='module')
+def tls_api(tmp_path_factory):
+    """
+    TLS stand-in for the API of benchmarks/http2.py, negotiating HTTP/2 and
+    counting the connections it accepts
+    """
+    if shutil.which('openssl') is None:
+        pytest.skip('openssl is needed for a test certificate')
+    from benchmarks.http2 import certificate, serve
+    cert, key = certificate(str(tmp_path_factory.mktemp('tls')))
+    port = multiprocessing.Value('i', 0)
+    connections = multiprocessing.Value('i', 0)
+    server = multiprocessing.Process(target=serve, daemon=True,
+        args=(cert, key, 0.05, port, connections))
+    server.start()
+    while not port.value:
+        time.sleep(0.01)
+    yield 'https://127.0.0.1:{}/api/v1/'.format(port.value), cert, connections
+    server.terminate()
+
+
+def versions(transport, hook):
+    """
+    Records the HTTP version of every response the transport receives
+    """
+    seen = []
+    transport.client.event_hooks['response'].append(hook(seen))
+    return seen
+
+
+def test_http2_multiplexing(tls_api):
+    base_url, cert, connections = tls_api
+
+    def hook(seen):
+        return lambda response: seen.append(response.http_version)
+
+    transport = Http2Transport(verify=ssl.create_default_context(cafile=cert))
+    seen = versions(transport, hook)
+    live_streams = LiveStreams(client=Client(base_url=base_url, api_key='key',
+        access_key='secret', transport=transport))
+    before = connections.value
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        states = list(executor.map(lambda _: live_streams.info('abc', 'state'),
+            range(20)))
+    transport.close()
+    assert states == [{'live_stream': {'state': 'started'}}] * 20
+    assert seen == ['HTTP/2'] * 20
+    assert connections.value - before == 1
+
+
+def test_async_http2_multiplexing(tls_api):
+    aio = pytest.importorskip('wowza.aio')
+    from wowza.aio.client import AsyncClient
+    base_url, cert, connections = tls_api
+
+    def hook(seen):
+        async def record(response):
+            seen.append(response.http_version)
+        return record
+
+    async def run():
+        transport = AsyncHttp2Transport(
+            verify=ssl.create_default_context(cafile=cert))
+        seen = versions(transport, hook)
+        async with AsyncClient(base_url=base_url, api_key='key',
+            access_key='secret', transport=transport) as client:
+            live_streams = aio.LiveStreams(client=client)
+            states = await asyncio.gather(
+                *[live_streams.info('abc', 'state') for _ in range(20)])
+        return states, seen
+
+    before = connections.value
+    states, seen = asyncio.run(run())
+    assert states == [{'live_stream': {'state': 'started'}}] * 20
+    assert seen == ['HTTP/2'] * 20
+    assert connections.value - before == 1
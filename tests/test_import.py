@@ -0,0 +1,53 @@
+import os, subprocess, sys
+import pytest
+import wowza
+from wowza import config
+from wowza.exceptions import NoApiKey, NoAccessKey
+
+# Modules `import wowza` shouldn't load. The import time itself is measured
+# by benchmarks/import_time.py, wall clock being too noisy for a test.
+HEAVY_MODULES = ['requests', 'urllib3', 'aiohttp', 'httpx', 'concurrent.futures',
+    'email.utils']
+
+
+def run_python(code):
+    env = dict(os.environ)
+    env.pop('WOWZA_API_KEY', None)
+    env.pop('WOWZA_ACCESS_KEY', None)
+    return subprocess.run([sys.executable, '-c', code],
+        env=env, capture_output=True, text=True, check=True)
+
+
+def test_import_has_no_side_effects():
+    """
+    Tests that the package imports without credentials and without the HTTP
+    stack
+    """
+    result = run_python('import sys, wowza, wowza.exceptions\n'
+        'print(",".join(sorted(sys.modules)))')
+    modules = result.stdout.strip().split(',')
+    for name in HEAVY_MODULES:
+        assert name not in modules
+
+
+def test_credentials_resolved_on_use(monkeypatch):
+    monkeypatch.setattr(config, '_settings', {})
+    monkeypatch.delenv('WOWZA_API_KEY')
+    with pytest.raises(NoApiKey):
+        wowza.LiveStreams()
+    monkeypatch.setenv('WOWZA_API_KEY', 'key')
+    monkeypatch.delenv('WOWZA_ACCESS_KEY')
+    with pytest.raises(NoAccessKey):
+        wowza.Client()
+    # Explicit credentials don't need the environment
+    client = wowza.Client(api_key='key', access_key='secret')
+    assert client.headers['wsc-access-key'] == 'secret'
+
+
+def test_configure(monkeypatch):
+    monkeypatch.setattr(config, '_settings', {})
+    monkeypatch.setenv('WOWZA_PRODUCTION_LEVEL', 'SANDBOX')
+    assert wowza.WOWZA_BASE_URL == 'https://api-sandbox.cloud.wowza.com/api/v1/'
+    wowza.configure(api_key='configured', production_level='PRODUCTION')
+    assert wowza.WOWZA_API_KEY == 'configured'
+    assert wowza.Client().base_url == 'https://api.cloud.wowza.com/api/v1/'
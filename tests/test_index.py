@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from wowza import Client, LiveStreams, Schedules
+from wowza.index import ResourceIndex
+
+
+def serve(api, records):
+    api.add('GET', 'live_streams/', {'live_streams': records})
+
+
+def list_calls(api):
+    return [r for r in api.requests if r[:2] == ('GET', '/api/v1/live_streams/')]
+
+
+def test_lookups_list_once(api):
+    serve(api, [
+        {'id': 'a', 'name': 'Lobby', 'state': 'started',
+            'broadcast_location': 'eu_germany'},
+        {'id': 'b', 'name': 'Stage', 'state': 'stopped',
+            'broadcast_location': 'eu_germany'},
+        {'id': 'c', 'name': 'Stage', 'state': 'started',
+            'broadcast_location': 'us_east_virginia'},
+    ])
+    live_streams = LiveStreams(client=Client(base_url=api.url))
+    assert live_streams.find_by_name('Lobby') == 'a'
+    assert live_streams.find_by_name('Nope') is None
+    assert live_streams.filter(name='Stage') == ['b', 'c']
+    assert live_streams.filter(state='started',
+        broadcast_location='eu_germany') == ['a']
+    assert live_streams.filter(state=['started', 'stopped']) == ['a', 'b', 'c']
+    assert len(list_calls(api)) == 1
+    with pytest.raises(ValueError):
+        live_streams.filter(color='red')
+
+
+def test_patched_by_own_calls(api):
+    serve(api, [{'id': 'a', 'name': 'Lobby', 'state': 'stopped'}])
+    api.add('POST', 'live_streams/', {'live_stream': {'id': 'b', 'name': 'Stage',
+        'state': 'stopped', 'broadcast_location': 'eu_germany'}})
+    api.add('PATCH', 'live_streams/a', {'live_stream': {'id': 'a',
+        'name': 'Hall'}})
+    api.add('PUT', 'live_streams/b/start', {'live_stream': {'state': 'starting'}})
+    api.add('DELETE', 'live_streams/a', b'', status=204)
+    live_streams = LiveStreams(client=Client(base_url=api.url))
+    assert live_streams.filter() == ['a']
+    live_streams.create({'name': 'Stage', 'broadcast_location': 'eu_germany',
+        'encoder': 'other_rtmp', 'aspect_ratio_height': 720,
+        'aspect_ratio_width': 1280})
+    live_streams.update('a', {'name': 'Hall'})
+    live_streams.start('b')
+    assert live_streams.find_by_name('Stage') == 'b'
+    assert live_streams.find_by_name('Lobby') is None
+    assert live_streams.filter(state='starting') == ['b']
+    live_streams.delete('a', optimistic=True)
+    assert live_streams.filter() == ['b']
+    assert len(list_calls(api)) == 1
+
+
+def test_schedule_deletion(api):
+    api.add('GET', 'schedules/', {'schedules': [{'id': 's1', 'name': 'Night'},
+        {'id': 's2', 'name': 'Day'}]})
+    api.add('DELETE', 'schedules/s1/delete', b'', status=204)
+    schedules = Schedules(client=Client(base_url=api.url))
+    assert schedules.find_by_name('Night') == 's1'
+    schedules.delete('s1')
+    assert schedules.find_by_name('Night') is None
+    assert schedules.filter() == ['s2']
+
+
+def test_streamed_pages_indexed(api):
+    serve(api, [{'id': 'a', 'name': 'Lobby'}, {'id': 'b', 'name': 'Stage'}])
+    index = ResourceIndex()
+    live_streams = LiveStreams(client=Client(base_url=api.url, index=index))
+    assert [r['id'] for r in live_streams.iter_live_streams(stream=True)] == \
+        ['a', 'b']
+    assert index.filter('live_streams', name='Stage') == ['b']
+
+
+def test_refresh_drops_removed(api):
+    serve(api, [{'id': 'a', 'name': 'Lobby'}, {'id': 'b', 'name': 'Stage'}])
+    index = ResourceIndex()
+    live_streams = LiveStreams(client=Client(base_url=api.url, index=index))
+    live_streams.refresh_index()
+    assert index.is_complete('live_streams')
+    serve(api, [{'id': 'b', 'name': 'Stage'}])
+    live_streams.refresh_index()
+    assert index.ids('live_streams') == ['b']
+    assert index.get('live_streams', 'b') == {'name': 'Stage'}
+    assert index.filter('live_streams', name='Lobby') == []
+
+
+def test_aio_lookups(api):
+    aio = pytest.importorskip('wowza.aio')
+    serve(api, [{'id': 'a', 'name': 'Lobby'}, {'id': 'b', 'name': 'Stage'}])
+
+    async def lookup():
+        try:
+            live_streams = aio.LiveStreams(base_url=api.url)
+            return (await live_streams.find_by_name('Stage'),
+                await live_streams.filter(name=['Lobby', 'Stage']))
+        finally:
+            await aio.close()
+
+    assert asyncio.run(lookup()) == ('b', ['a', 'b'])
+    assert len(list_calls(api)) == 1
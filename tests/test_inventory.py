@@ -0,0 +1,98 @@
+from wowza import Client
+from wowza.inventory import Inventory
+from wowza.transport import MemoryTransport
+
+
+def live_stream(i, updated_at='2024-01-01T00:00:00Z', state='started'):
+    return {'id': 'ls{}'.format(i), 'name': 'Stream {}'.format(i),
+        'state': state, 'broadcast_location': 'us_east_virginia' if i % 2
+        else 'eu_germany', 'updated_at': updated_at,
+        'source_connection_information': {'primary_server': 'rtmp://x'}}
+
+
+def serve(api, records):
+    summaries = [dict((k, r[k]) for k in ('id', 'name', 'updated_at'))
+        for r in records]
+    api.add('GET', 'live_streams/', {'live_streams': summaries})
+    for record in records:
+        api.add('GET', 'live_streams/' + record['id'], {'live_stream': record})
+
+
+def detail_calls(api):
+    return [r[1] for r in api.requests if r[1] != '/api/v1/live_streams/']
+
+
+def test_incremental_sync(api, tmp_path):
+    records = [live_stream(i) for i in range(4)]
+    serve(api, records)
+    inventory = Inventory(str(tmp_path / 'wowza.db'),
+        client=Client(base_url=api.url))
+    result = inventory.sync(['live_streams'])['live_streams']
+    assert sorted(result.added) == ['ls0', 'ls1', 'ls2', 'ls3']
+    assert len(detail_calls(api)) == 4
+    assert inventory.synced_at('live_streams') is not None
+    assert inventory.get('live_streams', 'ls1') == records[1]
+
+    # Only changed records are fetched again; removed ones are deleted
+    del api.requests[:]
+    records = records[:3]
+    records[2] = live_stream(2, '2024-01-02T00:00:00Z', state='stopped')
+    serve(api, records)
+    del api.routes[('GET', '/api/v1/live_streams/ls3')]
+    result = inventory.sync(['live_streams'])['live_streams']
+    assert (result.added, result.updated, result.deleted) == ([], ['ls2'], ['ls3'])
+    assert detail_calls(api) == ['/api/v1/live_streams/ls2']
+    inventory.close()
+
+
+def test_query(api):
+    serve(api, [live_stream(i, state='stopped' if i == 3 else 'started')
+        for i in range(6)])
+    inventory = Inventory(client=Client(base_url=api.url))
+    inventory.sync(['live_streams'])
+    started_us = inventory.query('live_streams', state='started',
+        broadcast_location='us_east_virginia')
+    assert sorted(r['id'] for r in started_us) == ['ls1', 'ls5']
+    assert inventory.count('live_streams', id=['ls0', 'ls3', 'nope']) == 2
+    assert inventory.count('live_streams') == 6
+    assert inventory.query('recordings') == []
+
+
+def test_sync_errors(api):
+    serve(api, [live_stream(0), live_stream(1)])
+    del api.routes[('GET', '/api/v1/live_streams/ls1')]
+    inventory = Inventory(client=Client(base_url=api.url))
+    result = inventory.sync(['live_streams'])['live_streams']
+    assert result.added == ['ls0']
+    assert list(result.errors) == ['ls1']
+    # The failed record is fetched again by the next sync
+    serve(api, [live_stream(0), live_stream(1)])
+    assert inventory.sync(['live_streams'])['live_streams'].added == ['ls1']
+
+
+def test_sync_stream_sources():
+    """
+    Tests that stream sources are fetched from their exact URLs
+    """
+    base_url = 'https://wowza.test/api/v1/'
+    sources = dict(('ss{}'.format(i), {'id': 'ss{}'.format(i),
+        'name': 'Source {}'.format(i), 'location': 'eu_germany',
+        'updated_at': '2024-01-01T00:00:00Z'}) for i in range(3))
+    urls = []
+
+    def handler(method, url, params, headers, data):
+        urls.append(url)
+        if url == base_url + 'stream_sources/':
+            page = list(sources.values()) if params.get('page', 1) == 1 else []
+            return 200, {'stream_sources': page}, {}
+        record = sources.get(url[len(base_url + 'stream_sources/'):])
+        if record is None:
+            return 404, b'', {}
+        return 200, {'stream_source': record}, {}
+
+    inventory = Inventory(client=Client(base_url=base_url,
+        transport=MemoryTransport(handler)))
+    result = inventory.sync(['stream_sources'])['stream_sources']
+    assert sorted(result.added) == ['ss0', 'ss1', 'ss2'] and not result.errors
+    assert sorted(urls[-3:]) == [base_url + 'stream_sources/ss{}'.format(i)
+        for i in range(3)]
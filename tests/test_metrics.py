@@ -0,0 +1,153 @@
+import asyncio, json, time
+import pytest
+from wowza import Client, LiveStreams, Transcoders
+from wowza.exceptions import RecordNotFound
+from wowza.metrics import Metrics, endpoint
+from wowza.transport import MemoryTransport
+
+
+def test_endpoint_templates():
+    base = 'https://api/api/v1/'
+    assert endpoint(base + 'live_streams/wdjfqvsv/state', base) \
+        == 'live_streams/{id}/state'
+    assert endpoint(base + 'transcoders/abc/uptimes/xyz/metrics/historic?x=1',
+        base) == 'transcoders/{id}/uptimes/{id}/metrics/historic'
+    assert endpoint(base + 'usage/viewer_data/stream_targets/st1', base) \
+        == 'usage/viewer_data/stream_targets/{id}'
+    assert endpoint(base + 'live_streams/', base) == 'live_streams'
+
+
+def throttled_once():
+    calls = []
+
+    def handler(request, data):
+        calls.append(1)
+        if len(calls) == 1:
+            return 429, b'', {'Retry-After': '0'}
+        return 200, {'transcoder': {'id': 't1'}}, {}
+    return handler
+
+
+def test_client_metrics(api):
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    api.add('PUT', 'live_streams/abc/start', {'live_stream': {'state': 'starting'}})
+    api.add('GET', 'transcoders/t1', throttled_once())
+    metrics = Metrics()
+    events = []
+    metrics.on_request(lambda call: events.append(('request', call.endpoint)))
+    metrics.on_response(lambda call: events.append(('response', call.status)))
+    metrics.on_error(lambda call, error: events.append(('error', call.code)))
+    client = Client(base_url=api.url, metrics=metrics)
+    live_streams = LiveStreams(client=client)
+    live_streams.info('abc', 'state')
+    live_streams.info('abc', 'state')
+    live_streams.start('abc')
+    with pytest.raises(RecordNotFound):
+        live_streams.info('gone')
+    Transcoders(client=client).info('t1')
+
+    stats = metrics.stats()
+    state = stats[('GET', 'live_streams/{id}/state')]
+    assert state['count'] == 2 and state['errors'] == 0
+    assert state['bytes_in'] == 2 * len(b'{"live_stream": {"state": "started"}}')
+    assert state['outcomes'] == {(200, None): 2}
+    assert stats[('PUT', 'live_streams/{id}/start')]['count'] == 1
+    gone = stats[('GET', 'live_streams/{id}')]
+    assert gone['outcomes'] == {(404, 'ERR-404-RecordNotFound'): 1}
+    assert stats[('GET', 'transcoders/{id}')]['retries'] == 1
+    assert events[:2] == [('request', 'live_streams/{id}/state'),
+        ('response', 200)]
+    assert ('error', 'ERR-404-RecordNotFound') in events
+
+    text = metrics.render()
+    assert '# TYPE wowza_requests_total counter' in text
+    assert 'wowza_requests_total{method="GET",endpoint="live_streams/{id}",' \
+        'status="404",code="ERR-404-RecordNotFound"} 1' in text
+    assert 'wowza_request_errors_total{method="GET",endpoint="live_streams/{id}",' \
+        'error="RecordNotFound"} 1' in text
+    assert 'wowza_request_duration_seconds_bucket{method="GET",' \
+        'endpoint="live_streams/{id}/state",le="+Inf"} 2' in text
+    assert 'wowza_request_duration_seconds_count{method="GET",' \
+        'endpoint="live_streams/{id}/state"} 2' in text
+    assert 'wowza_request_retries_total{method="GET",' \
+        'endpoint="transcoders/{id}"} 1' in text
+
+
+def test_stream_metrics(api):
+    api.add('GET', 'live_streams/', {'live_streams': [{'id': i} for i in range(5)]})
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    metrics = Metrics()
+    live_streams = LiveStreams(client=Client(base_url=api.url, metrics=metrics))
+    assert len(list(live_streams.iter_live_streams(stream=True))) == 5
+    records = live_streams.iter_live_streams(stream=True)
+    next(records)
+    records.close()
+    # Calls after a stream closed early aren't counted as part of it
+    live_streams.info('abc', 'state')
+    stats = metrics.stats()
+    assert stats[('GET', 'live_streams')]['count'] == 2
+    assert stats[('GET', 'live_streams')]['errors'] == 0
+    assert stats[('GET', 'live_streams')]['bytes_in'] > 0
+    assert stats[('GET', 'live_streams/{id}/state')]['count'] == 1
+
+
+def test_interleaved_streams(api):
+    live_streams = [{'id': 'ls{}'.format(i), 'name': 'x' * 50} for i in range(200)]
+    stream_targets = [{'id': 'st{}'.format(i)} for i in range(20)]
+    api.add('GET', 'live_streams/', {'live_streams': live_streams})
+    api.add('GET', 'stream_targets/', {'stream_targets': stream_targets})
+    metrics = Metrics()
+    client = Client(base_url=api.url, metrics=metrics)
+    first = client.stream('GET', api.url + 'live_streams/', 'live_streams',
+        chunk_size=256)
+    second = client.stream('GET', api.url + 'stream_targets/', 'stream_targets',
+        chunk_size=256)
+    assert len(list(zip(first, second))) == 20
+    first.close()
+    stats = metrics.stats()
+    received = dict((path, stats[('GET', path)]['bytes_in'])
+        for path in ('live_streams', 'stream_targets'))
+    # The zip stops reading the live streams after 20 records, but every
+    # byte read is counted against its own call
+    assert received['stream_targets'] == len(json.dumps(
+        {'stream_targets': stream_targets}))
+    assert 0 < received['live_streams'] < len(json.dumps(
+        {'live_streams': live_streams}))
+
+
+def test_interrupted_calls():
+    def handler(method, url, params, headers, data):
+        raise KeyboardInterrupt
+
+    metrics = Metrics()
+    errors = []
+    metrics.on_error(lambda call, error: errors.append(type(error)))
+    client = Client(base_url='https://wowza.test/api/v1/', metrics=metrics,
+        transport=MemoryTransport(handler))
+    with pytest.raises(KeyboardInterrupt):
+        client.request('GET', 'https://wowza.test/api/v1/live_streams/abc')
+    assert metrics.stats()[('GET', 'live_streams/{id}')]['errors'] == 1
+    assert errors == [KeyboardInterrupt]
+
+
+def test_aio_cancelled_calls(api):
+    pytest.importorskip('aiohttp')
+    from wowza.aio.client import AsyncClient
+
+    def slow(request, data):
+        time.sleep(0.5)
+        return 200, {'live_stream': {}}, {}
+
+    api.add('GET', 'live_streams/abc', slow)
+    metrics = Metrics()
+
+    async def timed_out():
+        async with AsyncClient(base_url=api.url, metrics=metrics) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.request('GET',
+                    api.url + 'live_streams/abc'), 0.1)
+
+    asyncio.run(timed_out())
+    stats = metrics.stats()[('GET', 'live_streams/{id}')]
+    assert stats['count'] == 1 and stats['errors'] == 1
+    assert 'error="CancelledError"' in metrics.render()
@@ -0,0 +1,68 @@
+import copy, tracemalloc
+import pytest
+from wowza import Client, LiveStreams, Recordings
+from wowza.exceptions import InvalidStateChange
+from wowza.models import LiveStream, Recording, wrap
+
+
+def test_model_fields():
+    live_stream = LiveStream({'id': 'abc', 'state': 'started', 'new_field': 1})
+    assert live_stream.id == 'abc'
+    assert live_stream['state'] == 'started'
+    assert live_stream.new_field == 1
+    assert live_stream.extra == {'new_field': 1}
+    # Declared fields missing from the response
+    assert live_stream.name is None
+    assert 'name' not in live_stream
+    assert live_stream.get('name', 'default') == 'default'
+    with pytest.raises(KeyError):
+        live_stream['name']
+    with pytest.raises(AttributeError):
+        live_stream.unknown
+    assert live_stream == {'id': 'abc', 'state': 'started', 'new_field': 1}
+    assert copy.deepcopy(live_stream).to_dict() == live_stream.to_dict()
+    assert not hasattr(live_stream, '__dict__')
+
+
+def test_wrap():
+    body = wrap({'recordings': [{'id': 'a'}], 'page': 1})
+    assert isinstance(body['recordings'][0], Recording)
+    assert body['page'] == 1
+    assert wrap([1, 2]) == [1, 2]
+
+
+def test_models_memory():
+    """
+    Tests that models take several times less memory than dicts
+    """
+    value = 'value'
+    records = [dict((f, value) for f in LiveStream._fields) for _ in range(500)]
+    tracemalloc.start()
+    try:
+        dicts = [dict(r) for r in records]
+        dict_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        models = [LiveStream(r) for r in records]
+        model_size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    assert len(dicts) == len(models)
+    assert dict_size > 3 * model_size
+
+
+def test_client_models(api):
+    api.add('GET', 'recordings/', {'recordings': [
+        {'id': 'a', 'state': 'completed'}, {'id': 'b', 'state': 'failed'}]})
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'stopped'}})
+    client = Client(base_url=api.url, models=True)
+    recordings = Recordings(client=client).info()['recordings']
+    assert [r.state for r in recordings] == ['completed', 'failed']
+    assert all(isinstance(r, Recording) for r in recordings)
+    live_streams = LiveStreams(client=client)
+    assert isinstance(live_streams.info('abc', 'state')['live_stream'], LiveStream)
+    # The state checks work on models
+    with pytest.raises(InvalidStateChange):
+        live_streams.stop('abc')
+    assert Recordings(client=client).wait_for_state(['a', 'b'],
+        ['completed', 'failed'], timeout=1) == {'a': 'completed', 'b': 'failed'}
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from wowza import LiveStreams
+from wowza.exceptions import InvalidInteraction, InvalidStateChange
+
+INVALID = {'meta': {'status': 422, 'code': 'ERR-422-InvalidInteraction',
+    'message': 'Invalid interaction'}}
+
+
+def test_delete_checks_state(api):
+    """
+    Tests that a running stream isn't deleted without optimistic mode
+    """
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    with pytest.raises(InvalidInteraction):
+        LiveStreams(base_url=api.url).delete('abc')
+    assert [r[0] for r in api.requests] == ['GET']
+
+
+def test_optimistic_delete(api):
+    api.add('DELETE', 'live_streams/abc', b'', status=204)
+    response = LiveStreams(base_url=api.url).delete('abc', optimistic=True)
+    assert response.status_code == 204
+    assert [r[0] for r in api.requests] == ['DELETE']
+
+
+def test_optimistic_stop_not_running(api):
+    api.add('PUT', 'live_streams/abc/stop', lambda handler, body: (
+        422, INVALID, {}))
+    live_streams = LiveStreams(base_url=api.url)
+    live_streams.optimistic = True
+    with pytest.raises(InvalidStateChange):
+        live_streams.stop('abc')
+    assert [r[0] for r in api.requests] == ['PUT']
+
+
+def test_optimistic_stop_many(api):
+    for stream_id in 'abc':
+        api.add('PUT', 'live_streams/{}/stop'.format(stream_id),
+            {'live_stream': {'state': 'stopped'}})
+    result = LiveStreams(base_url=api.url).stop_many('abc', optimistic=True)
+    assert result.ok
+    assert len(api.requests) == 3
+
+
+def test_aio_optimistic_stop(api):
+    aio = pytest.importorskip('wowza.aio')
+    api.add('PUT', 'live_streams/abc/stop', {'live_stream': {'state': 'stopped'}})
+
+    async def stop():
+        try:
+            return await aio.LiveStreams(base_url=api.url).stop('abc',
+                optimistic=True)
+        finally:
+            await aio.close()
+
+    assert asyncio.run(stop()) == {'live_stream': {'state': 'stopped'}}
+    assert len(api.requests) == 1
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from wowza import Recordings, LiveStreams
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_iter_recordings(api, prefetch):
+    api.add('GET', 'recordings/', api.paged('recordings', 25))
+    recordings = Recordings(base_url=api.url + 'recordings/')
+    records = list(recordings.iter_recordings(per_page=10, prefetch=prefetch))
+    assert [r['id'] for r in records] == ['r{}'.format(i) for i in range(25)]
+    assert len(api.requests) == 3
+
+
+def test_iter_stops_on_full_last_page(api):
+    """
+    Tests that an exactly full last page costs a single extra request
+    """
+    api.add('GET', 'live_streams/', api.paged('live_streams', 20))
+    live_streams = LiveStreams(base_url=api.url)
+    records = list(live_streams.iter_live_streams(per_page=10))
+    assert len(records) == 20
+    assert len(api.requests) == 3
+
+
+def test_iter_is_lazy(api):
+    api.add('GET', 'recordings/', api.paged('recordings', 100))
+    recordings = Recordings(base_url=api.url + 'recordings/')
+    iterator = recordings.iter_recordings(per_page=10, prefetch=False)
+    assert next(iterator) == {'id': 'r0'}
+    iterator.close()
+    assert len(api.requests) == 1
+
+
+def test_aio_iter_recordings(api):
+    aio = pytest.importorskip('wowza.aio')
+    api.add('GET', 'recordings/', api.paged('recordings', 25))
+
+    async def collect():
+        recordings = aio.Recordings(base_url=api.url + 'recordings/')
+        try:
+            return [r async for r in recordings.iter_recordings(per_page=10)]
+        finally:
+            await aio.close()
+
+    records = asyncio.run(collect())
+    assert len(records) == 25
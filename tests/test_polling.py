@@ -0,0 +1,87 @@
+import asyncio, time
+import pytest
+from wowza import LiveStreams, Recordings
+from wowza.exceptions import DeadlineExceeded
+from wowza.polling import StateWaiter
+
+
+def test_state_waiter_backs_off():
+    waiter = StateWaiter(['a', 'b'], 'started', interval=1, max_interval=3,
+        factor=2)
+    assert not waiter.update({'a': 'started', 'b': 'starting'})
+    assert waiter.pending == ['b']
+    assert [waiter.next_delay() for _ in range(4)] == [1, 2, 3, 3]
+    assert waiter.update({'b': 'started'})
+
+
+def test_state_waiter_timeout():
+    waiter = StateWaiter('a', 'started', timeout=0)
+    with pytest.raises(DeadlineExceeded):
+        waiter.next_delay()
+
+
+def test_wait_for_state_single(api):
+    calls = []
+
+    def route(handler, body):
+        calls.append(1)
+        state = 'started' if len(calls) >= 3 else 'starting'
+        return 200, {'live_stream': {'state': state}}, {}
+
+    api.add('GET', 'live_streams/abc/state', route)
+    live_streams = LiveStreams(base_url=api.url)
+    states = live_streams.wait_for_state('abc', interval=0.01)
+    assert states == {'abc': 'started'}
+    assert len(calls) == 3
+
+
+def test_wait_for_state_uses_list_call(api):
+    """
+    Tests that many ids are polled with one list call when it has states
+    """
+    calls = []
+
+    def route(handler, body):
+        calls.append(1)
+        state = 'completed' if len(calls) >= 2 else 'converting'
+        return 200, {'recordings': [
+            {'id': 'r{}'.format(i), 'state': state} for i in range(5)
+        ]}, {}
+
+    api.add('GET', 'recordings/', route)
+    recordings = Recordings(base_url=api.url + 'recordings/')
+    states = recordings.wait_for_state(['r1', 'r2', 'r3'], interval=0.01)
+    assert states == {'r1': 'completed', 'r2': 'completed', 'r3': 'completed'}
+    assert len(api.requests) == 2
+
+
+def test_wait_for_state_list_without_states(api):
+    """
+    Tests the fallback to per id calls when the list has no states
+    """
+    api.add('GET', 'live_streams/', {'live_streams': [{'id': 'a'}, {'id': 'b'}]})
+    for stream_id in 'ab':
+        api.add('GET', 'live_streams/{}/state'.format(stream_id),
+            {'live_stream': {'state': 'started'}})
+    live_streams = LiveStreams(base_url=api.url)
+    assert live_streams.wait_for_state(['a', 'b']) == \
+        {'a': 'started', 'b': 'started'}
+    live_streams.wait_for_state(['a', 'b'])
+    paths = [request[1] for request in api.requests]
+    assert paths.count('/api/v1/live_streams/') == 1
+
+
+def test_aio_wait_for_state(api):
+    aio = pytest.importorskip('wowza.aio')
+    api.add('GET', 'transcoders/t1/state', {'transcoder': {'state': 'started'}})
+    api.add('GET', 'transcoders/t2/state', {'transcoder': {'state': 'started'}})
+    api.add('GET', 'transcoders/', {'transcoders': [{'id': 't1'}]})
+
+    async def wait():
+        transcoders = aio.Transcoders(base_url=api.url + 'transcoders/')
+        try:
+            return await transcoders.wait_for_state(['t1', 't2'], timeout=5)
+        finally:
+            await aio.close()
+
+    assert asyncio.run(wait()) == {'t1': 'started', 't2': 'started'}
@@ -0,0 +1,73 @@
+import time
+import pytest
+from wowza import Client, LiveStreams
+from wowza.exceptions import TooManyRequests
+from wowza.ratelimit import TokenBucket, RateLimiter, Limit, retry_after
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_rate_limiter_endpoint_family():
+    limiter = RateLimiter(rate=100, limits=[
+        Limit(r'live_streams/[^/]+/start$', rate=1, methods=['PUT'])
+    ])
+    url = 'https://api.cloud.wowza.com/api/v1/live_streams/abc/start'
+    assert limiter.delay('PUT', url) == 0
+    assert limiter.delay('PUT', url) == pytest.approx(1, abs=0.05)
+    # Other endpoints only use the account budget
+    assert limiter.delay('GET', url) == 0
+
+
+def test_retry_after():
+    assert retry_after({'Retry-After': '3'}) == 3
+    assert retry_after({}, 1) == 1
+    assert retry_after({'Retry-After': 'Thu, 01 Jan 1970 00:00:00 GMT'}) == 0
+
+
+def throttle_once(calls):
+    def route(handler, body):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return 429, b'', {'Retry-After': '0.2'}
+        return 200, {'live_stream': {'state': 'started'}}, {}
+    return route
+
+
+def test_client_retries_after_429(api):
+    calls = []
+    api.add('GET', 'live_streams/abc/state', throttle_once(calls))
+    client = Client(base_url=api.url, rate_limiter=RateLimiter(rate=50))
+    response = LiveStreams(client=client).info('abc', 'state')
+    assert response['live_stream']['state'] == 'started'
+    assert calls[1] - calls[0] >= 0.2
+
+
+@pytest.mark.parametrize('limiter', [
+    RateLimiter(),
+    RateLimiter(limits=[Limit(r'/start$', rate=1, methods=['PUT'])]),
+])
+def test_client_retries_after_429_outside_limiter(api, limiter):
+    """
+    Tests that Retry-After is honored for requests no bucket of the limiter
+    covers
+    """
+    calls = []
+    api.add('GET', 'live_streams/abc/state', throttle_once(calls))
+    client = Client(base_url=api.url, rate_limiter=limiter)
+    LiveStreams(client=client).info('abc', 'state')
+    assert calls[1] - calls[0] >= 0.2
+
+
+def test_client_gives_up_after_429_retries(api):
+    api.add('GET', 'live_streams/abc/state', lambda handler, body: (
+        429, b'', {'Retry-After': '0'}))
+    client = Client(base_url=api.url, max_throttle_retries=2)
+    with pytest.raises(TooManyRequests):
+        LiveStreams(client=client).info('abc', 'state')
+    assert len(api.requests) == 3
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from wowza import LiveStreams
+from wowza.ratelimit import RateLimiter
+from wowza.registry import ClientRegistry
+
+
+def test_resource_credentials(api):
+    """
+    Tests that the api_key/access_key arguments are sent with the requests
+    """
+    api.add('GET', 'live_streams/', {'live_streams': []})
+    live_streams = LiveStreams(base_url=api.url,
+        api_key='key', access_key='secret')
+    live_streams.info()
+    headers = api.requests[0][2]
+    assert headers['wsc-api-key'] == 'key'
+    assert headers['wsc-access-key'] == 'secret'
+
+
+def test_registry_shares_transport(api):
+    api.add('GET', 'live_streams/', {'live_streams': []})
+    registry = ClientRegistry(rate_limiter=lambda: RateLimiter(rate=100))
+    for i in range(3):
+        registry.add('account{}'.format(i), 'key{}'.format(i),
+            'secret{}'.format(i), base_url=api.url)
+    assert len(registry) == 3 and 'account1' in registry
+    clients = [registry[name] for name in registry]
+    assert len(set(id(c.transport) for c in clients)) == 1
+    assert len(set(id(c.rate_limiter) for c in clients)) == 3
+    for name in registry:
+        LiveStreams(client=registry[name]).info()
+    assert [r[2]['wsc-api-key'] for r in api.requests] == ['key0', 'key1', 'key2']
+    registry.remove('account0')
+    assert registry.get('account0') is None
+    registry.close()
+
+
+def test_registry_transport_per_host():
+    registry = ClientRegistry()
+    a = registry.add('a', 'key', 'secret', base_url='https://api.cloud.wowza.com/api/v1/')
+    b = registry.add('b', 'key', 'secret',
+        base_url='https://api-sandbox.cloud.wowza.com/api/v1/')
+    c = registry.add('c', 'key', 'secret', base_url='https://api.cloud.wowza.com/api/v1/')
+    assert a.transport is c.transport
+    assert a.transport is not b.transport
+    registry.close()
+
+
+def test_async_registry(api):
+    pytest.importorskip('aiohttp')
+    from wowza.aio import AsyncClient, LiveStreams as AsyncLiveStreams
+    api.add('GET', 'live_streams/', {'live_streams': []})
+
+    async def sweep():
+        registry = ClientRegistry(client_class=AsyncClient)
+        for i in range(2):
+            registry.add(i, 'key{}'.format(i), 'secret', base_url=api.url)
+        try:
+            return await asyncio.gather(*(
+                AsyncLiveStreams(client=registry[i]).info() for i in registry))
+        finally:
+            await registry.close()
+
+    assert asyncio.run(sweep()) == [{'live_streams': []}] * 2
+    assert sorted(r[2]['wsc-api-key'] for r in api.requests) == ['key0', 'key1']
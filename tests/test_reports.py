@@ -0,0 +1,85 @@
+import asyncio, threading, time
+import pytest
+from wowza import Client, Usage
+from wowza.bulk import iter_many
+from wowza.exceptions import DeadlineInFlight
+from wowza.ratelimit import RateLimiter
+from wowza.reports import ViewerReport
+
+
+def viewer_data(viewers):
+    return {'stream_target': {'unique_viewers': viewers, 'countries': {'FR': 1},
+        'name': 'target'}}
+
+
+def add_targets(api, count):
+    api.add('GET', 'stream_targets/', api.paged('stream_targets', count))
+    for i in range(count):
+        api.add('GET', 'usage/viewer_data/stream_targets/r{}'.format(i),
+            viewer_data(i))
+
+
+def test_iter_many_lazy_ids():
+    """
+    Tests that ids are consumed as workers free up, and that results come
+    out as they complete
+    """
+    consumed = []
+
+    def ids():
+        for i in [3, 1, 2, 1, 0]:
+            consumed.append(i)
+            yield i
+
+    def call(i):
+        time.sleep(i / 20.0)
+        if i == 2:
+            raise ValueError(i)
+        return i * 10
+
+    results = list(iter_many(call, ids(), max_workers=2))
+    assert sorted(r[0] for r in results) == [0, 1, 2, 3]
+    assert results[0] == (1, 10, None)
+    errors = dict((r[0], r[2]) for r in results if r[2] is not None)
+    assert list(errors) == [2] and isinstance(errors[2], ValueError)
+    assert consumed == [3, 1, 2, 1, 0]
+
+
+def test_iter_many_deadline():
+    results = list(iter_many(time.sleep, [0.5, 0.01], max_workers=2, deadline=0.2))
+    assert [r[2] is None for r in results] == [True, False]
+    assert isinstance(results[1][2], DeadlineInFlight)
+
+
+def test_viewer_report(api):
+    add_targets(api, 25)
+    client = Client(base_url=api.url, rate_limiter=RateLimiter(rate=1000))
+    usage = Usage(client=client)
+    report = usage.viewer_report(max_workers=8)
+    assert report.ok
+    assert sorted(report.targets) == sorted('r{}'.format(i) for i in range(25))
+    assert report.totals == {'stream_target': {
+        'unique_viewers': sum(range(25)), 'countries': {'FR': 25}}}
+
+
+def test_iter_viewer_report(api):
+    add_targets(api, 3)
+    usage = Usage(base_url=api.url + 'usage/')
+    results = dict((i, (data, error)) for i, data, error in
+        usage.iter_viewer_report(['r0', 'r1', 'missing']))
+    assert results['r1'][0] == viewer_data(1)
+    assert results['missing'][0] is None
+    assert results['missing'][1] is not None
+
+
+def test_aio_viewer_report(api):
+    aio = pytest.importorskip('wowza.aio')
+    add_targets(api, 12)
+
+    async def report():
+        async with aio.AsyncClient(base_url=api.url) as client:
+            return await aio.Usage(client=client).viewer_report(max_workers=4)
+
+    result = asyncio.run(report())
+    assert len(result.targets) == 12
+    assert result.totals['stream_target']['unique_viewers'] == sum(range(12))
@@ -0,0 +1,72 @@
+import json
+import pytest
+from wowza import StreamTargets, LiveStreams
+from wowza.exceptions import ERROR_CODES, ApiError, RecordNotFound, \
+    InvalidApiKey, TrialExceeded, LimitReached, TokenAuthBusy
+from wowza.response import parse
+
+
+def error_body(code, status):
+    return json.dumps({'meta': {
+        'status': status, 'code': code, 'title': code,
+        'message': 'Error {}'.format(code)
+    }}).encode('utf-8')
+
+
+@pytest.mark.parametrize('code, error_class', sorted(ERROR_CODES.items()))
+def test_parse_error_codes(code, error_class):
+    """
+    Tests that every meta.code in the table raises its exception
+    """
+    with pytest.raises(error_class) as error:
+        parse(int(code.split('-')[1]), error_body(code, 400))
+    assert error.value.meta['code'] == code
+
+
+def test_parse_unknown_error_code():
+    with pytest.raises(ApiError):
+        parse(418, error_body('ERR-418-Teapot', 418))
+
+
+def test_parse_non_json_error():
+    with pytest.raises(ApiError) as error:
+        parse(502, b'<html>Bad Gateway</html>')
+    assert error.value.code == 502
+
+
+def test_parse_success():
+    assert parse(200, b'{"live_stream": {"id": "abc"}}') == \
+        {'live_stream': {'id': 'abc'}}
+    assert parse(204, b'') is None
+
+
+def test_request_raises_mapped_error(api):
+    """
+    Tests that the endpoint classes raise the mapped exceptions
+    """
+    live_streams = LiveStreams(base_url=api.url)
+    with pytest.raises(RecordNotFound):
+        live_streams.info('missing')
+    api.add('POST', 'stream_targets/', lambda handler, body: (
+        422, error_body('ERR-422-LimitReached', 422), {}))
+    with pytest.raises(LimitReached):
+        StreamTargets(base_url=api.url + 'stream_targets/').create({})
+
+
+def test_token_auth_update_success(api):
+    """
+    Tests that a successful token auth update is returned, not raised
+    """
+    api.add('PATCH', 'stream_targets/st1/token_auth',
+        {'token_auth': {'enabled': True}})
+    stream_targets = StreamTargets(base_url=api.url + 'stream_targets/')
+    response = stream_targets.update_token_auth('st1', {'enabled': True})
+    assert response == {'token_auth': {'enabled': True}}
+
+
+def test_token_auth_update_busy(api):
+    api.add('PATCH', 'stream_targets/st1/token_auth', lambda handler, body: (
+        423, error_body('ERR-423-TokenAuthBusy', 423), {}))
+    stream_targets = StreamTargets(base_url=api.url + 'stream_targets/')
+    with pytest.raises(TokenAuthBusy):
+        stream_targets.update_token_auth('st1', {'enabled': True})
@@ -0,0 +1,109 @@
+import pytest
+from wowza import Client, LiveStreams, StreamTargets
+from wowza.exceptions import ApiError, RecordNotFound, TokenAuthBusy, \
+    GeoblockingBusy
+from wowza.retry import RetryPolicy
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(base=1, factor=2, max_delay=5, jitter=0)
+    assert [policy.backoff(n) for n in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_backoff_jitter():
+    policy = RetryPolicy(base=1, jitter=0.5)
+    delays = [policy.backoff(2) for _ in range(50)]
+    assert all(2 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_delay_classification():
+    policy = RetryPolicy(jitter=0)
+    assert policy.delay(TokenAuthBusy({'message': ''}), 0, 0) == 0.5
+    assert policy.delay(GeoblockingBusy({'message': ''}), 0, 0) == 0.5
+    assert policy.delay(ConnectionResetError(), 0, 0) == 0.5
+    assert policy.delay(ApiError({'message': '', 'status': 503}), 0, 0) == 0.5
+    assert policy.delay(RecordNotFound({'message': ''}), 0, 0) is None
+    assert policy.delay(ValueError(), 0, 0, (ValueError,)) == 0.5
+
+
+def test_post_only_retried_when_busy():
+    policy = RetryPolicy(jitter=0)
+    busy = TokenAuthBusy({'message': ''})
+    unavailable = ApiError({'message': '', 'status': 503})
+    assert policy.delay(busy, 0, 0, method='POST') == 0.5
+    assert policy.delay(unavailable, 0, 0, method='POST') is None
+    assert policy.delay(ConnectionResetError(), 0, 0, method='POST') is None
+    assert policy.delay(unavailable, 0, 0, method='DELETE') == 0.5
+    policy = RetryPolicy(jitter=0, retry_methods=['get', 'post'])
+    assert policy.delay(unavailable, 0, 0, method='POST') == 0.5
+    assert policy.delay(unavailable, 0, 0, method='PUT') is None
+
+
+def test_delay_limits():
+    policy = RetryPolicy(max_attempts=3, deadline=10, jitter=0, base=4)
+    assert policy.delay(ConnectionError(), 1, 0) == 8
+    assert policy.delay(ConnectionError(), 2, 0) is None
+    assert policy.delay(ConnectionError(), 1, 7) == 3
+    assert policy.delay(ConnectionError(), 0, 10) is None
+
+
+def flaky(failures, status=503):
+    calls = []
+
+    def route(handler, body):
+        calls.append(1)
+        if len(calls) <= failures:
+            return status, b'Service Unavailable', {}
+        return 200, {'live_stream': {'state': 'starting'}}, {}
+    return route
+
+
+def test_retrying_opt_in(api):
+    api.add('PUT', 'live_streams/abc/start', flaky(2))
+    live_streams = LiveStreams(base_url=api.url)
+    with pytest.raises(ApiError):
+        live_streams.start('abc')
+    response = live_streams.retrying(RetryPolicy(base=0.01)).start('abc')
+    assert response['live_stream']['state'] == 'starting'
+    assert len(api.requests) == 3
+
+
+def test_client_retry_policy(api):
+    api.add('PUT', 'live_streams/abc/start', flaky(2))
+    client = Client(base_url=api.url, retry_policy=RetryPolicy(base=0.01))
+    assert LiveStreams(client=client).start('abc')['live_stream']
+    assert len(api.requests) == 3
+
+
+def test_create_not_retried(api):
+    api.add('POST', 'live_streams/', flaky(1, status=502))
+    client = Client(base_url=api.url, retry_policy=RetryPolicy(base=0.01))
+    with pytest.raises(ApiError):
+        LiveStreams(client=client).create({'name': 'Lobby',
+            'broadcast_location': 'eu_germany', 'encoder': 'other_rtmp',
+            'aspect_ratio_height': 720, 'aspect_ratio_width': 1280})
+    assert len(api.requests) == 1
+
+
+def test_update_token_auth_wait(api):
+    """
+    Tests that a busy token auth update is retried until it goes through
+    """
+    busy = {'meta': {'status': 423, 'code': 'ERR-423-TokenAuthBusy',
+        'message': 'busy'}}
+    calls = []
+
+    def route(handler, body):
+        calls.append(1)
+        if len(calls) < 3:
+            return 423, busy, {}
+        return 200, {'token_auth': {'enabled': True}}, {}
+
+    api.add('PATCH', 'stream_targets/st1/token_auth', route)
+    stream_targets = StreamTargets(base_url=api.url + 'stream_targets/')
+    response = stream_targets.update_token_auth('st1', {'enabled': True},
+        wait=RetryPolicy(max_attempts=None, base=0.01,
+            retry_on=(TokenAuthBusy,)))
+    assert response == {'token_auth': {'enabled': True}}
+    assert len(calls) == 3
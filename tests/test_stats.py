@@ -0,0 +1,82 @@
+import asyncio, math
+import pytest
+from wowza import LiveStreams
+from wowza import stats
+from wowza.stats import StatsCollector
+
+
+def response(**values):
+    live_stream = dict((name, {'status': 'normal', 'units': '', 'value': value})
+        for name, value in values.items())
+    live_stream['audio_codec'] = {'status': 'normal', 'value': 'aac'}
+    return {'live_stream': live_stream}
+
+
+@pytest.fixture(params=['numpy', 'stdlib'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(stats, 'numpy', None)
+    return request.param
+
+
+def test_ring_buffer(backend):
+    collector = StatsCollector(None, ['a', 'b'], size=3)
+    for t in range(5):
+        collector.record({
+            'a': response(bits_in_rate=t, frame_rate=30),
+            'b': response(bits_in_rate=10 * t) if t != 3 else None
+        }, at=100 + t)
+    assert len(collector) == 3
+    assert list(collector.sample_times()) == [102, 103, 104]
+    assert list(collector.values('a', 'bits_in_rate')) == [2, 3, 4]
+    assert math.isnan(collector.values('b', 'bits_in_rate')[1])
+    # Non numeric metrics are dropped
+    assert set(collector.series['a']) == {'bits_in_rate', 'frame_rate'}
+    assert collector.min('bits_in_rate') == {'a': 2, 'b': 20}
+    assert collector.max('bits_in_rate', window=1.5) == {'a': 4, 'b': 40}
+    assert collector.mean('bits_in_rate') == {'a': 3, 'b': 30}
+    assert collector.percentile('bits_in_rate', 50, window=2.5) == {'a': 3, 'b': 30}
+    assert collector.mean('frame_rate') == {'a': 30, 'b': None}
+    with pytest.raises(ValueError):
+        collector.aggregate('frame_rate', 'median')
+
+
+def test_ring_buffers_are_reused():
+    collector = StatsCollector(None, ['a'], size=10)
+    collector.record({'a': response(bits_in_rate=1)})
+    ring = collector.series['a']['bits_in_rate']
+    for i in range(25):
+        collector.record({'a': response(bits_in_rate=i)})
+    assert collector.series['a']['bits_in_rate'] is ring
+    assert list(collector.values('a', 'bits_in_rate')) == list(range(15, 25))
+
+
+def test_poll(api):
+    api.add('GET', 'live_streams/a/stats', response(bits_in_rate=1000))
+    api.add('GET', 'live_streams/b/stats', response(bits_in_rate=2000))
+    collector = StatsCollector(LiveStreams(base_url=api.url), ['a', 'b', 'c'],
+        interval=0.2)
+    collector.run(rounds=2)
+    assert len(collector) == 2
+    assert collector.mean('bits_in_rate') == {'a': 1000, 'b': 2000, 'c': None}
+    assert list(collector.errors) == ['c']
+
+
+def test_aio_poll(api):
+    aio = pytest.importorskip('wowza.aio')
+    from wowza.aio.stats import StatsCollector as AsyncStatsCollector
+    api.add('GET', 'live_streams/a/stats', response(frame_rate=25))
+
+    async def collect():
+        collector = AsyncStatsCollector(aio.LiveStreams(base_url=api.url),
+            ['a'], interval=0.2)
+        try:
+            await collector.run(rounds=3)
+        finally:
+            await aio.close()
+        return collector
+
+    collector = asyncio.run(collect())
+    assert list(collector.values('a', 'frame_rate')) == [25, 25, 25]
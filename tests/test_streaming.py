@@ -0,0 +1,112 @@
+import asyncio, json
+import pytest
+from wowza import Client, Recordings, Usage
+from wowza.exceptions import RecordNotFound
+from wowza.models import Recording
+from wowza.streaming import ArrayDecoder
+
+
+def decode(document, path, chunk_size):
+    decoder = ArrayDecoder(path)
+    items = []
+    for i in range(0, len(document), chunk_size):
+        items.extend(decoder.feed(document[i:i + chunk_size]))
+    return items + decoder.close()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_array_decoder(chunk_size):
+    body = {
+        'meta': {'skipped': [1, {'a': None}]},
+        'stream_target': {'id': 'x', 'viewers': [
+            {'n': i, 'country': u'Côte d’Ivoire'} for i in range(20)
+        ] + [12345, 'text', True]},
+        'after': 1
+    }
+    document = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    assert decode(document, ('stream_target', 'viewers'), chunk_size) == \
+        body['stream_target']['viewers']
+    assert decode(b' [1, [2], {"3": 3}] ', (), chunk_size) == [1, [2], {'3': 3}]
+    assert decode(b'{"recordings": []}', 'recordings', chunk_size) == []
+
+
+@pytest.mark.parametrize('document, path', [
+    (b'{"r":[1.5e3]}', 'r'),
+    (b'{"x":1.25,"r":[1]}', 'r'),
+    (b'{"x":{"y":-0.5E-2},"r":[-12,3.0e+1,[0.25],{"n":1e2}],"z":7}', 'r'),
+    (b'[10, -2.5, 1E9, true, null]', ()),
+])
+def test_array_decoder_split_numbers(document, path):
+    """
+    Tests that numbers are decoded whole wherever the chunks split them
+    """
+    expected = json.loads(document)
+    for key in ((path,) if path else ()):
+        expected = expected[key]
+    for chunk_size in range(1, len(document) + 1):
+        assert decode(document, path, chunk_size) == expected
+
+
+@pytest.mark.parametrize('document', [
+    b'{"live_streams": []}', b'{}', b'{"recordings": [1, 2', b'{"recordings": {}}'
+])
+def test_array_decoder_errors(document):
+    with pytest.raises(ValueError):
+        decode(document, 'recordings', 3)
+
+
+def test_array_decoder_memory():
+    """
+    Tests that the buffer holds about one record, whatever the body size
+    """
+    record = json.dumps({'id': 'x' * 100, 'file_name': 'y' * 400}).encode()
+    document = b'{"recordings": [' + b','.join([record] * 5000) + b']}'
+    decoder = ArrayDecoder('recordings')
+    largest = count = 0
+    for i in range(0, len(document), 1024):
+        count += len(decoder.feed(document[i:i + 1024]))
+        largest = max(largest, len(decoder._buffer))
+    assert count + len(decoder.close()) == 5000
+    assert largest < len(record) + 1024
+
+
+def test_client_stream(api):
+    api.add('GET', 'recordings/', {'recordings': [{'id': 'a'}, {'id': 'b'}]})
+    client = Client(base_url=api.url, models=True)
+    records = list(client.stream('GET', api.url + 'recordings/', 'recordings',
+        chunk_size=5))
+    assert [r.id for r in records] == ['a', 'b']
+    assert isinstance(records[0], Recording)
+    with pytest.raises(RecordNotFound):
+        list(client.stream('GET', api.url + 'missing', 'recordings'))
+
+
+def test_iter_stream(api):
+    api.add('GET', 'recordings/', api.paged('recordings', 25))
+    recordings = Recordings(base_url=api.url + 'recordings/')
+    records = list(recordings.iter_recordings(per_page=10, stream=True))
+    assert [r['id'] for r in records] == ['r{}'.format(i) for i in range(25)]
+    assert len(api.requests) == 3
+
+
+def test_iter_viewer_data(api):
+    api.add('GET', 'usage/viewer_data/stream_targets/st1', {
+        'viewer_data': {'viewers': [{'country': 'FR'}, {'country': 'US'}]}})
+    usage = Usage(base_url=api.url + 'usage/')
+    viewers = usage.iter_viewer_data('st1', ('viewer_data', 'viewers'))
+    assert [v['country'] for v in viewers] == ['FR', 'US']
+
+
+def test_aio_iter_stream(api):
+    aio = pytest.importorskip('wowza.aio')
+    api.add('GET', 'recordings/', api.paged('recordings', 15))
+
+    async def collect():
+        try:
+            recordings = aio.Recordings(base_url=api.url + 'recordings/')
+            return [r['id'] async for r in recordings.iter_recordings(
+                per_page=10, stream=True)]
+        finally:
+            await aio.close()
+
+    assert asyncio.run(collect()) == ['r{}'.format(i) for i in range(15)]
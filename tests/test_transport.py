@@ -0,0 +1,96 @@
+import asyncio, json
+import pytest
+from wowza import Client, LiveStreams
+from wowza.exceptions import RecordNotFound
+from wowza.registry import ClientRegistry
+from wowza.transport import Transport, Urllib3Transport, MemoryTransport, \
+    AsyncMemoryTransport
+
+
+def test_urllib3_transport(api):
+    api.add('GET', 'live_streams/abc/state', {'live_stream': {'state': 'started'}})
+    api.add('POST', 'live_streams/abc/start', {'live_stream': {'state': 'starting'}})
+    api.add('GET', 'live_streams/', {'live_streams': [{'id': 'a'}, {'id': 'b'}]})
+    client = Client(base_url=api.url, transport=Urllib3Transport(keep_alive=False))
+    live_streams = LiveStreams(client=client)
+    assert live_streams.info('abc', 'state') == {'live_stream': {'state': 'started'}}
+    assert client.request('POST', api.url + 'live_streams/abc/start',
+        {'live_stream': {}}) == {'live_stream': {'state': 'starting'}}
+    with pytest.raises(RecordNotFound):
+        live_streams.info('nope')
+    assert [r['id'] for r in live_streams.iter_live_streams(stream=True)] \
+        == ['a', 'b']
+    method, path, headers, body = api.requests[1]
+    assert json.loads(body) == {'live_stream': {}}
+    assert headers['wsc-api-key'] == client.headers['wsc-api-key']
+    assert headers['Connection'] == 'close'
+    client.close()
+
+
+def test_memory_transport():
+    calls = []
+
+    def handler(method, url, params, headers, data):
+        calls.append((method, url, params))
+        if url.endswith('/state'):
+            return 200, {'live_stream': {'state': 'started'}}, {}
+        if url.endswith('/gone'):
+            return 404, {'meta': {'status': 404,
+                'code': 'ERR-404-RecordNotFound', 'message': 'Not found'}}, {}
+        return 200, {'live_streams': [{'id': i} for i in range(3)]}, {}
+
+    transport = MemoryTransport(handler)
+    client = Client(base_url='https://wowza.test/api/v1/', transport=transport)
+    live_streams = LiveStreams(client=client)
+    assert live_streams.info('abc', 'state')['live_stream']['state'] == 'started'
+    with pytest.raises(RecordNotFound):
+        live_streams.info('gone')
+    assert [r['id'] for r in live_streams.iter_live_streams(per_page=5,
+        stream=True)] == [0, 1, 2]
+    assert transport.count == 3
+    assert calls[-1] == ('GET', 'https://wowza.test/api/v1/live_streams/',
+        {'page': 1, 'per_page': 5})
+
+
+def test_memory_transport_headers():
+    from wowza.cache import ResponseCache
+    transport = MemoryTransport(lambda method, url, params, headers, data:
+        (304, b'', {}) if headers.get('If-None-Match') == '"v1"' else
+        (200, {'live_stream': {'state': 'started'}}, {'etag': '"v1"'}))
+    cache = ResponseCache(default_ttl=0)
+    client = Client(base_url='https://wowza.test/api/v1/', transport=transport,
+        cache=cache)
+    for _ in range(2):
+        client.request('GET', 'https://wowza.test/api/v1/live_streams/abc')
+    assert cache.stats()['revalidations'] == 1
+    response = transport.request('GET', 'https://wowza.test/api/v1/')
+    assert response.headers['ETag'] == response.headers['etag'] == '"v1"'
+    assert dict(response.headers) == {'etag': '"v1"'}
+
+
+def test_aio_memory_transport():
+    aio = pytest.importorskip('wowza.aio')
+    from wowza.aio.client import AsyncClient
+    transport = AsyncMemoryTransport(lambda *request:
+        (200, {'live_streams': [{'id': 'a'}]}, {}))
+
+    async def collect():
+        client = AsyncClient(base_url='https://wowza.test/api/v1/',
+            transport=transport)
+        live_streams = aio.LiveStreams(client=client)
+        return [r async for r in live_streams.iter_live_streams(stream=True)]
+
+    assert asyncio.run(collect()) == [{'id': 'a'}]
+
+
+def test_transport_interface():
+    class Incomplete(Transport):
+        def close(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    registry = ClientRegistry(transport_class=Urllib3Transport, pool_maxsize=4)
+    client = registry.add('acme', 'key', 'secret')
+    assert isinstance(client.transport, Urllib3Transport)
+    registry.close()
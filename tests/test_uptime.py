@@ -0,0 +1,82 @@
+import time
+import pytest
+from wowza import Transcoders
+from wowza.exceptions import InvalidParameter, MissingParameter
+
+numpy = pytest.importorskip('numpy')
+from wowza.uptime import UptimeLoader, UptimeMetrics  # noqa: E402
+
+
+def historic(start, count, cpu=lambda i: i):
+    return {'transcoder': {'uptime_id': 'u', 'metrics': [{
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+            time.gmtime(start + 60 * i)),
+        'cpu': cpu(i),
+        'bits_in_rate': {'value': 1000.0 * i, 'units': 'Kbps'},
+        'status': 'normal'
+    } for i in range(count)]}}
+
+
+def test_uptime_paths(api):
+    api.add('GET', 'transcoders/t1/uptimes', {'uptimes': []})
+    api.add('GET', 'transcoders/t1/uptimes/u1/metrics/current', {'transcoder': {}})
+    transcoders = Transcoders(base_url=api.url + 'transcoders/')
+    assert transcoders.uptime('t1') == {'uptimes': []}
+    assert transcoders.uptime('t1', 'u1', 'current') == {'transcoder': {}}
+    with pytest.raises(MissingParameter):
+        transcoders.uptime('t1', options='historic')
+    with pytest.raises(InvalidParameter):
+        transcoders.uptime('t1', 'u1', 'weekly')
+
+
+def test_from_response():
+    metrics = UptimeMetrics.from_response(historic(3600, 5))
+    assert len(metrics) == 5
+    assert sorted(metrics.metrics) == ['bits_in_rate', 'cpu']
+    assert metrics.times[0] == 3600 and metrics.times[-1] == 3600 + 240
+    assert list(metrics['bits_in_rate']) == [0, 1000, 2000, 3000, 4000]
+
+
+def test_resample_and_rollup():
+    metrics = UptimeMetrics([0, 30, 60, 90, 120],
+        {'cpu': [10, 20, numpy.nan, 40, 50]})
+    assert list(metrics.resample(60, 'mean')['cpu']) == [15, 40, 50]
+    assert list(metrics.resample(60, 'max')['cpu']) == [20, 40, 50]
+    assert list(metrics.resample(60, 'count')['cpu']) == [2, 1, 1]
+    assert list(metrics.resample(60).times) == [0, 60, 120]
+    assert metrics.rollup('mean') == {'cpu': 30}
+    assert metrics.rollup('min') == {'cpu': 10}
+    assert len(metrics.between(30, 120)) == 3
+    with pytest.raises(ValueError):
+        metrics.resample(60, 'median')
+
+
+def test_concat():
+    a = UptimeMetrics([60, 0], {'cpu': [2, 1]})
+    b = UptimeMetrics([30], {'gpu': [5]})
+    fleet = UptimeMetrics.concat([a, b])
+    assert list(fleet.times) == [0, 30, 60]
+    assert list(fleet['cpu'])[::2] == [1, 2]
+    assert numpy.isnan(fleet['cpu'][1])
+
+
+def test_loader_caches(api, tmp_path):
+    api.add('GET', 'transcoders/t1/uptimes/u1/metrics/historic', historic(0, 10))
+    api.add('GET', 'transcoders/t2/uptimes/u2/metrics/historic', historic(0, 20))
+    transcoders = Transcoders(base_url=api.url + 'transcoders/')
+    loader = UptimeLoader(transcoders, cache_dir=str(tmp_path))
+    loaded = loader.load_many([('t1', 'u1'), ('t2', 'u2'), ('t3', 'u3')])
+    assert sorted(loaded) == [('t1', 'u1'), ('t2', 'u2')]
+    assert list(loader.errors) == [('t3', 'u3')]
+    assert loader.load('t1', 'u1') is loaded[('t1', 'u1')]
+    assert len(api.requests) == 3
+    # A new loader reads the files saved by the first one
+    cached = UptimeLoader(transcoders, cache_dir=str(tmp_path)).load('t2', 'u2')
+    assert len(api.requests) == 3
+    assert list(cached['cpu']) == list(range(20))
+
+
+def test_loader_rejects_async_transcoders():
+    aio = pytest.importorskip('wowza.aio')
+    with pytest.raises(TypeError):
+        UptimeLoader(aio.Transcoders(api_key='key', access_key='secret'))
@@ -1,35 +1,31 @@
-import os, requests
-from wowza.exceptions import NoApiKey, NoAccessKey
+"""
+Importing the package is cheap and has no side effects: credentials and the
+API location are read from the environment (see wowza.config) when the first
+client is created, and the HTTP stack is imported along with the first
+transport.
+"""
+from wowza import config
+from wowza.config import configure
 
-WOWZA_API_KEY = os.environ.get(
-	'WOWZA_API_KEY', None
-)
+# Module level settings kept for backward compatibility. They are resolved
+# on access, see #__getattr__().
+_LAZY = {
+	'WOWZA_API_KEY': config.api_key,
+	'WOWZA_ACCESS_KEY': config.access_key,
+	'WOWZA_PRODUCTION_LEVEL': config.production_level,
+	'WOWZA_BASE_URL': config.base_url,
+}
 
-WOWZA_ACCESS_KEY = os.environ.get(
-	'WOWZA_ACCESS_KEY', None
-)
 
-if not WOWZA_API_KEY:
-	raise NoApiKey({
-		'message': 'API key needed to interact with API!'
-	})
-if not WOWZA_ACCESS_KEY:
-	raise NoAccessKey({
-		'message': 'Access key needed to interact with API!'
-	})
+def __getattr__(name):
+	if name in _LAZY:
+		return _LAZY[name]()
+	if name == 'session':
+		# The requests session behind the default transport
+		from wowza.client import default_transport
+		return default_transport().session
+	raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
 
-# Get the production level
-WOWZA_PRODUCTION_LEVEL = os.environ.get(
-	'WOWZA_PRODUCTION_LEVEL',
-	'SANDBOX')
-
-# Set default production level to sandbox
-WOWZA_BASE_URL = 'https://api{}.cloud.wowza.com/api/v1/'.format(
-	'-sandbox' if WOWZA_PRODUCTION_LEVEL == 'SANDBOX' else ''
-)
-
-session = requests.Session()
-session.params = {}
-session.params['accept'] = 'application/json'
 
+from wowza.client import Client
 from wowza.wowza import *
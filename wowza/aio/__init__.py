@@ -0,0 +1,9 @@
+"""
+asyncio versions of the Wowza endpoint classes, built on aiohttp.
+Every method mirrors its counterpart in wowza.wowza and has to be awaited:
+
+    live_streams = LiveStreams()
+    response = await live_streams.info(stream_id, 'state')
+"""
+
+from wowza.aio.wowza import *
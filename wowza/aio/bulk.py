@@ -0,0 +1,88 @@
+"""
+Async version of wowza.bulk
+"""
+import asyncio
+from wowza.bulk import BulkResult, unique, deadline_error, in_flight_error
+
+
+async def run_many(func, ids, max_workers=10, deadline=None):
+    """
+    Awaits func(id) for every id, with at most max_workers calls in flight.
+    Works like wowza.bulk.run_many(): calls cancelled at the deadline are
+    recorded as DeadlineInFlight, the request they sent may still be
+    applied.
+    """
+    result = BulkResult()
+    semaphore = asyncio.Semaphore(max_workers)
+    started = set()
+
+    async def run(i):
+        async with semaphore:
+            started.add(i)
+            return await func(i)
+
+    tasks = dict((asyncio.ensure_future(run(i)), i) for i in unique(ids))
+    if not tasks:
+        return result
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+        i = tasks[task]
+        result.errors[i] = (in_flight_error if i in started else
+            deadline_error)(deadline)
+    for task in done:
+        if task.exception() is None:
+            result.results[tasks[task]] = task.result()
+        else:
+            result.errors[tasks[task]] = task.exception()
+    return result
+
+
+async def iter_many(func, ids, max_workers=10, deadline=None):
+    """
+    Async generator version of wowza.bulk.iter_many(). ids can also be an
+    async iterable.
+    """
+    loop = asyncio.get_running_loop()
+    ends = None if deadline is None else loop.time() + deadline
+    if hasattr(ids, '__aiter__'):
+        ids = ids.__aiter__()
+        next_id = ids.__anext__
+    else:
+        ids = iter(ids)
+
+        async def next_id():
+            try:
+                return next(ids)
+            except StopIteration:
+                raise StopAsyncIteration
+    seen = set()
+    pending = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_workers:
+                try:
+                    i = await next_id()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                if i not in seen:
+                    seen.add(i)
+                    pending[asyncio.ensure_future(func(i))] = i
+            if not pending:
+                return
+            timeout = None if ends is None else max(0, ends - loop.time())
+            done, _ = await asyncio.wait(pending, timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                for i in pending.values():
+                    yield i, None, in_flight_error(deadline)
+                return
+            for task in done:
+                i = pending.pop(task)
+                error = task.exception()
+                yield i, None if error else task.result(), error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,155 @@
+"""
+Async version of wowza.client
+"""
+import asyncio, itertools, time
+from wowza.cache import MISS
+from wowza.client import Client
+from wowza.response import parse
+from wowza.streaming import ArrayDecoder
+from wowza.aio.transport import AiohttpTransport
+
+_default_transport = None
+
+
+def default_transport():
+    """
+    Returns the transport used by async endpoint instances created without
+    a client
+    """
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = AiohttpTransport()
+    return _default_transport
+
+
+class AsyncClient(Client):
+    """
+    Async version of wowza.client.Client. Extra keyword arguments are passed
+    to the transport (see wowza.aio.transport.AiohttpTransport).
+    """
+
+    transport_class = AiohttpTransport
+
+    async def request(self, method, url, param_dict=None, raw=False, params=None,
+        retry_policy=None):
+        key = self._cache_key(method, url, params, raw)
+        if key is not None:
+            body = self.cache.get(key)
+            if body is not MISS:
+                return body
+        flight = self._flight_key(method, url, params, raw)
+        if flight is not None:
+            return await self.single_flight.do(flight, lambda: self._fetch(
+                method, url, param_dict, raw, params, retry_policy, key))
+        return await self._fetch(method, url, param_dict, raw, params,
+            retry_policy, key)
+
+    async def _fetch(self, method, url, param_dict, raw, params, retry_policy,
+        key):
+        call = self._start_call(method, url)
+        try:
+            body = await self._retrying(method, url, self._encode(param_dict),
+                raw, params, retry_policy or self.retry_policy, key, call)
+        except BaseException as error:
+            # Cancelled and interrupted calls included
+            self._end_call(call, error)
+            raise
+        finally:
+            if self.cache is not None and method != 'GET':
+                self.cache.invalidate(url, self.base_url)
+        self._end_call(call)
+        if self.index is not None:
+            self.index.observe(method, url, body, self.base_url)
+        return body
+
+    async def _retrying(self, method, url, data, raw, params, policy,
+        key=None, call=None):
+        if policy is None:
+            return await self._send(method, url, data, raw, params, key,
+                call)
+        started = time.monotonic()
+        for attempt in itertools.count():
+            try:
+                return await self._send(method, url, data, raw, params,
+                    key, call)
+            except Exception as error:
+                delay = self._retry_delay(policy, method, error, attempt,
+                    started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    async def _send(self, method, url, data, raw, params, key=None,
+        call=None):
+        generation = self.cache.generation() if key is not None else None
+        headers = self.cache.conditional(key) if key is not None else None
+        response = await self._exchange(method, url, data, params, headers,
+            call=call)
+        if headers and response.status_code == 304:
+            body = self.cache.revalidated(key, url)
+            if body is not MISS:
+                return body
+            return await self._send(method, url, data, raw, params, key,
+                call)
+        body = self._body(response, raw)
+        if key is not None:
+            self.cache.set(key, url, body, response.headers, generation)
+        return body
+
+    async def _exchange(self, method, url, data, params, headers=None,
+        stream=False, call=None):
+        headers = dict(self.headers, **headers) if headers else self.headers
+        for attempt in itertools.count():
+            await asyncio.sleep(self._wait_time(method, url))
+            response = await self.transport.request(method, url, data=data,
+                headers=headers, params=params, **self._stream(stream))
+            if call is not None:
+                self.metrics.exchanged(call, data, response, stream)
+            delay = self._throttled(response, attempt, method, url)
+            if delay is None:
+                return response
+            if stream:
+                response.close()
+            await asyncio.sleep(delay)
+
+    async def stream(self, method, url, key, params=None, chunk_size=65536):
+        """
+        Async generator version of wowza.client.Client#stream()
+        """
+        build = self._model(key)
+        call = self._start_call(method, url)
+        try:
+            response = await self._exchange(method, url, b'', params,
+                stream=True, call=call)
+            try:
+                if response.status_code >= 400:
+                    parse(response.status_code, await response.read(),
+                        self.codec)
+                decoder = ArrayDecoder(key)
+                async for chunk in response.iter_content(chunk_size):
+                    if call is not None:
+                        self.metrics.received(call, chunk)
+                    for element in decoder.feed(chunk):
+                        yield self._streamed(method, url, key, build, element)
+                for element in decoder.close():
+                    yield self._streamed(method, url, key, build, element)
+            finally:
+                response.close()
+        except GeneratorExit:
+            # Closed before the end of the array
+            self._end_call(call)
+            raise
+        except BaseException as error:
+            # Cancelled and interrupted calls included
+            self._end_call(call, error)
+            raise
+        self._end_call(call)
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,33 @@
+"""
+Async version of wowza.coalesce
+"""
+import asyncio
+from wowza import coalesce
+
+
+class SingleFlight(coalesce.SingleFlight):
+    """
+    Async version of wowza.coalesce.SingleFlight. The shared request runs in
+    a task of its own, so cancelling one of the callers doesn't cancel it
+    for the others.
+    """
+
+    async def do(self, key, func):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda task: self._done(key, task))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieved so that it isn't reported when every caller is gone
+            task.exception()
+
+    def in_flight(self):
+        return len(self._calls)
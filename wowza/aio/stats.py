@@ -0,0 +1,45 @@
+"""
+Async version of wowza.stats
+"""
+import asyncio, itertools, time
+from wowza import stats
+
+
+class StatsCollector(stats.StatsCollector):
+    """
+    Async version of wowza.stats.StatsCollector, polling the streams of a
+    wowza.aio.LiveStreams instance. #poll() and #run() are coroutines, and
+    #start() runs the collector in a task of the running loop.
+    """
+
+    async def poll(self):
+        at = time.time()
+        result = await self.live_streams.stats_many(self.stream_ids,
+            self.max_workers, self.interval)
+        self.errors = result.errors
+        self.record(result.results, at)
+        return result
+
+    async def run(self, rounds=None):
+        self._stopped.clear()
+        for done in itertools.count(1):
+            started = time.monotonic()
+            await self.poll()
+            if done == rounds or self._stopped.is_set():
+                return
+            await asyncio.sleep(
+                max(0, self.interval - (time.monotonic() - started)))
+            if self._stopped.is_set():
+                return
+
+    def start(self):
+        self._thread = asyncio.ensure_future(self.run())
+
+    def stop(self):
+        """
+        Stops the collector. A poll in progress is cancelled.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.cancel()
+            self._thread = None
@@ -0,0 +1,88 @@
+"""
+Transports for the async client
+"""
+import aiohttp
+from wowza.response import Response
+from wowza.transport import Transport
+
+
+class StreamedResponse(Response):
+    """
+    Response whose body is read in chunks with #iter_content(). The content
+    is only available after #read(). Must be closed.
+    """
+
+    def __init__(self, response):
+        Response.__init__(self, response.status, response.headers, None)
+        self._response = response
+
+    def iter_content(self, chunk_size):
+        return self._response.content.iter_chunked(chunk_size)
+
+    async def read(self):
+        self.content = await self._response.read()
+        return self.content
+
+    def close(self):
+        self._response.release()
+
+
+class AiohttpTransport(Transport):
+    """
+    Sends requests through an aiohttp session.
+    max_connections: cap on open connections (0 for no cap)
+    max_connections_per_host: cap on open connections per host (0 for no cap)
+    keep_alive: set to False to close connections after every request
+    timeout: seconds to wait for the API before giving up
+    The session is created on first use, inside the running event loop.
+    """
+
+    # Errors a retry policy can treat as transient
+    connection_errors = (aiohttp.ClientConnectionError,)
+
+    def __init__(self,
+        max_connections=100,
+        max_connections_per_host=0,
+        keep_alive=True,
+        timeout=None,
+        session=None):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._session = session
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                    force_close=not self.keep_alive
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        """
+        Sends a request. With stream set, returns a StreamedResponse whose
+        body is left on the connection.
+        """
+        query = {'accept': 'application/json'}
+        query.update(params or {})
+        if stream:
+            response = await self.session.request(method, url, data=data,
+                headers=headers, params=query)
+            return StreamedResponse(response)
+        async with self.session.request(method, url, data=data,
+            headers=headers, params=query) as response:
+            content = await response.read()
+        return Response(response.status, response.headers, content)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
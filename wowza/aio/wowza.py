@@ -0,0 +1,234 @@
+import asyncio
+from wowza import wowza
+from wowza.aio import client as aio_client
+from wowza.aio.bulk import iter_many, run_many
+from wowza.exceptions import InvalidInteraction
+from wowza.polling import StateWaiter
+from wowza.reports import ViewerReport
+from wowza.aio.client import AsyncClient
+
+__all__ = [
+    'AsyncClient', 'close', 'AsyncResource', 'LiveStreams', 'StreamSources',
+    'StreamTargets', 'Players', 'Recordings', 'Schedules', 'Transcoders',
+    'Usage'
+]
+
+
+async def close():
+    """
+    Closes the default transport shared by instances created without a client
+    """
+    await aio_client.default_transport().close()
+
+
+class AsyncResource(wowza.Resource):
+    """
+    Base class for the async endpoint classes.
+    Sends requests through an AsyncClient, so the methods inherited from the
+    synchronous classes return coroutines. Only methods that chain several
+    calls need to be redefined.
+    """
+
+    client_class = AsyncClient
+
+    def _default_transport(self):
+        return aio_client.default_transport()
+
+    def _iter_many(self, func, ids, max_workers, deadline):
+        return iter_many(func, ids, max_workers, deadline)
+
+    async def _run_many(self, func, ids, max_workers, deadline):
+        return await run_many(func, ids, max_workers, deadline)
+
+    async def _state(self, resource_id):
+        return (await self.info(resource_id, 'state'))[self.record]['state']
+
+    async def _states(self, ids):
+        states = {}
+        if len(ids) > 1 and self._list_has_state is not False:
+            wanted = set(ids)
+            records = getattr(self, 'iter_' + self.collection)(prefetch=False)
+            try:
+                async for record in records:
+                    if 'state' not in record:
+                        self._list_has_state = False
+                        break
+                    self._list_has_state = True
+                    if record.get('id') in wanted:
+                        states[record['id']] = record['state']
+            finally:
+                await records.aclose()
+        missing = [i for i in ids if i not in states]
+        states.update(zip(missing,
+            await asyncio.gather(*[self._state(i) for i in missing])))
+        return states
+
+    async def _wait_for_state(self, ids, target_state, timeout, interval, max_interval):
+        waiter = StateWaiter(ids, target_state, timeout, interval, max_interval)
+        while not waiter.update(await self._states(waiter.pending)):
+            await asyncio.sleep(waiter.next_delay())
+        return waiter.states
+
+    async def _fetch_page(self, path, key, page, per_page):
+        response = await self._request('GET', path,
+            params={'page': page, 'per_page': per_page})
+        return response[key]
+
+    async def _paginate(self, path, key, per_page=1000, prefetch=True,
+        stream=False):
+        """
+        Async generator version of wowza.Resource#_paginate(). With prefetch
+        set, the next page is requested in a task while the current one is
+        consumed.
+        """
+        if stream:
+            page = 1
+            while True:
+                count = 0
+                records = self._stream_page(path, key, page, per_page)
+                try:
+                    async for record in records:
+                        count += 1
+                        yield record
+                finally:
+                    await records.aclose()
+                if count < per_page:
+                    return
+                page += 1
+        page = 1
+        pending = asyncio.ensure_future(
+            self._fetch_page(path, key, page, per_page))
+        try:
+            while pending is not None:
+                records = await pending
+                pending = None
+                page += 1
+                if len(records) >= per_page:
+                    pending = self._fetch_page(path, key, page, per_page)
+                    if prefetch:
+                        pending = asyncio.ensure_future(pending)
+                for record in records:
+                    yield record
+        finally:
+            if pending is not None:
+                if asyncio.isfuture(pending):
+                    pending.cancel()
+                else:
+                    pending.close()
+
+    async def refresh_index(self):
+        index = self._index()
+        ids = []
+        async for record in getattr(self, 'iter_' + self.collection)():
+            index.update(self.collection, record['id'], record)
+            ids.append(record['id'])
+        index.retain(self.collection, ids)
+
+    async def filter(self, **criteria):
+        if not self._index().is_complete(self.collection):
+            await self.refresh_index()
+        return self._index().filter(self.collection, **criteria)
+
+    async def find_by_name(self, name):
+        ids = await self.filter(name=name)
+        return ids[0] if ids else None
+
+    async def _busy_update(self, path, param_dict, wait, busy_error, message):
+        if wait:
+            return await wowza.Resource._busy_update(self, path, param_dict,
+                wait, busy_error, message)
+        try:
+            return await self._request('PATCH', path, param_dict)
+        except busy_error:
+            raise busy_error({'message': message})
+
+
+class LiveStreams(AsyncResource, wowza.LiveStreams):
+    """
+    Async version of wowza.LiveStreams
+    """
+
+    async def delete(self, stream_id, optimistic=None):
+        if not self._optimistic(optimistic):
+            self._check_delete(await self.info(stream_id, 'state'))
+        path = self.base_url + 'live_streams/{}'.format(stream_id)
+        return await self._request('DELETE', path, raw=True)
+
+    async def stop(self, stream_id, optimistic=None):
+        path = self.base_url + "live_streams/{}/stop".format(stream_id)
+        if not self._optimistic(optimistic):
+            self._check_stop(await self.info(stream_id, 'state'))
+            return await self._request('PUT', path)
+        try:
+            return await self._request('PUT', path)
+        except InvalidInteraction:
+            raise self._not_running()
+
+
+class StreamSources(AsyncResource, wowza.StreamSources):
+    """
+    Async version of wowza.StreamSources
+    """
+
+
+class StreamTargets(AsyncResource, wowza.StreamTargets):
+    """
+    Async version of wowza.StreamTargets
+    """
+
+
+class Players(AsyncResource, wowza.Players):
+    """
+    Async version of wowza.Players
+    """
+
+
+class Recordings(AsyncResource, wowza.Recordings):
+    """
+    Async version of wowza.Recordings
+    """
+
+
+class Schedules(AsyncResource, wowza.Schedules):
+    """
+    Async version of wowza.Schedules
+    """
+
+    async def toggle(self, sched_id):
+        state = (await self.info(sched_id, 'state'))['schedule']['state']
+        if state == 'enabled':
+            return await self.disable(sched_id)
+        else:
+            return await self.enable(sched_id)
+
+
+class Transcoders(AsyncResource, wowza.Transcoders):
+    """
+    Async version of wowza.Transcoders
+    """
+
+    async def uptime_metrics(self, tran_id, uptime_id):
+        from wowza.uptime import UptimeMetrics
+        return UptimeMetrics.from_response(
+            await self.uptime(tran_id, uptime_id, 'historic'))
+
+
+class Usage(AsyncResource, wowza.Usage):
+    """
+    Async version of wowza.Usage
+    """
+
+    stream_targets_class = StreamTargets
+
+    async def _stream_target_ids(self):
+        stream_targets = self.stream_targets_class(client=self.client)
+        async for stream_target in stream_targets.iter_stream_targets():
+            yield stream_target['id']
+
+    async def viewer_report(self, stream_target_ids=None, max_workers=10,
+        deadline=None, report=None):
+        report = ViewerReport() if report is None else report
+        async for stream_target_id, data, error in self.iter_viewer_report(
+            stream_target_ids, max_workers, deadline):
+            report.add(stream_target_id, data, error)
+        return report
@@ -0,0 +1,138 @@
+"""
+Helpers to run the same call over many resources with bounded parallelism
+"""
+import time
+from wowza.exceptions import DeadlineExceeded, DeadlineInFlight
+
+
+class BulkResult(object):
+    """
+    Outcome of a bulk operation.
+    results maps every id that succeeded to its response, errors maps every
+    id that failed to the exception raised for it.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return '<BulkResult: {} succeeded, {} failed>'.format(
+            len(self.results), len(self.errors))
+
+
+def unique(ids):
+    """
+    Drops duplicate ids, keeping their order
+    """
+    seen = set()
+    return [i for i in ids if not (i in seen or seen.add(i))]
+
+
+def deadline_error(deadline):
+    return DeadlineExceeded({
+        'message': 'The operation did not finish within {} seconds.'\
+            .format(deadline)
+    })
+
+
+def in_flight_error(deadline):
+    return DeadlineInFlight({
+        'message': 'The call was still running after {} seconds and may '
+            'still complete.'.format(deadline)
+    })
+
+
+def run_many(func, ids, max_workers=10, deadline=None):
+    """
+    Calls func(id) for every id on a pool of at most max_workers threads.
+    A failing id doesn't abort the batch: its exception is collected in the
+    returned BulkResult. With deadline (in seconds) set, ids that haven't
+    started by then are recorded as DeadlineExceeded, and ids whose call is
+    still running as DeadlineInFlight: threads can't be stopped, so their
+    call is left running and its change may still go through.
+    """
+    result = BulkResult()
+    ids = unique(ids)
+    if not ids:
+        return result
+    # Imported here to keep `import wowza` cheap
+    from concurrent.futures import ThreadPoolExecutor, wait
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(ids)))
+    futures = dict((executor.submit(func, i), i) for i in ids)
+    try:
+        wait(futures, timeout=deadline)
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    for future, i in futures.items():
+        if future.cancelled():
+            result.errors[i] = deadline_error(deadline)
+        elif not future.done():
+            result.errors[i] = in_flight_error(deadline)
+        elif future.exception() is None:
+            result.results[i] = future.result()
+        else:
+            result.errors[i] = future.exception()
+    return result
+
+
+def _outcome(future, deadline):
+    """
+    Returns the (response, error) of a future past the deadline, cancelling
+    it if it hasn't started
+    """
+    if future.cancel():
+        return None, deadline_error(deadline)
+    if not future.done():
+        return None, in_flight_error(deadline)
+    error = future.exception()
+    return None if error else future.result(), error
+
+
+def iter_many(func, ids, max_workers=10, deadline=None):
+    """
+    Calls func(id) for every id on a pool of at most max_workers threads,
+    and yields (id, response, error) tuples as the calls complete, error
+    being None for the ids that succeeded.
+    ids can be any iterable, i.e. a generator still walking a list
+    endpoint: it is consumed as workers free up. With deadline (in seconds)
+    set, the calls still running by then are yielded with DeadlineInFlight
+    (see #run_many()) and the remaining ids aren't consumed.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    ends = None if deadline is None else time.monotonic() + deadline
+    ids = iter(ids)
+    seen = set()
+    pending = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            for i in ids:
+                if i in seen:
+                    continue
+                seen.add(i)
+                pending[executor.submit(func, i)] = i
+                if len(pending) >= max_workers:
+                    break
+            if not pending:
+                return
+            timeout = None if ends is None else max(0, ends - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                for future, i in list(pending.items()):
+                    yield (i,) + _outcome(future, deadline)
+                return
+            for future in done:
+                i = pending.pop(future)
+                error = future.exception()
+                yield i, None if error else future.result(), error
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
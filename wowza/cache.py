@@ -0,0 +1,209 @@
+"""
+In-memory response cache for the read endpoints
+"""
+import re, threading, time
+from collections import OrderedDict, deque
+from urllib.parse import urlencode
+
+# Returned by ResponseCache#get() when there is no fresh entry
+MISS = object()
+
+# Invalidations remembered to check the responses of requests in flight
+# against. Responses to requests older than that aren't cached.
+RECENT_INVALIDATIONS = 256
+
+
+class ResponseCache(object):
+    """
+    Caches decoded GET responses for a limited time.
+    default_ttl: seconds a response stays fresh
+    ttls: list of (pattern, ttl) overriding default_ttl for the URLs the
+        pattern is found in, i.e. [(r'/(state|stats)$', 1)]. A ttl of 0
+        disables caching for those URLs.
+    max_entries: the least recently used entries are evicted past this size
+    revalidate: keep the validators (ETag, Last-Modified) of responses, so
+        that once an entry is stale the client asks the API whether it
+        changed (If-None-Match, If-Modified-Since) and reuses it on a 304.
+        Responses with validators are kept for that even with a ttl of 0.
+    Cached responses are shared between callers and shouldn't be modified.
+    """
+
+    def __init__(self, default_ttl=5.0, ttls=None, max_entries=1024,
+        revalidate=True):
+        self.default_ttl = default_ttl
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls or []]
+        self.max_entries = max_entries
+        self.revalidate = revalidate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0
+        self._entries = OrderedDict()
+        # Bumped by every invalidation, see #generation()
+        self._generation = 0
+        self._recent = deque(maxlen=RECENT_INVALIDATIONS)
+        self._lock = threading.Lock()
+
+    def key(self, url, params=None):
+        return url + '?' + urlencode(sorted(params.items())) if params else url
+
+    def ttl(self, url):
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key):
+        """
+        Returns the cached response for key, or MISS
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None and entry[2] is None:
+                # Stale entries with validators are kept for #conditional()
+                del self._entries[key]
+            self.misses += 1
+            return MISS
+
+    def generation(self):
+        """
+        Returns the current invalidation generation, taken before sending
+        a request whose response is passed to #set()
+        """
+        with self._lock:
+            return self._generation
+
+    def set(self, key, url, body, headers=None, generation=None):
+        """
+        Caches body, the response to url. headers are the headers of the
+        response, to take its validators from. generation is the
+        #generation() from before the request was sent: the response isn't
+        cached if key was invalidated since, as it may predate a change.
+        """
+        ttl = self.ttl(url)
+        validators = self._validators(headers)
+        if ttl <= 0 and validators is None:
+            return
+        with self._lock:
+            if generation is not None and self._invalidated(key, generation):
+                return
+            self._entries[key] = (time.monotonic() + max(ttl, 0), body, validators)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _invalidated(self, key, generation):
+        """
+        Tells whether key was invalidated after generation
+        """
+        if generation == self._generation:
+            return False
+        if not self._recent or self._recent[0][0] > generation + 1:
+            # Some of the invalidations since are forgotten
+            return True
+        for invalidated, stale in reversed(self._recent):
+            if invalidated <= generation:
+                return False
+            if stale is None or stale(key):
+                return True
+        return False
+
+    def _invalidating(self, stale):
+        """
+        Records an invalidation of the keys stale(key) is true for (every
+        key if stale is None). Called with the lock held.
+        """
+        self._generation += 1
+        self._recent.append((self._generation, stale))
+
+    def _validators(self, headers):
+        """
+        Returns the conditional request headers matching the validators in
+        the headers of a response, or None if it has none
+        """
+        if not self.revalidate or not headers:
+            return None
+        validators = {}
+        if headers.get('ETag'):
+            validators['If-None-Match'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = headers['Last-Modified']
+        return validators or None
+
+    def conditional(self, key):
+        """
+        Returns the headers making the request for key conditional on the
+        cached response having changed, or None if there is no entry to
+        revalidate
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[2]) if entry is not None and entry[2] else None
+
+    def revalidated(self, key, url):
+        """
+        Marks the entry for key as fresh again after the API answered a
+        conditional request with 304, and returns it. Returns MISS if the
+        entry was dropped in the meantime.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            self._entries[key] = (time.monotonic() + max(self.ttl(url), 0),
+                entry[1], entry[2])
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+            return entry[1]
+
+    def invalidate(self, url, base_url):
+        """
+        Drops the entries a call to url may have made stale: the resource it
+        targets (with all of its sub-resources), the list of its collection,
+        and anything else under the same id (i.e. the transcoder of a live
+        stream). URLs outside of base_url clear the whole cache.
+        """
+        if not url.startswith(base_url):
+            return self.clear()
+        segments = url[len(base_url):].split('?')[0].strip('/').split('/')
+        collection = base_url + segments[0]
+        resource_id = segments[1] if len(segments) > 1 else None
+
+        def stale(key):
+            path = key.split('?')[0].rstrip('/')
+            if path == collection:
+                return True
+            return resource_id is not None and \
+                resource_id in path[len(base_url):].split('/')
+
+        with self._lock:
+            self._invalidating(stale)
+            for key in [key for key in self._entries if stale(key)]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._invalidating(None)
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the hit/miss counters of the cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'revalidations': self.revalidations,
+                'size': len(self._entries)
+            }
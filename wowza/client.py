@@ -0,0 +1,322 @@
+"""
+Client holding the connection details shared by the endpoint classes
+"""
+import itertools, time
+from wowza import config
+from wowza.cache import MISS
+from wowza.codec import get_codec
+from wowza.coalesce import flight_key
+from wowza.models import MODELS, wrap
+from wowza.ratelimit import retry_after
+from wowza.response import parse
+from wowza.streaming import ArrayDecoder
+from wowza.transport import RequestsTransport
+
+_default_transport = None
+
+
+def default_transport():
+    """
+    Returns the transport used by endpoint instances created without a
+    client. Its session is exposed as wowza.session.
+    """
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = RequestsTransport()
+    return _default_transport
+
+
+class Client(object):
+    """
+    Holds the base URL, credentials, JSON codec and transport used to talk
+    to the API. A client can be injected into any number of endpoint
+    instances, which then share its connection pool:
+
+        client = Client(pool_maxsize=50, per_thread=True)
+        live_streams = LiveStreams(client=client)
+        stream_targets = StreamTargets(client=client)
+
+    rate_limiter: a wowza.ratelimit.RateLimiter holding the request budget
+        of the account
+    max_throttle_retries: number of times a request answered with 429 is
+        retried, after waiting for as long as its Retry-After header asks
+    retry_policy: a wowza.retry.RetryPolicy applied to every request made
+        with the client (no retries by default)
+    cache: a wowza.cache.ResponseCache for GET responses. Other requests
+        invalidate the entries of the resource they target.
+    models: return the records of responses as the compact models of
+        wowza.models rather than dicts
+    index: a wowza.index.ResourceIndex kept up to date with the responses
+        of the client. One is created by the first lookup of an endpoint
+        (see Resource#find_by_name()) when there is none.
+    metrics: a wowza.metrics.Metrics recording the latency and outcome of
+        the calls sent by the client
+    single_flight: a wowza.coalesce.SingleFlight letting identical GETs
+        sent at the same time share one request
+
+    base_url, api_key and access_key default to the settings of
+    wowza.config; NoApiKey or NoAccessKey is raised if there are none.
+    Extra keyword arguments are passed to the transport (see
+    wowza.transport.RequestsTransport).
+    """
+
+    transport_class = RequestsTransport
+
+    def __init__(self,
+        base_url=None,
+        api_key=None,
+        access_key=None,
+        codec=None,
+        transport=None,
+        rate_limiter=None,
+        max_throttle_retries=3,
+        retry_policy=None,
+        cache=None,
+        models=False,
+        index=None,
+        single_flight=None,
+        metrics=None,
+        **transport_options):
+        self.base_url = base_url or config.base_url()
+        self.headers = {
+            'wsc-api-key': api_key or config.api_key(),
+            'wsc-access-key': access_key or config.access_key(),
+            'content-type': 'application/json'
+        }
+        self.codec = get_codec(codec)
+        self.transport = transport or self.transport_class(**transport_options)
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = max_throttle_retries
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.models = models
+        self.index = index
+        self.single_flight = single_flight
+        self.metrics = metrics
+
+    def _encode(self, param_dict):
+        return self.codec.dumps(param_dict) if param_dict is not None else b''
+
+    def _wait_time(self, method, url):
+        """
+        Returns the number of seconds to wait before sending a request
+        """
+        return self.rate_limiter.delay(method, url) if self.rate_limiter else 0
+
+    def _throttled(self, response, attempt, method, url):
+        """
+        Returns the number of seconds to back off for when the API throttled
+        a request that can still be retried, None otherwise
+        """
+        if response.status_code != 429 or attempt >= self.max_throttle_retries:
+            return None
+        delay = retry_after(response.headers, 2 ** attempt)
+        if self.rate_limiter:
+            # Hold back every request of the account, not just this one
+            self.rate_limiter.block(delay)
+            if self.rate_limiter.buckets(method, url):
+                # The wait is taken from the blocked buckets on retry
+                return 0
+        return delay
+
+    def _retry_delay(self, policy, method, error, attempt, started):
+        return policy.delay(error, attempt, time.monotonic() - started,
+            getattr(self.transport, 'connection_errors', ()), method)
+
+    def _cache_key(self, method, url, params, raw):
+        """
+        Returns the cache key of a request, or None if it can't be cached
+        """
+        if self.cache is None or method != 'GET' or raw:
+            return None
+        return self.cache.key(url, params)
+
+    def _flight_key(self, method, url, params, raw):
+        """
+        Returns the key under which a request is coalesced with identical
+        ones in flight, or None if it can't be
+        """
+        if self.single_flight is None or method != 'GET' or raw:
+            return None
+        return flight_key(url, params, self.headers)
+
+    def request(self, method, url, param_dict=None, raw=False, params=None,
+        retry_policy=None):
+        """
+        Sends a request with param_dict as the JSON body and params as the
+        query string, retrying it according to retry_policy (or the retry
+        policy of the client).
+        Returns the decoded JSON response, or the response itself when raw
+        is set. API errors are raised as the matching exception from
+        wowza.exceptions.
+        """
+        key = self._cache_key(method, url, params, raw)
+        if key is not None:
+            body = self.cache.get(key)
+            if body is not MISS:
+                return body
+        flight = self._flight_key(method, url, params, raw)
+        if flight is not None:
+            return self.single_flight.do(flight, lambda: self._fetch(method,
+                url, param_dict, raw, params, retry_policy, key))
+        return self._fetch(method, url, param_dict, raw, params, retry_policy,
+            key)
+
+    def _fetch(self, method, url, param_dict, raw, params, retry_policy, key):
+        call = self._start_call(method, url)
+        try:
+            body = self._retrying(method, url, self._encode(param_dict), raw,
+                params, retry_policy or self.retry_policy, key, call)
+        except BaseException as error:
+            # Cancelled and interrupted calls included
+            self._end_call(call, error)
+            raise
+        finally:
+            if self.cache is not None and method != 'GET':
+                self.cache.invalidate(url, self.base_url)
+        self._end_call(call)
+        if self.index is not None:
+            self.index.observe(method, url, body, self.base_url)
+        return body
+
+    def _start_call(self, method, url):
+        if self.metrics is not None:
+            return self.metrics.start(method, url, self.base_url)
+
+    def _end_call(self, call, error=None):
+        if call is not None:
+            self.metrics.end(call, error)
+
+    def _retrying(self, method, url, data, raw, params, policy, key=None,
+        call=None):
+        if policy is None:
+            return self._send(method, url, data, raw, params, key, call)
+        started = time.monotonic()
+        for attempt in itertools.count():
+            try:
+                return self._send(method, url, data, raw, params, key, call)
+            except Exception as error:
+                delay = self._retry_delay(policy, method, error, attempt,
+                    started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    def _send(self, method, url, data, raw, params, key=None, call=None):
+        """
+        Sends a request once. key is the cache key of a GET, whose cached
+        response is revalidated with a conditional request rather than
+        fetched again when the cache holds its validators.
+        """
+        generation = self.cache.generation() if key is not None else None
+        headers = self.cache.conditional(key) if key is not None else None
+        response = self._exchange(method, url, data, params, headers,
+            call=call)
+        if headers and response.status_code == 304:
+            body = self.cache.revalidated(key, url)
+            if body is not MISS:
+                return body
+            return self._send(method, url, data, raw, params, key, call)
+        body = self._body(response, raw)
+        if key is not None:
+            self.cache.set(key, url, body, response.headers, generation)
+        return body
+
+    def _exchange(self, method, url, data, params, headers=None, stream=False,
+        call=None):
+        """
+        Sends a request, with headers on top of the headers of the client,
+        within the rate limits, and returns the response once the API stops
+        throttling it
+        """
+        headers = dict(self.headers, **headers) if headers else self.headers
+        for attempt in itertools.count():
+            time.sleep(self._wait_time(method, url))
+            response = self.transport.request(method, url, data=data,
+                headers=headers, params=params, **self._stream(stream))
+            if call is not None:
+                self.metrics.exchanged(call, data, response, stream)
+            delay = self._throttled(response, attempt, method, url)
+            if delay is None:
+                return response
+            if stream:
+                response.close()
+            time.sleep(delay)
+
+    def _stream(self, stream):
+        # Transports without streaming support don't take the argument
+        return {'stream': True} if stream else {}
+
+    def _model(self, key):
+        """
+        Returns the function building the elements of the array at key
+        """
+        path = (key,) if isinstance(key, str) else key
+        model = MODELS.get(path[-1]) if self.models and path else None
+        return model or (lambda element: element)
+
+    def stream(self, method, url, key, params=None, chunk_size=65536):
+        """
+        Sends a request and yields the elements of the array at key in the
+        response body as they are decoded, chunk by chunk, from the
+        connection. Memory stays bounded by the size of an element rather
+        than of the body.
+        key: key of the array in the response, or a tuple of keys leading
+            to it through nested objects (see wowza.streaming.ArrayDecoder)
+        Streamed requests aren't cached or retried, except after a 429.
+        """
+        build = self._model(key)
+        call = self._start_call(method, url)
+        try:
+            response = self._exchange(method, url, b'', params, stream=True,
+                call=call)
+            try:
+                if response.status_code >= 400:
+                    parse(response.status_code, response.content, self.codec)
+                decoder = ArrayDecoder(key)
+                for chunk in response.iter_content(chunk_size):
+                    if call is not None:
+                        self.metrics.received(call, chunk)
+                    for element in decoder.feed(chunk):
+                        yield self._streamed(method, url, key, build, element)
+                for element in decoder.close():
+                    yield self._streamed(method, url, key, build, element)
+            finally:
+                response.close()
+        except GeneratorExit:
+            # Closed before the end of the array
+            self._end_call(call)
+            raise
+        except BaseException as error:
+            # Cancelled and interrupted calls included
+            self._end_call(call, error)
+            raise
+        self._end_call(call)
+
+    def _streamed(self, method, url, key, build, element):
+        """
+        Returns an element of a streamed array, once indexed like the
+        records of a list response
+        """
+        if self.index is not None:
+            self.index.observe(method, url, {key: [element]}, self.base_url)
+        return build(element)
+
+    def _body(self, response, raw):
+        """
+        Returns what a request answered with response returns. Errors are
+        raised even when raw is set.
+        """
+        body = parse(response.status_code, response.content, self.codec)
+        if raw:
+            return response
+        return wrap(body) if self.models else body
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,73 @@
+"""
+Single-flight coalescing of identical concurrent GET requests
+"""
+import threading
+from urllib.parse import urlencode
+
+
+def flight_key(url, params, headers):
+    """
+    Returns the key shared by identical GETs: URL, query string and
+    credentials
+    """
+    query = urlencode(sorted(params.items())) if params else ''
+    return (url, query, headers.get('wsc-api-key'),
+        headers.get('wsc-access-key'))
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Lets concurrent identical GETs share one request: the first caller
+    sends it, and the callers that come in before its response wait for it
+    and get the same decoded body (or exception). Once the response is in,
+    the next call sends a new request; nothing is kept, see
+    wowza.cache.ResponseCache for that.
+    One instance can be shared by several clients: credentials are part of
+    the key. Shared responses shouldn't be modified.
+    """
+
+    def __init__(self):
+        # Number of calls served by the request of another caller
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Returns func(), or the outcome of the call in flight for key
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,70 @@
+"""
+JSON codecs used to encode request bodies and decode response bodies.
+Decoding works on the raw response bytes. orjson is used when it is
+installed, otherwise the standard library json module.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibCodec(object):
+    """
+    Codec built on the standard library json module
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        # json.loads() detects the encoding of bytes itself
+        return json.loads(data)
+
+
+class OrjsonCodec(object):
+    """
+    Codec built on orjson, which encodes straight to bytes and decodes
+    bytes without building an intermediate str
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson needs to be installed to use the orjson codec.')
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+CODECS = {
+    'json': StdlibCodec,
+    'orjson': OrjsonCodec
+}
+
+_default = None
+
+
+def get_codec(codec=None):
+    """
+    Returns a codec instance.
+    codec can be a name from CODECS, any object with dumps()/loads(), or
+    None/'auto' for the fastest codec installed.
+    """
+    global _default
+    if codec is None or codec == 'auto':
+        if _default is None:
+            _default = OrjsonCodec() if orjson is not None else StdlibCodec()
+        return _default
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError('Unknown codec [{}]. Valid codecs are: {}'\
+                .format(codec, list(CODECS)))
+        return CODECS[codec]()
+    return codec
@@ -0,0 +1,75 @@
+"""
+Credentials and API location, read from the environment on first use:
+
+    WOWZA_API_KEY, WOWZA_ACCESS_KEY: credentials of the account
+    WOWZA_PRODUCTION_LEVEL: SANDBOX (the default) or anything else for the
+        production API
+
+Values passed to #configure() take precedence over the environment.
+"""
+import os
+from wowza.exceptions import NoApiKey, NoAccessKey
+
+_settings = {}
+
+
+def configure(api_key=None, access_key=None, production_level=None,
+    base_url=None):
+    """
+    Sets the defaults used by clients created without explicit values.
+    Arguments left to None keep falling back on the environment.
+    """
+    _settings.update({
+        'WOWZA_API_KEY': api_key,
+        'WOWZA_ACCESS_KEY': access_key,
+        'WOWZA_PRODUCTION_LEVEL': production_level,
+        'WOWZA_BASE_URL': base_url
+    })
+
+
+def get(name, default=None):
+    value = _settings.get(name)
+    if value is None:
+        value = os.environ.get(name, default)
+    return value
+
+
+def api_key():
+    """
+    Returns the API key, or raises NoApiKey if there is none
+    """
+    key = get('WOWZA_API_KEY')
+    if not key:
+        raise NoApiKey({
+            'message': 'API key needed to interact with API!'
+        })
+    return key
+
+
+def access_key():
+    """
+    Returns the access key, or raises NoAccessKey if there is none
+    """
+    key = get('WOWZA_ACCESS_KEY')
+    if not key:
+        raise NoAccessKey({
+            'message': 'Access key needed to interact with API!'
+        })
+    return key
+
+
+def production_level():
+    return get('WOWZA_PRODUCTION_LEVEL', 'SANDBOX')
+
+
+def base_url():
+    """
+    Returns the base URL of the API, the sandbox one unless the production
+    level says otherwise
+    """
+    url = get('WOWZA_BASE_URL')
+    if url:
+        return url
+    return 'https://api{}.cloud.wowza.com/api/v1/'.format(
+        '-sandbox' if production_level() == 'SANDBOX' else ''
+    )
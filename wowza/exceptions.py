@@ -169,3 +169,64 @@ class LimitReached(Exception):
 	def __init__(self, error):
 		Exception.__init__(self, error['message'])
 		self.code = 409
+
+class DeadlineExceeded(Exception):
+	"""
+	Class for exceptions due to an operation not finishing before its deadline
+	"""
+	def __init__(self, error):
+		Exception.__init__(self, error['message'])
+		self.code = 408
+
+class DeadlineInFlight(DeadlineExceeded):
+	"""
+	Class for exceptions due to a call still running at the deadline of a bulk
+	operation. It can't be stopped, so the change it makes may still go
+	through.
+	"""
+
+class TooManyRequests(Exception):
+	"""
+	Class for exceptions due to hitting the API rate limit
+	"""
+	def __init__(self, error):
+		Exception.__init__(self, error['message'])
+		self.code = 429
+
+class ApiError(Exception):
+	"""
+	Class for API errors that don't map to a more specific exception
+	"""
+	def __init__(self, error):
+		Exception.__init__(self, error['message'])
+		self.code = error.get('status', 500)
+
+
+# Maps the meta.code of an API error response to the exception raised for it
+ERROR_CODES = {
+	'ERR-400-InvalidParameter': InvalidParameter,
+	'ERR-400-MissingParameter': MissingParameter,
+	'ERR-401-NoApiKey': NoApiKey,
+	'ERR-401-NoAccessKey': NoAccessKey,
+	'ERR-401-InvalidApiKey': InvalidApiKey,
+	'ERR-401-InvalidAccessKey': InvalidAccessKey,
+	'ERR-401-BadAccountStatus': BadAccountStatus,
+	'ERR-401-FeatureNotEnabled': FeatureNotEnabled,
+	'ERR-401-TrialExceeded': TrialExceeded,
+	'ERR-403-RecordUnaccessible': RecordUnaccessible,
+	'ERR-404-RecordNotFound': RecordNotFound,
+	'ERR-405-ConnectionCodeNotSupported': ConnectionCodeNotSupported,
+	'ERR-409-LimitReached': LimitReached,
+	'ERR-410-RecordDeleted': RecordDeleted,
+	'ERR-422-RecordInvalid': RecordInvalid,
+	'ERR-422-InvalidInteraction': InvalidInteraction,
+	'ERR-422-InvalidStateChange': InvalidStateChange,
+	'ERR-422-LimitReached': LimitReached,
+	'ERR-423-TokenAuthBusy': TokenAuthBusy,
+	'ERR-423-GeoblockingBusy': GeoblockingBusy,
+}
+
+# Exceptions raised by HTTP status when meta.code isn't in ERROR_CODES
+STATUS_ERRORS = {
+	429: TooManyRequests,
+}
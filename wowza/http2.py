@@ -0,0 +1,160 @@
+"""
+HTTP/2 transports built on httpx (pip3 install wowza[http2]). Concurrent
+calls are multiplexed as streams over a few connections to the API instead
+of taking one connection (and TLS handshake) each:
+
+    client = Client(transport=Http2Transport(max_connections=4))
+    client = AsyncClient(transport=AsyncHttp2Transport())
+
+Servers that don't negotiate HTTP/2 are talked to over HTTP/1.1.
+"""
+import asyncio
+from wowza.response import Response
+from wowza.transport import QUERY, Transport
+
+
+def _httpx():
+    # httpx is imported with the first transport, see wowza/__init__.py
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError('httpx needs to be installed to use wowza.http2.')
+    return httpx
+
+
+class Http2Response(Response):
+    """
+    Response of a request sent with stream set, whose body is read in
+    chunks with #iter_content()
+    """
+
+    def __init__(self, response):
+        Response.__init__(self, response.status_code, response.headers, None)
+        self._response = response
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self._response.read()
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+
+    def iter_content(self, chunk_size):
+        return self._response.iter_bytes(chunk_size)
+
+    def close(self):
+        self._response.close()
+
+
+class Http2Transport(Transport):
+    """
+    Sends requests through an httpx client speaking HTTP/2. The client is
+    thread safe: the workers of a ThreadPoolExecutor share its connections,
+    their requests running as concurrent streams.
+    max_connections: cap on open connections. With HTTP/2, a single one
+        carries up to the number of concurrent streams the server allows
+        (usually 100).
+    max_keepalive_connections: connections kept open once idle
+    keep_alive_expiry: seconds an idle connection is kept open
+    timeout: seconds to wait for the API before giving up
+    verify: verify the certificate of the API, or an ssl.SSLContext to
+        verify it with
+    http1: allow HTTP/1.1 with servers that don't negotiate HTTP/2
+    """
+
+    client_class = 'Client'
+
+    def __init__(self,
+        max_connections=10,
+        max_keepalive_connections=10,
+        keep_alive_expiry=5.0,
+        timeout=None,
+        verify=True,
+        http1=True,
+        client=None):
+        httpx = _httpx()
+        self.client = client or getattr(httpx, self.client_class)(
+            http2=True,
+            http1=http1,
+            verify=verify,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keep_alive_expiry
+            )
+        )
+
+    @property
+    def connection_errors(self):
+        httpx = _httpx()
+        return (httpx.NetworkError, httpx.RemoteProtocolError)
+
+    def _build(self, method, url, data, headers, params):
+        return self.client.build_request(method, url, content=data or None,
+            headers=headers, params=QUERY + list((params or {}).items()))
+
+    def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        response = self.client.send(self._build(method, url, data, headers,
+            params), stream=stream)
+        if stream:
+            return Http2Response(response)
+        return Response(response.status_code, response.headers, response.content)
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncHttp2Response(Http2Response):
+    """
+    Http2Response read like a streamed response of wowza.aio.transport.
+    closing: the set of pending closes of the transport
+    """
+
+    def __init__(self, response, closing):
+        Http2Response.__init__(self, response)
+        self._closing = closing
+
+    def iter_content(self, chunk_size):
+        return self._response.aiter_bytes(chunk_size)
+
+    async def read(self):
+        self.content = await self._response.aread()
+        return self.content
+
+    def close(self):
+        # The async client closes streamed responses synchronously: the
+        # transport awaits the close on #close()
+        task = asyncio.ensure_future(self._response.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+
+class AsyncHttp2Transport(Http2Transport):
+    """
+    Http2Transport for wowza.aio.client.AsyncClient, on an
+    httpx.AsyncClient. Coroutines of the same loop share its connections.
+    """
+
+    client_class = 'AsyncClient'
+
+    def __init__(self, *args, **kwargs):
+        Http2Transport.__init__(self, *args, **kwargs)
+        self._closing = set()
+
+    async def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        response = await self.client.send(self._build(method, url, data,
+            headers, params), stream=stream)
+        if stream:
+            return AsyncHttp2Response(response, self._closing)
+        return Response(response.status_code, response.headers, response.content)
+
+    async def close(self):
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        await self.client.aclose()
@@ -0,0 +1,160 @@
+"""
+In-memory index of the resources a client has seen, for lookups by name
+and other common fields without calling the API
+"""
+import threading
+
+# Collections of the API and the key of one of their records in responses
+RECORDS = {
+    'live_streams': 'live_stream',
+    'stream_sources': 'stream_source',
+    'stream_targets': 'stream_target',
+    'players': 'player',
+    'recordings': 'recording',
+    'schedules': 'schedule',
+    'transcoders': 'transcoder',
+}
+
+
+class ResourceIndex(object):
+    """
+    Keeps the id and a few fields (keys) of every resource in the responses
+    received by a client, with a reverse lookup from each field value to
+    ids. Lists and records returned by the API add or update entries,
+    responses to changes (start, update, ...) patch them, and deletions
+    remove them.
+    A collection is complete once it has been listed in full, see
+    #retain(). Until then, lookups can miss resources.
+    """
+
+    DEFAULT_KEYS = ('name', 'state', 'broadcast_location')
+
+    def __init__(self, keys=DEFAULT_KEYS):
+        self.keys = tuple(keys)
+        self._records = dict((c, {}) for c in RECORDS)
+        self._lookup = dict((c, dict((k, {}) for k in self.keys)) for c in RECORDS)
+        self._complete = set()
+        self._lock = threading.Lock()
+
+    def observe(self, method, url, body, base_url):
+        """
+        Updates the index from a response of the API
+        """
+        if not url.startswith(base_url):
+            return
+        segments = url[len(base_url):].split('?')[0].strip('/').split('/')
+        collection = segments[0]
+        if collection not in RECORDS:
+            return
+        resource_id = segments[1] if len(segments) > 1 else None
+        if segments[-1] == 'delete' and len(segments) == 3:
+            # Deletions of schedules (schedules/{id}/delete)
+            self.remove(collection, resource_id)
+            return
+        if method == 'DELETE':
+            if resource_id is not None and len(segments) == 2:
+                self.remove(collection, resource_id)
+            return
+        if not hasattr(body, 'get'):
+            return
+        records = body.get(collection)
+        if isinstance(records, list):
+            for record in records:
+                if hasattr(record, 'get') and record.get('id') is not None:
+                    self.update(collection, record['id'], record)
+        record = body.get(RECORDS[collection])
+        if hasattr(record, 'get'):
+            record_id = record.get('id') or resource_id
+            if record_id is not None:
+                self.update(collection, record_id, record)
+
+    def update(self, collection, record_id, fields):
+        """
+        Adds a resource, or updates the indexed fields found in fields
+        """
+        with self._lock:
+            entry = self._records[collection].setdefault(record_id, {})
+            lookup = self._lookup[collection]
+            for key in self.keys:
+                if key not in fields:
+                    continue
+                value = fields[key]
+                try:
+                    hash(value)
+                except TypeError:
+                    continue
+                if key in entry:
+                    self._unlink(lookup[key], entry[key], record_id)
+                entry[key] = value
+                lookup[key].setdefault(value, set()).add(record_id)
+
+    def _unlink(self, values, value, record_id):
+        ids = values.get(value)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del values[value]
+
+    def remove(self, collection, record_id):
+        with self._lock:
+            entry = self._records[collection].pop(record_id, None)
+            if entry is None:
+                return
+            lookup = self._lookup[collection]
+            for key, value in entry.items():
+                self._unlink(lookup[key], value, record_id)
+
+    def retain(self, collection, record_ids):
+        """
+        Drops the resources of a collection that aren't in record_ids, the
+        ids of a full listing, and marks the collection as complete
+        """
+        record_ids = set(record_ids)
+        for record_id in [i for i in self.ids(collection) if i not in record_ids]:
+            self.remove(collection, record_id)
+        with self._lock:
+            self._complete.add(collection)
+
+    def is_complete(self, collection):
+        return collection in self._complete
+
+    def ids(self, collection):
+        with self._lock:
+            return list(self._records[collection])
+
+    def get(self, collection, record_id):
+        """
+        Returns the indexed fields of a resource, or None if it isn't
+        indexed
+        """
+        with self._lock:
+            entry = self._records[collection].get(record_id)
+            return dict(entry) if entry is not None else None
+
+    def filter(self, collection, **criteria):
+        """
+        Returns the sorted ids of the resources whose fields equal the given
+        values. A list of values matches any of them.
+        """
+        with self._lock:
+            matches = None
+            for key, value in criteria.items():
+                if key not in self._lookup[collection]:
+                    raise ValueError('[{}] is not indexed. Indexed keys are: {}'
+                        .format(key, list(self.keys)))
+                values = value if isinstance(value, (list, tuple, set)) else [value]
+                ids = set()
+                for v in values:
+                    ids.update(self._lookup[collection][key].get(v, ()))
+                matches = ids if matches is None else matches & ids
+            if matches is None:
+                matches = set(self._records[collection])
+        return sorted(matches)
+
+    def clear(self):
+        with self._lock:
+            for collection in RECORDS:
+                self._records[collection].clear()
+                for values in self._lookup[collection].values():
+                    values.clear()
+            self._complete.clear()
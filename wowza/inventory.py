@@ -0,0 +1,206 @@
+"""
+Local SQLite mirror of the resources of an account, kept up to date with
+incremental syncs and queried without calling the API:
+
+    inventory = Inventory('wowza.db')
+    inventory.sync()
+    inventory.query('live_streams', state='started',
+        broadcast_location='us_east_virginia')
+"""
+import json, sqlite3, threading, time
+from wowza.bulk import BulkResult, run_many
+from wowza.wowza import LiveStreams, StreamSources, StreamTargets, Players, \
+    Recordings, Schedules, Transcoders
+
+# Mirrored collections: endpoint class and the columns stored next to the
+# record (as JSON) and indexed for queries
+COLLECTIONS = {
+    'live_streams': (LiveStreams,
+        ['broadcast_location', 'transcoder_type', 'billing_mode']),
+    'stream_sources': (StreamSources, ['location']),
+    'stream_targets': (StreamTargets, ['type', 'provider', 'location']),
+    'players': (Players, ['transcoder_id', 'type']),
+    'transcoders': (Transcoders,
+        ['broadcast_location', 'transcoder_type', 'billing_mode']),
+    'schedules': (Schedules, ['transcoder_id', 'action_type']),
+    'recordings': (Recordings, ['transcoder_id']),
+}
+
+COMMON_COLUMNS = ['name', 'state', 'created_at', 'updated_at']
+
+
+class SyncResult(BulkResult):
+    """
+    Outcome of the sync of a collection: the ids added, updated and
+    deleted, and the errors of the records that couldn't be fetched
+    """
+
+    def __init__(self):
+        BulkResult.__init__(self)
+        self.added = []
+        self.updated = []
+        self.deleted = []
+
+    def __repr__(self):
+        return '<SyncResult: {} added, {} updated, {} deleted, {} failed>'.format(
+            len(self.added), len(self.updated), len(self.deleted),
+            len(self.errors))
+
+
+class Inventory(object):
+    """
+    Mirrors live streams, stream sources and targets, players, transcoders,
+    schedules and recordings into a SQLite database (in memory by default).
+    Every collection has a table with the id, name, state, timestamps and a
+    few indexed columns of its records, and the whole record as JSON.
+
+    #sync() pages through the list endpoints, then only fetches the details
+    of the records that are new or whose updated_at changed, and deletes
+    the records that are gone.
+
+    client: the wowza.client.Client used to call the API
+    """
+
+    def __init__(self, path=':memory:', client=None, max_workers=10):
+        self.client = client
+        self.max_workers = max_workers
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS syncs '
+                '(collection TEXT PRIMARY KEY, synced_at REAL)')
+            for collection, columns in self.columns().items():
+                self.db.execute('CREATE TABLE IF NOT EXISTS {} '
+                    '(id TEXT PRIMARY KEY, {}, data TEXT)'.format(
+                        collection, ', '.join(c + ' TEXT' for c in columns)))
+                for column in columns:
+                    if column in ('name', 'created_at'):
+                        continue
+                    self.db.execute('CREATE INDEX IF NOT EXISTS {0}_{1} '
+                        'ON {0} ({1})'.format(collection, column))
+
+    @staticmethod
+    def columns(collection=None):
+        """
+        Returns the columns of the table of a collection (besides id and
+        data), or of every collection by name
+        """
+        if collection is None:
+            return dict((c, Inventory.columns(c)) for c in COLLECTIONS)
+        if collection not in COLLECTIONS:
+            raise ValueError('Unknown collection [{}]. Valid collections are: {}'
+                .format(collection, list(COLLECTIONS)))
+        return COMMON_COLUMNS + COLLECTIONS[collection][1]
+
+    def resource(self, collection):
+        """
+        Returns the endpoint instance used to sync a collection
+        """
+        return COLLECTIONS[collection][0](client=self.client)
+
+    def sync(self, collections=None):
+        """
+        Brings the given collections (all of them by default) up to date.
+        Returns a SyncResult by collection.
+        """
+        return dict((collection, self.sync_collection(collection))
+            for collection in (collections or list(COLLECTIONS)))
+
+    def sync_collection(self, collection):
+        columns = self.columns(collection)
+        resource = self.resource(collection)
+        record_key = resource.record
+        started = time.time()
+        with self._lock:
+            known = dict(self.db.execute(
+                'SELECT id, updated_at FROM {}'.format(collection)).fetchall())
+        result = SyncResult()
+        summaries = {}
+        for summary in getattr(resource, 'iter_' + collection)():
+            summary = dict(summary)
+            summaries[summary['id']] = summary
+        changed = [i for i, summary in summaries.items() if i not in known
+            or summary.get('updated_at') is None
+            or summary.get('updated_at') != known[i]]
+        details = run_many(resource.info, changed, self.max_workers)
+        result.errors = details.errors
+        rows = []
+        for record_id in changed:
+            if record_id not in details.results:
+                continue
+            record = dict(details.results[record_id][record_key])
+            rows.append(self._row(record, columns))
+            (result.updated if record_id in known else result.added).append(record_id)
+        result.deleted = [i for i in known if i not in summaries]
+        with self._lock, self.db:
+            self.db.executemany('INSERT OR REPLACE INTO {} (id, {}, data) '
+                'VALUES ({})'.format(collection, ', '.join(columns),
+                    ', '.join('?' * (len(columns) + 2))), rows)
+            self.db.executemany('DELETE FROM {} WHERE id = ?'.format(collection),
+                [(i,) for i in result.deleted])
+            self.db.execute('INSERT OR REPLACE INTO syncs VALUES (?, ?)',
+                (collection, started))
+        return result
+
+    def _row(self, record, columns):
+        values = [record.get(column) for column in columns]
+        values = [v if v is None or isinstance(v, str) else json.dumps(v)
+            for v in values]
+        return [record['id']] + values + [json.dumps(record)]
+
+    def synced_at(self, collection):
+        """
+        Returns the time of the last sync of a collection, None if it was
+        never synced
+        """
+        with self._lock:
+            row = self.db.execute('SELECT synced_at FROM syncs WHERE collection = ?',
+                (collection,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, collection, record_id):
+        """
+        Returns the mirrored record with the given id, or None
+        """
+        self.columns(collection)
+        with self._lock:
+            row = self.db.execute('SELECT data FROM {} WHERE id = ?'
+                .format(collection), (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _where(self, collection, filters):
+        columns = self.columns(collection)
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column != 'id' and column not in columns:
+                raise ValueError('Cannot filter {} on [{}]. Valid columns are: {}'
+                    .format(collection, column, ['id'] + columns))
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            clauses.append('{} IN ({})'.format(column, ', '.join('?' * len(values))))
+            params.extend(values)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def query(self, collection, **filters):
+        """
+        Returns the mirrored records whose columns equal the given values,
+        i.e. query('live_streams', state='started'). A list of values
+        matches any of them.
+        """
+        where, params = self._where(collection, filters)
+        with self._lock:
+            rows = self.db.execute('SELECT data FROM {}{}'.format(collection,
+                where), params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, collection, **filters):
+        where, params = self._where(collection, filters)
+        with self._lock:
+            return self.db.execute('SELECT COUNT(*) FROM {}{}'.format(collection,
+                where), params).fetchone()[0]
+
+    def close(self):
+        self.db.close()
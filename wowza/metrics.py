@@ -0,0 +1,269 @@
+"""
+Latency and error metrics of the requests sent to the API, by endpoint,
+with hooks and a Prometheus exporter:
+
+    metrics = Metrics()
+    client = Client(metrics=metrics)
+    ...
+    print(metrics.render())  # Prometheus text format
+"""
+import bisect, threading, time
+
+# Path segments of the API that aren't ids
+WORDS = frozenset([
+    'live_streams', 'stream_sources', 'stream_targets', 'players',
+    'recordings', 'schedules', 'transcoders', 'usage', 'start', 'stop',
+    'reset', 'state', 'stats', 'regenerate_connection_code', 'thumbnail_url',
+    'uptimes', 'metrics', 'current', 'historic', 'properties', 'geoblock',
+    'token_auth', 'urls', 'rebuild', 'enable', 'disable', 'delete', 'storage',
+    'peak_recording', 'time', 'viewer_data', 'network', 'sources', 'targets',
+])
+
+# Upper bounds of the latency buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint(url, base_url):
+    """
+    Returns the template of the endpoint url calls, with its ids replaced
+    by {id}, i.e. live_streams/{id}/state
+    """
+    path = url[len(base_url):] if url.startswith(base_url) else url
+    return '/'.join(segment if segment in WORDS else '{id}'
+        for segment in path.split('?')[0].strip('/').split('/') if segment)
+
+
+class Call(object):
+    """
+    A call to the API, as passed to the hooks. status is the HTTP status of
+    the last response, code the meta.code of an API error, attempts the
+    number of HTTP requests sent (retries and throttled requests included)
+    and duration the seconds the call took, once it is over.
+    """
+
+    __slots__ = ('method', 'url', 'endpoint', 'started', 'duration', 'status',
+        'code', 'attempts', 'bytes_out', 'bytes_in')
+
+    def __init__(self, method, url, endpoint):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.duration = None
+        self.status = None
+        self.code = None
+        self.attempts = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+    def __repr__(self):
+        return '<Call: {} {} {}>'.format(self.method, self.endpoint, self.status)
+
+
+class _Series(object):
+    """
+    Metrics of one endpoint and method
+    """
+
+    def __init__(self, buckets):
+        self.buckets = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.retries = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        # Calls by (status, code)
+        self.outcomes = {}
+        # Calls that raised, by exception class name
+        self.errors = {}
+
+
+class Metrics(object):
+    """
+    Counts the calls a client sends to the API by endpoint template and
+    method: outcomes by HTTP status and meta.code, a latency histogram,
+    retries, and bytes sent and received. Calls answered by the cache or
+    by a request in flight (see wowza.coalesce) send nothing and aren't
+    counted.
+
+    Hooks are called with the Call on the thread (or in the task) sending
+    it. Exceptions they raise fail the call.
+
+        @metrics.on_error
+        def log_error(call, error):
+            ...
+
+    One instance can be shared by several clients; it is thread safe.
+    buckets: upper bounds of the latency buckets, in seconds
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self.hooks = {'request': [], 'response': [], 'error': []}
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, hook):
+        """
+        Registers hook(call), called before a call is sent. Returns hook.
+        """
+        self.hooks['request'].append(hook)
+        return hook
+
+    def on_response(self, hook):
+        """
+        Registers hook(call), called once a call succeeded. Returns hook.
+        """
+        self.hooks['response'].append(hook)
+        return hook
+
+    def on_error(self, hook):
+        """
+        Registers hook(call, error), called once a call failed with error.
+        Returns hook.
+        """
+        self.hooks['error'].append(hook)
+        return hook
+
+    def start(self, method, url, base_url):
+        """
+        Returns the Call of a request about to be sent
+        """
+        call = Call(method, url, endpoint(url, base_url))
+        for hook in self.hooks['request']:
+            hook(call)
+        return call
+
+    def exchanged(self, call, data, response, stream=False):
+        """
+        Records an HTTP request of call and its response
+        """
+        call.attempts += 1
+        call.bytes_out += len(data or b'')
+        call.status = response.status_code
+        if not stream:
+            call.bytes_in += len(response.content or b'')
+
+    def received(self, call, chunk):
+        """
+        Records a chunk of the body of the streamed response to call
+        """
+        call.bytes_in += len(chunk)
+
+    def end(self, call, error=None):
+        """
+        Records a call, failed with error if given
+        """
+        call.duration = time.perf_counter() - call.started
+        if error is not None:
+            meta = getattr(error, 'meta', None)
+            call.code = meta.get('code') if hasattr(meta, 'get') else None
+        self._record(call, error)
+        if error is None:
+            for hook in self.hooks['response']:
+                hook(call)
+        else:
+            for hook in self.hooks['error']:
+                hook(call, error)
+
+    def _record(self, call, error):
+        with self._lock:
+            series = self._series.get((call.method, call.endpoint))
+            if series is None:
+                series = self._series[(call.method, call.endpoint)] = \
+                    _Series(self.bucket_bounds)
+            series.buckets[bisect.bisect_left(self.bucket_bounds,
+                call.duration)] += 1
+            series.sum += call.duration
+            series.count += 1
+            series.retries += call.retries
+            series.bytes_out += call.bytes_out
+            series.bytes_in += call.bytes_in
+            outcome = (call.status, call.code)
+            series.outcomes[outcome] = series.outcomes.get(outcome, 0) + 1
+            if error is not None:
+                name = type(error).__name__
+                series.errors[name] = series.errors.get(name, 0) + 1
+
+    def stats(self):
+        """
+        Returns the metrics of every (method, endpoint) as dictionaries
+        """
+        with self._lock:
+            return dict((key, {
+                'count': series.count,
+                'errors': sum(series.errors.values()),
+                'retries': series.retries,
+                'mean': series.sum / series.count,
+                'bytes_out': series.bytes_out,
+                'bytes_in': series.bytes_in,
+                'outcomes': dict(series.outcomes),
+            }) for key, series in self._series.items())
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self, prefix='wowza'):
+        """
+        Returns the metrics in the Prometheus text exposition format
+        """
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = []
+
+            def family(name, kind, help):
+                lines.append('# HELP {}_{} {}'.format(prefix, name, help))
+                lines.append('# TYPE {}_{} {}'.format(prefix, name, kind))
+
+            def sample(name, labels, value):
+                lines.append('{}_{}{{{}}} {}'.format(prefix, name, ','.join(
+                    '{}="{}"'.format(k, _escape(v)) for k, v in labels), value))
+
+            family('requests_total', 'counter',
+                'Calls to the Wowza API by HTTP status and meta.code.')
+            for (method, path), s in series:
+                for (status, code), count in sorted(s.outcomes.items(),
+                    key=lambda item: (str(item[0][0]), str(item[0][1]))):
+                    sample('requests_total', [('method', method),
+                        ('endpoint', path), ('status', status or ''),
+                        ('code', code or '')], count)
+            family('request_errors_total', 'counter',
+                'Calls to the Wowza API that raised, by exception.')
+            for (method, path), s in series:
+                for error, count in sorted(s.errors.items()):
+                    sample('request_errors_total', [('method', method),
+                        ('endpoint', path), ('error', error)], count)
+            family('request_duration_seconds', 'histogram',
+                'Duration of the calls to the Wowza API, retries included.')
+            for (method, path), s in series:
+                labels = [('method', method), ('endpoint', path)]
+                cumulative = 0
+                for bound, count in zip(self.bucket_bounds + ('+Inf',),
+                    s.buckets):
+                    cumulative += count
+                    sample('request_duration_seconds_bucket',
+                        labels + [('le', bound)], cumulative)
+                sample('request_duration_seconds_sum', labels, repr(s.sum))
+                sample('request_duration_seconds_count', labels, s.count)
+            for name, attribute, help in (
+                ('request_retries_total', 'retries',
+                    'Requests sent again after an error or a 429.'),
+                ('request_sent_bytes_total', 'bytes_out',
+                    'Bytes of the request bodies sent to the Wowza API.'),
+                ('response_received_bytes_total', 'bytes_in',
+                    'Bytes of the response bodies received from the Wowza API.')):
+                family(name, 'counter', help)
+                for (method, path), s in series:
+                    sample(name, [('method', method), ('endpoint', path)],
+                        getattr(s, attribute))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')\
+        .replace('\n', '\\n')
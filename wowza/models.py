@@ -0,0 +1,193 @@
+"""
+Compact models for the records returned by the API, enabled with
+Client(models=True).
+A model stores the documented fields of its record in __slots__ and the
+fields it doesn't know about in #extra (None when there are none), which
+takes several times less memory than a dict per record. Models are
+read-only mappings, so code written against the dict responses keeps
+working:
+
+    live_stream.state == live_stream['state']
+    live_stream.get('missing')  # None
+"""
+from collections.abc import Mapping
+
+
+class Model(Mapping):
+    """
+    Base class of the models. Subclasses list their fields in __slots__.
+    Declared fields missing from the response read as None as attributes,
+    but aren't part of the mapping.
+    """
+
+    __slots__ = ('extra',)
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(f for klass in reversed(cls.__mro__)
+            for f in klass.__dict__.get('__slots__', ()) if f != 'extra')
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, data=None, **fields):
+        extra = None
+        known = self._field_set
+        for source in (data or {}), fields:
+            for key, value in source.items():
+                if key in known:
+                    setattr(self, key, value)
+                else:
+                    if extra is None:
+                        extra = {}
+                    extra[key] = value
+        self.extra = extra
+
+    def __getattr__(self, name):
+        # Only called for unset slots and unknown names
+        if name in self._field_set:
+            return None
+        extra = object.__getattribute__(self, 'extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError('{} has no field {!r}'.format(
+            type(self).__name__, name))
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for field in self._fields:
+            try:
+                object.__getattribute__(self, field)
+            except AttributeError:
+                continue
+            yield field
+        if self.extra is not None:
+            for key in self.extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return type(self), (self.to_dict(),)
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.to_dict())
+
+
+class LiveStream(Model):
+    __slots__ = ('id', 'name', 'state', 'aspect_ratio_height',
+        'aspect_ratio_width', 'billing_mode', 'broadcast_location',
+        'closed_caption_type', 'connection_code', 'connection_code_expires_at',
+        'delivery_method', 'delivery_protocols', 'delivery_type',
+        'direct_playback_url', 'encoder', 'hosted_page',
+        'hosted_page_description', 'hosted_page_logo_image_url',
+        'hosted_page_sharing_icons', 'hosted_page_title', 'hosted_page_url',
+        'low_latency', 'player_countdown', 'player_countdown_at',
+        'player_embed_code', 'player_hds_playback_url',
+        'player_hls_playback_url', 'player_id', 'player_logo_image_url',
+        'player_logo_position', 'player_responsive', 'player_type',
+        'player_video_poster_image_url', 'player_width', 'recording',
+        'source_connection_information', 'stream_source_id', 'stream_targets',
+        'target_delivery_protocol', 'transcoder_type', 'use_stream_source',
+        'created_at', 'updated_at')
+
+
+class StreamSource(Model):
+    __slots__ = ('id', 'name', 'state', 'location', 'location_method',
+        'ip_address', 'primary_url', 'backup_url', 'stream_name',
+        'created_at', 'updated_at')
+
+
+class StreamTarget(Model):
+    __slots__ = ('id', 'name', 'type', 'provider', 'location', 'state',
+        'primary_url', 'backup_url', 'stream_name', 'hds_playback_url',
+        'hls_playback_url', 'rtmp_playback_url', 'use_cors', 'use_https',
+        'use_secure_ingest', 'username', 'password', 'chunk_size',
+        'connection_code', 'connection_code_expires_at',
+        'token_auth_enabled', 'token_auth_shared_secret',
+        'token_auth_playlist_only', 'geoblock_enabled', 'created_at',
+        'updated_at')
+
+
+class Player(Model):
+    __slots__ = ('id', 'type', 'state', 'transcoder_id', 'width',
+        'responsive', 'countdown', 'countdown_at', 'embed_code',
+        'hls_playback_url', 'logo_image_url', 'logo_position',
+        'video_poster_image_url', 'hosted_page', 'created_at', 'updated_at')
+
+
+class Recording(Model):
+    __slots__ = ('id', 'transcoder_id', 'state', 'reason', 'file_name',
+        'file_size', 'download_url', 'duration', 'starts_at',
+        'transcoding_uptime_id', 'created_at', 'updated_at')
+
+
+class Schedule(Model):
+    __slots__ = ('id', 'name', 'state', 'action_type', 'transcoder_id',
+        'recurrence_type', 'recurrence_data', 'start_transcoder',
+        'stop_transcoder', 'start_repeat', 'end_repeat', 'time_zone',
+        'created_at', 'updated_at')
+
+
+class Transcoder(Model):
+    __slots__ = ('id', 'name', 'state', 'application_name', 'billing_mode',
+        'broadcast_location', 'buffer_size', 'closed_caption_type',
+        'delivery_method', 'delivery_protocols', 'description',
+        'direct_playback_url', 'disable_authentication', 'domain_name',
+        'idle_timeout', 'low_latency', 'outputs', 'password',
+        'play_maximum_connections', 'playback_stream_name', 'protocol',
+        'recording', 'source_port', 'source_url', 'stream_extension',
+        'stream_name', 'stream_smoother', 'stream_source_id',
+        'suppress_stream_target_start', 'transcoder_type', 'username',
+        'watermark', 'watermark_height', 'watermark_image_url',
+        'watermark_opacity', 'watermark_position', 'watermark_width',
+        'created_at', 'updated_at')
+
+
+# Response keys holding a record, or a list of records, and their model
+MODELS = {
+    'live_stream': LiveStream,
+    'live_streams': LiveStream,
+    'stream_source': StreamSource,
+    'stream_sources': StreamSource,
+    'stream_target': StreamTarget,
+    'stream_targets': StreamTarget,
+    'player': Player,
+    'players': Player,
+    'recording': Recording,
+    'recordings': Recording,
+    'schedule': Schedule,
+    'schedules': Schedule,
+    'transcoder': Transcoder,
+    'transcoders': Transcoder,
+}
+
+
+def wrap(body):
+    """
+    Replaces the records of a decoded response by models. Other responses
+    are returned as they are.
+    """
+    if not isinstance(body, dict):
+        return body
+    for key, value in body.items():
+        model = MODELS.get(key)
+        if model is None:
+            continue
+        if isinstance(value, dict):
+            body[key] = model(value)
+        elif isinstance(value, list):
+            body[key] = [model(v) if isinstance(v, dict) else v for v in value]
+    return body
@@ -0,0 +1,61 @@
+"""
+Polling schedule used to wait for resources to reach a state
+"""
+import time
+from wowza.bulk import unique
+from wowza.exceptions import DeadlineExceeded
+
+
+class StateWaiter(object):
+    """
+    Tracks the states of a set of resources while waiting for all of them to
+    reach target_state (a state or a tuple of acceptable states).
+    Polls quickly at first: the delay between polls starts at interval and
+    grows by factor after every poll, up to max_interval. Gives up with
+    DeadlineExceeded after timeout seconds (None to wait forever).
+    """
+
+    def __init__(self, ids, target_state, timeout=None, interval=1.0,
+        max_interval=15.0, factor=1.5):
+        self.ids = [ids] if isinstance(ids, str) else unique(ids)
+        self.target_states = set([target_state]) \
+            if isinstance(target_state, str) else set(target_state)
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.states = {}
+        self.started = time.monotonic()
+
+    @property
+    def pending(self):
+        """
+        Ids that haven't reached the target state yet
+        """
+        return [i for i in self.ids
+            if self.states.get(i) not in self.target_states]
+
+    def update(self, states):
+        """
+        Records freshly polled states. Returns True once every resource has
+        reached the target state.
+        """
+        self.states.update(states)
+        return not self.pending
+
+    def next_delay(self):
+        """
+        Returns the number of seconds to wait before the next poll
+        """
+        delay = self.interval
+        if self.timeout is not None:
+            remaining = self.timeout - (time.monotonic() - self.started)
+            if remaining <= 0:
+                raise DeadlineExceeded({
+                    'message': '{} did not reach state {} within {} seconds.'\
+                        .format(self.pending, sorted(self.target_states),
+                            self.timeout)
+                })
+            delay = min(delay, remaining)
+        self.interval = min(self.max_interval, self.interval * self.factor)
+        return delay
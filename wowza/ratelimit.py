@@ -0,0 +1,132 @@
+"""
+Client side rate limiting with token buckets.
+The limiter only computes how long a request has to wait; the sync and async
+clients do the actual sleeping.
+"""
+import re, threading, time
+
+
+class TokenBucket(object):
+    """
+    Token bucket refilled at rate tokens per second, holding at most burst
+    tokens. Tokens are reserved ahead of time, so concurrent callers queue
+    up behind each other instead of all waking up at once.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Takes tokens from the bucket and returns the number of seconds to
+        wait before they are actually available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst,
+                self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def block(self, seconds):
+        """
+        Holds back every request for the given number of seconds
+        """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until,
+                time.monotonic() + seconds)
+
+
+class Limit(object):
+    """
+    Rate limit for a family of endpoints, i.e. starting live streams:
+
+        Limit(r'live_streams/[^/]+/start$', rate=1, methods=['PUT'])
+
+    pattern is searched for in the request URL. methods limits the rule to
+    some HTTP methods (all methods by default).
+    """
+
+    def __init__(self, pattern, rate, burst=None, methods=None):
+        self.pattern = re.compile(pattern)
+        self.methods = set(m.upper() for m in methods) if methods else None
+        self.bucket = TokenBucket(rate, burst)
+
+    def matches(self, method, url):
+        if self.methods is not None and method.upper() not in self.methods:
+            return False
+        return self.pattern.search(url) is not None
+
+
+class RateLimiter(object):
+    """
+    Rate limiter for one account.
+    rate/burst apply to every request made with the account, limits is a
+    list of Limit for tighter per endpoint family budgets. A request has to
+    get a token from the account bucket and from every matching Limit.
+    """
+
+    def __init__(self, rate=None, burst=None, limits=None):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.limits = list(limits or [])
+
+    def buckets(self, method, url):
+        buckets = [self.bucket] if self.bucket else []
+        return buckets + [limit.bucket for limit in self.limits
+            if limit.matches(method, url)]
+
+    def delay(self, method, url):
+        """
+        Reserves a request and returns the number of seconds to wait before
+        sending it
+        """
+        return max([bucket.reserve() for bucket in self.buckets(method, url)]
+            or [0.0])
+
+    def acquire(self, method, url):
+        """
+        Blocks until the request can be sent
+        """
+        delay = self.delay(method, url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def block(self, seconds, method=None, url=None):
+        """
+        Holds back requests for the given number of seconds, i.e. after the
+        API responded with 429. Without a method and URL, every bucket is
+        blocked.
+        """
+        if method is None:
+            buckets = ([self.bucket] if self.bucket else []) + \
+                [limit.bucket for limit in self.limits]
+        else:
+            buckets = self.buckets(method, url)
+        for bucket in buckets:
+            bucket.block(seconds)
+
+
+def retry_after(headers, default=None):
+    """
+    Returns the number of seconds asked for by a Retry-After header, which
+    can either be a number of seconds or an HTTP date
+    """
+    value = headers.get('Retry-After') if headers else None
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,108 @@
+"""
+Registry of clients for processes driving several Wowza accounts
+"""
+import threading
+from urllib.parse import urlsplit
+from wowza import config
+from wowza.client import Client
+
+
+class ClientRegistry(object):
+    """
+    Hands out one client per account. The clients carry the credentials,
+    rate limiter and other settings of their account, but share a single
+    transport (and so a single connection pool) per API host:
+
+        registry = ClientRegistry(pool_maxsize=50, per_thread=True,
+            rate_limiter=lambda: RateLimiter(rate=10, burst=20))
+        for account in accounts:
+            registry.add(account.name, account.api_key, account.access_key)
+        live_streams = LiveStreams(client=registry['acme'])
+
+    client_class: Client or wowza.aio.AsyncClient
+    transport_class: class of the shared transports, the transport_class of
+        client_class by default (see wowza.transport)
+    rate_limiter: callable returning a new wowza.ratelimit.RateLimiter,
+        called for every account so that each one gets its own budget
+    Extra keyword arguments are passed to the transports.
+    """
+
+    def __init__(self, client_class=Client, rate_limiter=None,
+        transport_class=None, **transport_options):
+        self.client_class = client_class
+        self.transport_class = transport_class or client_class.transport_class
+        self.rate_limiter = rate_limiter
+        self.transport_options = transport_options
+        self.transports = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def transport(self, base_url):
+        """
+        Returns the transport shared by the clients talking to the host of
+        base_url
+        """
+        url = urlsplit(base_url)
+        host = (url.scheme, url.netloc)
+        with self._lock:
+            transport = self.transports.get(host)
+            if transport is None:
+                transport = self.transports[host] = \
+                    self.transport_class(**self.transport_options)
+            return transport
+
+    def add(self, name, api_key, access_key, base_url=None, **client_options):
+        """
+        Registers the account name and returns its client. client_options
+        are passed to the client, e.g. its own rate_limiter or cache.
+        Responses are never shared between accounts: give each one its own
+        cache.
+        """
+        base_url = base_url or config.base_url()
+        if 'rate_limiter' not in client_options and self.rate_limiter:
+            client_options['rate_limiter'] = self.rate_limiter()
+        client = self.client_class(
+            base_url=base_url,
+            api_key=api_key,
+            access_key=access_key,
+            transport=self.transport(base_url),
+            **client_options
+        )
+        with self._lock:
+            self._clients[name] = client
+        return client
+
+    def get(self, name, default=None):
+        return self._clients.get(name, default)
+
+    def remove(self, name):
+        """
+        Unregisters an account. The shared transport stays open.
+        """
+        with self._lock:
+            return self._clients.pop(name, None)
+
+    def __getitem__(self, name):
+        return self._clients[name]
+
+    def __contains__(self, name):
+        return name in self._clients
+
+    def __iter__(self):
+        return iter(list(self._clients))
+
+    def __len__(self):
+        return len(self._clients)
+
+    def close(self):
+        """
+        Closes the shared transports. With async transports, returns an
+        awaitable to wait on.
+        """
+        with self._lock:
+            transports, self.transports = list(self.transports.values()), {}
+        pending = [t.close() for t in transports]
+        pending = [p for p in pending if p is not None]
+        if pending:
+            import asyncio
+            return asyncio.gather(*pending)
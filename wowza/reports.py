@@ -0,0 +1,53 @@
+"""
+Account wide reports built from many per resource usage calls
+"""
+import numbers
+
+
+def add_totals(totals, data):
+    """
+    Adds the numbers of data to totals, key by key, recursing into nested
+    objects. Other values (text, lists) aren't totaled.
+    """
+    for key, value in data.items():
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, numbers.Number):
+            totals[key] = totals.get(key, 0) + value
+        elif hasattr(value, 'items'):
+            nested = totals.get(key)
+            if not isinstance(nested, dict):
+                nested = totals[key] = {}
+            add_totals(nested, value)
+    return totals
+
+
+class ViewerReport(object):
+    """
+    Viewer data of many stream targets, merged as it arrives.
+    targets maps every stream target id to its viewer data response,
+    errors maps the ids whose call failed to the exception raised, and
+    totals holds the numeric fields of all the responses summed key by key
+    (i.e. totals['stream_target']['unique_viewers'] for the whole account).
+    """
+
+    def __init__(self):
+        self.targets = {}
+        self.errors = {}
+        self.totals = {}
+
+    def add(self, stream_target_id, data, error=None):
+        if error is not None:
+            self.errors[stream_target_id] = error
+            return
+        self.targets[stream_target_id] = data
+        if hasattr(data, 'items'):
+            add_totals(self.totals, data)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return '<ViewerReport: {} stream targets, {} failed>'.format(
+            len(self.targets), len(self.errors))
@@ -0,0 +1,87 @@
+"""
+Response processing shared by the sync and async classes
+"""
+from collections.abc import MutableMapping
+from wowza.codec import get_codec
+from wowza.exceptions import ERROR_CODES, STATUS_ERRORS, ApiError
+
+
+class Response(object):
+    """
+    A raw response from the API, for transports that don't have a response
+    object of their own
+    """
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return get_codec().loads(self.content)
+
+
+class Headers(MutableMapping):
+    """
+    Headers of a response, looked up regardless of case (ETag, etag, ...),
+    for transports that build their own
+    """
+
+    def __init__(self, headers=None):
+        self._items = {}
+        self.update(headers or {})
+
+    def __getitem__(self, name):
+        return self._items[name.lower()][1]
+
+    def __setitem__(self, name, value):
+        self._items[name.lower()] = (name, value)
+
+    def __delitem__(self, name):
+        del self._items[name.lower()]
+
+    def __iter__(self):
+        return (name for name, _ in self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def parse(status_code, content, codec=None):
+    """
+    Decodes the body of a response once, and raises the exception mapped to
+    its meta.code when the API returned an error.
+    Returns the decoded body, or None if the body is empty (i.e. 204s).
+    """
+    codec = codec or get_codec()
+    try:
+        body = codec.loads(content) if content else None
+    except ValueError:
+        if status_code < 400:
+            raise
+        body = None
+    if isinstance(body, dict) and 'meta' in body:
+        raise_error(body['meta'], status_code)
+    if status_code >= 400:
+        raise STATUS_ERRORS.get(status_code, ApiError)({
+            'message': 'The API responded with HTTP {}.'.format(status_code),
+            'status': status_code
+        })
+    return body
+
+
+def raise_error(meta, status_code=None):
+    """
+    Raises the exception matching the meta block of an error response
+    """
+    error_class = ERROR_CODES.get(meta.get('code')) or \
+        STATUS_ERRORS.get(meta.get('status', status_code), ApiError)
+    error = error_class({
+        'message': meta.get('message') or meta.get('title') or meta.get('code'),
+        'status': meta.get('status', status_code)
+    })
+    error.meta = meta
+    raise error
@@ -0,0 +1,100 @@
+"""
+Retry policy with exponential backoff, used by the clients to retry calls
+that failed for transient reasons
+"""
+import random
+from wowza.exceptions import TokenAuthBusy, GeoblockingBusy
+
+# Errors of calls the API turned down without applying them (423), safe to
+# retry whatever the method
+BUSY_ERRORS = (TokenAuthBusy, GeoblockingBusy)
+# Exceptions retried by default. Transports add their own connection errors.
+RETRYABLE_ERRORS = BUSY_ERRORS + (ConnectionError,)
+RETRYABLE_STATUSES = frozenset([500, 502, 503, 504])
+# Methods whose calls can be sent twice without side effects
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'PATCH',
+    'DELETE'])
+
+
+class RetryPolicy(object):
+    """
+    Decides whether and when a failed call is retried.
+    The n-th retry waits base * factor ** n seconds, capped at max_delay.
+    jitter is the fraction of that delay that is randomized, so clients
+    retrying at the same time spread out.
+    max_attempts caps the number of attempts, deadline the number of seconds
+    spent on the call overall (None for no limit).
+    retry_on lists the exceptions worth retrying; errors with a code (HTTP
+    status) in retry_statuses are retried too.
+    retry_methods lists the methods whose calls are retried after a 5xx or
+    a connection error, which may come after the API applied the call: a
+    retried POST can create a resource twice. Busy errors (423) are retried
+    for any method.
+    """
+
+    def __init__(self,
+        max_attempts=5,
+        base=0.5,
+        factor=2.0,
+        max_delay=30.0,
+        jitter=0.5,
+        deadline=None,
+        retry_on=RETRYABLE_ERRORS,
+        retry_statuses=RETRYABLE_STATUSES,
+        retry_methods=IDEMPOTENT_METHODS):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = tuple(retry_on)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+
+    def is_retryable(self, error, connection_errors=(), method=None):
+        if isinstance(error, BUSY_ERRORS):
+            return isinstance(error, self.retry_on)
+        if method is not None and method.upper() not in self.retry_methods:
+            return False
+        if isinstance(error, self.retry_on + tuple(connection_errors)):
+            return True
+        return getattr(error, 'code', None) in self.retry_statuses
+
+    def backoff(self, attempt):
+        """
+        Returns the delay before the retry following the given attempt
+        (starting at 0)
+        """
+        delay = min(self.max_delay, self.base * self.factor ** attempt)
+        return delay - delay * self.jitter * random.random()
+
+    def delay(self, error, attempt, elapsed, connection_errors=(),
+        method=None):
+        """
+        Returns the number of seconds to wait before retrying after error,
+        or None if the call should fail.
+        attempt is the number of the failed attempt (starting at 0), elapsed
+        the number of seconds spent on the call so far, method the HTTP
+        method of the call (None to retry whatever the method).
+        """
+        if not self.is_retryable(error, connection_errors, method):
+            return None
+        if self.max_attempts is not None and attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None:
+            remaining = self.deadline - elapsed
+            if remaining <= 0:
+                return None
+            delay = min(delay, remaining)
+        return delay
+
+
+def busy_policy(busy_error):
+    """
+    Policy used by the wait=True updates of locked resources (token auth,
+    geoblocking), which can stay busy for up to 30 minutes
+    """
+    return RetryPolicy(max_attempts=None, base=5, max_delay=60, deadline=1800,
+        retry_on=(busy_error,))
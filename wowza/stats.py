@@ -0,0 +1,249 @@
+"""
+Time series of live stream stats, collected for many streams at once
+"""
+import itertools, math, threading, time, warnings
+from array import array
+from wowza.bulk import unique
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NAN = float('nan')
+
+STATS = ('min', 'max', 'mean', 'percentile')
+
+
+def metric_values(response, metrics=None):
+    """
+    Returns the numeric values of the metrics in a LiveStreams#stats()
+    response, keyed by metric name
+    """
+    values = {}
+    for name, metric in (response or {}).get('live_stream', {}).items():
+        if metrics is not None and name not in metrics:
+            continue
+        value = metric.get('value') if hasattr(metric, 'get') else None
+        if value is None or isinstance(value, bool):
+            continue
+        try:
+            values[name] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return values
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile of sorted values, interpolating linearly
+    between the closest ranks like numpy.percentile()
+    """
+    rank = (len(values) - 1) * q / 100.0
+    low = int(math.floor(rank))
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class StatsCollector(object):
+    """
+    Polls LiveStreams#stats() for a set of streams every interval seconds,
+    and keeps the numeric value of every metric in ring buffers: one flat
+    array of doubles per stream and metric, all sharing the same sample
+    times. Collecting doesn't allocate once the buffers exist, whatever the
+    number of rounds. Missing values (failed polls, metrics a stream didn't
+    report) are stored as NaN and left out of the aggregates.
+
+        collector = StatsCollector(live_streams, stream_ids, interval=10)
+        collector.start()
+        collector.mean('bits_in_rate', window=300)  # {stream_id: mean}
+        collector.percentile('frame_rate', 5, window=300)
+        collector.stop()
+
+    size: number of samples kept, i.e. size * interval seconds of history
+    metrics: names of the metrics to keep, all numeric ones by default
+    max_workers: number of stats requests sent at the same time
+
+    Aggregates are computed over the whole history or over the samples of
+    the last window seconds, with numpy when it is installed.
+    """
+
+    def __init__(self, live_streams, stream_ids, interval=10, size=360,
+        metrics=None, max_workers=10):
+        self.live_streams = live_streams
+        self.stream_ids = unique(stream_ids)
+        self.interval = interval
+        self.size = size
+        self.metrics = set(metrics) if metrics is not None else None
+        self.max_workers = max_workers
+        self.times = array('d', [NAN]) * size
+        self.series = dict((i, {}) for i in self.stream_ids)
+        # Errors of the last poll, by stream id
+        self.errors = {}
+        self._index = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        """
+        Number of samples held
+        """
+        return self._count
+
+    def record(self, responses, at=None):
+        """
+        Adds a sample taken at the time at (now by default) from responses,
+        a dictionary of stats responses by stream id
+        """
+        with self._lock:
+            index = self._index
+            self.times[index] = time.time() if at is None else at
+            for stream_id, series in self.series.items():
+                values = metric_values(responses.get(stream_id), self.metrics)
+                for name in values:
+                    if name not in series:
+                        series[name] = array('d', [NAN]) * self.size
+                for name, ring in series.items():
+                    ring[index] = values.get(name, NAN)
+            self._index = (index + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+
+    def poll(self):
+        """
+        Fetches the stats of every stream once and records them. Returns the
+        wowza.bulk.BulkResult of the requests.
+        """
+        at = time.time()
+        result = self.live_streams.stats_many(self.stream_ids,
+            self.max_workers, self.interval)
+        self.errors = result.errors
+        self.record(result.results, at)
+        return result
+
+    def run(self, rounds=None):
+        """
+        Polls every interval seconds, rounds times or until #stop()
+        """
+        self._stopped.clear()
+        for done in itertools.count(1):
+            started = time.monotonic()
+            self.poll()
+            if done == rounds:
+                return
+            if self._stopped.wait(
+                max(0, self.interval - (time.monotonic() - started))):
+                return
+
+    def start(self):
+        """
+        Runs the collector in a background thread
+        """
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _samples(self, window):
+        """
+        Returns the number of samples taken in the last window seconds
+        before the latest one
+        """
+        if window is None or not self._count:
+            return self._count
+        latest = self.times[(self._index - 1) % self.size]
+        count = 0
+        while count < self._count and \
+            self.times[(self._index - 1 - count) % self.size] > latest - window:
+            count += 1
+        return count
+
+    def _last(self, ring, count):
+        """
+        Returns the last count values of a ring buffer, oldest first
+        """
+        start = self._index - count
+        if start >= 0:
+            return ring[start:self._index]
+        return ring[start:] + ring[:self._index]
+
+    def sample_times(self, window=None):
+        with self._lock:
+            return self._last(self.times, self._samples(window))
+
+    def values(self, stream_id, metric, window=None):
+        """
+        Returns the values of a metric of a stream as an array, oldest first
+        """
+        with self._lock:
+            ring = self.series[stream_id].get(metric)
+            count = self._samples(window)
+            if ring is None:
+                return array('d', [NAN]) * count
+            return self._last(ring, count)
+
+    def aggregate(self, metric, stat, window=None, q=None):
+        """
+        Returns the min, max, mean or percentile (stat) of a metric over the
+        last window seconds, by stream id. Streams without values for the
+        metric get None.
+        """
+        if stat not in STATS:
+            raise ValueError('Unknown stat [{}]. Valid stats are: {}'
+                .format(stat, list(STATS)))
+        with self._lock:
+            count = self._samples(window)
+            rows = dict((stream_id, self._last(series[metric], count))
+                for stream_id, series in self.series.items() if metric in series)
+        if numpy is not None and rows and count:
+            values = self._numpy_aggregate(list(rows.values()), stat, q)
+        else:
+            values = [self._aggregate(row, stat, q) for row in rows.values()]
+        result = dict((stream_id, None) for stream_id in self.stream_ids)
+        result.update((stream_id, None if value is None or math.isnan(value)
+            else float(value)) for stream_id, value in zip(rows, values))
+        return result
+
+    def _aggregate(self, row, stat, q):
+        values = [v for v in row if not math.isnan(v)]
+        if not values:
+            return None
+        if stat == 'min':
+            return min(values)
+        if stat == 'max':
+            return max(values)
+        if stat == 'mean':
+            return math.fsum(values) / len(values)
+        return percentile(sorted(values), q)
+
+    def _numpy_aggregate(self, rows, stat, q):
+        # One vectorized call over a (streams x samples) matrix
+        matrix = numpy.frombuffer(b''.join(row.tobytes() for row in rows))\
+            .reshape(len(rows), -1)
+        functions = {
+            'min': numpy.nanmin,
+            'max': numpy.nanmax,
+            'mean': numpy.nanmean,
+            'percentile': lambda m, axis: numpy.nanpercentile(m, q, axis=axis)
+        }
+        with warnings.catch_warnings():
+            # Rows with no values at all come out as NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return functions[stat](matrix, axis=1)
+
+    def min(self, metric, window=None):
+        return self.aggregate(metric, 'min', window)
+
+    def max(self, metric, window=None):
+        return self.aggregate(metric, 'max', window)
+
+    def mean(self, metric, window=None):
+        return self.aggregate(metric, 'mean', window)
+
+    def percentile(self, metric, q, window=None):
+        return self.aggregate(metric, 'percentile', window, q)
@@ -0,0 +1,133 @@
+"""
+Incremental decoding of the arrays in large JSON responses, so their
+records can be used as they arrive instead of after the whole body has
+been read and decoded
+"""
+import codecs, json, re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters a number starts with, and that can follow a valid prefix of one
+NUMBER_START = frozenset('-0123456789')
+NUMBER_PART = frozenset('0123456789.eE+-')
+
+# Parser states
+OBJECT, FIRST_KEY, NEXT_KEY, KEY, COLON, VALUE, ARRAY, FIRST_ITEM, \
+    NEXT_ITEM, ITEM, DONE = range(11)
+
+
+class ArrayDecoder(object):
+    """
+    Push parser returning the elements of one array of a JSON document as
+    soon as they are complete. Only the unparsed tail of the document is
+    buffered, so memory is bounded by the size of one element:
+
+        decoder = ArrayDecoder('recordings')
+        for chunk in chunks:
+            for recording in decoder.feed(chunk):
+                ...
+        for recording in decoder.close():
+            ...
+
+    path: key of the array in the top level object, or a tuple of keys
+        leading to it through nested objects. An empty tuple stands for a
+        top level array.
+    Values met on the way to the array are decoded and dropped, and
+    everything after it is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = (path,) if isinstance(path, str) else tuple(path)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._depth = 0
+        self._key = None
+        self._state = OBJECT if self.path else ARRAY
+
+    def feed(self, data):
+        """
+        Adds the next chunk of the body (bytes) and returns the elements it
+        completed
+        """
+        self._buffer += self._text.decode(data)
+        return self._parse(False)
+
+    def close(self):
+        """
+        Returns the last elements, or raises ValueError if the body ended
+        before the end of the array
+        """
+        self._buffer += self._text.decode(b'', final=True)
+        items = self._parse(True)
+        if self._state != DONE:
+            raise ValueError('The response ended before the end of the [{}] array.'
+                .format('.'.join(self.path)))
+        return items
+
+    def _missing(self):
+        return ValueError('[{}] is missing from the response.'
+            .format('.'.join(self.path)))
+
+    def _expect(self, char, expected):
+        if char not in expected:
+            raise ValueError('Unexpected [{}] in the response, expected [{}].'
+                .format(char, expected))
+
+    def _parse(self, eof):
+        items = []
+        buf, pos = self._buffer, 0
+        while self._state != DONE:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            char, state = buf[pos], self._state
+            if state in (OBJECT, COLON, NEXT_KEY, ARRAY, NEXT_ITEM):
+                expected = {
+                    OBJECT: '{', COLON: ':', NEXT_KEY: ',}', ARRAY: '[',
+                    NEXT_ITEM: ',]'
+                }[state]
+                self._expect(char, expected)
+                if char == '}':
+                    raise self._missing()
+                pos += 1
+                self._state = {
+                    '{': FIRST_KEY, ':': VALUE, '[': FIRST_ITEM,
+                    ']': DONE, ',': KEY if state == NEXT_KEY else ITEM
+                }[char]
+                continue
+            if state in (FIRST_KEY, KEY):
+                if state == FIRST_KEY and char == '}':
+                    raise self._missing()
+                self._expect(char, '"')
+            if state == FIRST_ITEM and char == ']':
+                pos += 1
+                self._state = DONE
+                continue
+            if state == VALUE and self._key == self.path[self._depth]:
+                # On the way to the array: step into the value
+                self._depth += 1
+                self._state = ARRAY if self._depth == len(self.path) else OBJECT
+                continue
+            # A key, an element, or a value to skip: decode it whole
+            try:
+                value, end = self._json.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                break
+            if not eof and char in NUMBER_START and (end >= len(buf) or
+                buf[end] in NUMBER_PART):
+                # A number split across chunks (1.|5e3) was only decoded up
+                # to the end of this one
+                break
+            pos = end
+            if state in (FIRST_KEY, KEY):
+                self._key = value
+                self._state = COLON
+            elif state == VALUE:
+                self._state = NEXT_KEY
+            else:
+                items.append(value)
+                self._state = NEXT_ITEM
+        self._buffer = buf[pos:] if self._state != DONE else ''
+        return items
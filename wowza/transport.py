@@ -0,0 +1,296 @@
+"""
+Transports send the HTTP requests built by wowza.client.Client. Any object
+implementing the Transport interface can be given to a client:
+
+    client = Client(transport=Urllib3Transport(max_connections=50))
+"""
+import abc, json, threading
+from urllib.parse import urlencode
+from wowza.response import Headers, Response
+
+# Query parameter sent with every request
+QUERY = [('accept', 'application/json')]
+
+
+class Transport(abc.ABC):
+    """
+    Interface of the transports used by wowza.client.Client
+    """
+
+    # Errors a retry policy can treat as transient
+    connection_errors = ()
+
+    @abc.abstractmethod
+    def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        """
+        Sends a request. Returns an object with status_code, headers and
+        content (the raw body as bytes).
+        With stream set, the body is left on the connection: it can be read
+        in chunks with iter_content(chunk_size), and the response must be
+        closed. Transports that can't stream don't need to take the
+        argument: it is only passed when set.
+        """
+
+    @abc.abstractmethod
+    def close(self):
+        """
+        Releases the connections of the transport
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    Sends requests through requests sessions with their own connection pool.
+    pool_connections: number of hosts to keep a connection pool for
+    pool_maxsize: number of connections kept alive per host
+    max_connections: hard cap on connections per host. Requests over the cap
+        wait for a free connection instead of opening a throwaway one.
+    keep_alive: set to False to close connections after every request
+    per_thread: gives every thread its own session and pool, so the transport
+        can be shared by the workers of a ThreadPoolExecutor
+    timeout: seconds to wait for the API before giving up
+    """
+
+    def __init__(self,
+        pool_connections=10,
+        pool_maxsize=10,
+        max_connections=None,
+        keep_alive=True,
+        per_thread=False,
+        timeout=None,
+        session=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = max_connections or pool_maxsize
+        self.pool_block = max_connections is not None
+        self.keep_alive = keep_alive
+        self.per_thread = per_thread
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+        self._session = session
+        if session is None and not per_thread:
+            self._session = self._new_session()
+
+    @property
+    def connection_errors(self):
+        """
+        Errors a retry policy can treat as transient
+        """
+        import requests
+        return (requests.exceptions.ConnectionError,)
+
+    def _new_session(self):
+        # requests is imported with the first session rather than with the
+        # package, see wowza/__init__.py
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.params = {'accept': 'application/json'}
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    @property
+    def session(self):
+        """
+        The session used by the calling thread
+        """
+        if not self.per_thread:
+            return self._session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        """
+        Sends a request. Returns an object with status_code, headers and
+        content (the raw body as bytes).
+        With stream set, the body is left on the connection: it can be read
+        in chunks with iter_content(chunk_size), and the response must be
+        closed.
+        """
+        return self.session.request(method, url, data=data, headers=headers,
+            params=params, timeout=self.timeout, stream=stream)
+
+    def close(self):
+        """
+        Closes the sessions opened by this transport
+        """
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+
+class Urllib3Response(Response):
+    """
+    Response of a Urllib3Transport request sent with stream set, whose body
+    is read in chunks with #iter_content()
+    """
+
+    def __init__(self, response):
+        Response.__init__(self, response.status, response.headers, None)
+        self._response = response
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self._response.read()
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+
+    def iter_content(self, chunk_size):
+        return self._response.stream(chunk_size)
+
+    def close(self):
+        self._response.release_conn()
+
+
+class Urllib3Transport(Transport):
+    """
+    Sends requests straight through a urllib3 pool manager, without the
+    session, hooks and adapters of requests: less work per call for hot
+    polling paths. The pool manager is thread safe and can be shared by
+    the workers of a ThreadPoolExecutor.
+    pool_connections: number of hosts to keep a connection pool for
+    pool_maxsize: number of connections kept alive per host
+    max_connections: hard cap on connections per host. Requests over the cap
+        wait for a free connection instead of opening a throwaway one.
+    keep_alive: set to False to close connections after every request
+    timeout: seconds to wait for the API before giving up
+    """
+
+    def __init__(self,
+        pool_connections=10,
+        pool_maxsize=10,
+        max_connections=None,
+        keep_alive=True,
+        timeout=None,
+        pool_manager=None):
+        # urllib3 is imported with the transport rather than with the
+        # package, see wowza/__init__.py
+        import urllib3
+        self.timeout = urllib3.Timeout(total=timeout)
+        self.headers = {} if keep_alive else {'Connection': 'close'}
+        self.pool_manager = pool_manager or urllib3.PoolManager(
+            num_pools=pool_connections,
+            maxsize=max_connections or pool_maxsize,
+            block=max_connections is not None,
+            retries=False
+        )
+
+    @property
+    def connection_errors(self):
+        from urllib3.exceptions import ProtocolError, NewConnectionError, \
+            ConnectTimeoutError
+        return (ProtocolError, NewConnectionError, ConnectTimeoutError)
+
+    def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        url += '?' + urlencode(QUERY + list((params or {}).items()))
+        if self.headers:
+            headers = dict(headers or {}, **self.headers)
+        response = self.pool_manager.request(method, url, body=data or None,
+            headers=headers, timeout=self.timeout, redirect=False,
+            preload_content=not stream)
+        if stream:
+            return Urllib3Response(response)
+        return Response(response.status, response.headers, response.data)
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+class MemoryResponse(Response):
+    """
+    Response held in memory, which can also be read like a streamed one
+    """
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class MemoryTransport(Transport):
+    """
+    Routes requests to a Python callable instead of the network, for tests
+    and for measuring the overhead of the library itself:
+
+        def handler(method, url, params, headers, data):
+            return 200, {'live_stream': {'state': 'started'}}, {}
+
+        client = Client(transport=MemoryTransport(handler))
+
+    The handler returns (status, body, headers). A dict or list body is
+    encoded as JSON; bytes are sent as is. Header names are case
+    insensitive, as over HTTP. Every request is counted in
+    #count.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.count = 0
+
+    def _respond(self, method, url, data, headers, params):
+        self.count += 1
+        status, body, response_headers = self.handler(method, url,
+            params or {}, headers or {}, data)
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode('utf-8')
+        return MemoryResponse(status, Headers(response_headers), body or b'')
+
+    def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        return self._respond(method, url, data, headers, params)
+
+    def close(self):
+        pass
+
+
+class AsyncMemoryResponse(MemoryResponse):
+    """
+    MemoryResponse read like a streamed response of wowza.aio.transport
+    """
+
+    async def iter_content(self, chunk_size):
+        for chunk in MemoryResponse.iter_content(self, chunk_size):
+            yield chunk
+
+    async def read(self):
+        return self.content
+
+
+class AsyncMemoryTransport(MemoryTransport):
+    """
+    MemoryTransport for wowza.aio.client.AsyncClient. The handler is a
+    plain function, as for MemoryTransport.
+    """
+
+    async def request(self, method, url, data=None, headers=None, params=None,
+        stream=False):
+        response = self._respond(method, url, data, headers, params)
+        return AsyncMemoryResponse(response.status_code, response.headers,
+            response.content)
+
+    async def close(self):
+        pass
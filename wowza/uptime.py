@@ -0,0 +1,282 @@
+"""
+Columnar loading of the historic health metrics of transcoder uptimes, for
+analytics over many transcoders and long periods. Needs numpy.
+
+    loader = UptimeLoader(Transcoders(), cache_dir='uptimes/')
+    fleet = UptimeMetrics.concat(loader.load_many(uptimes).values())
+    hourly = fleet.resample(3600, 'max')
+    hourly['cpu']
+"""
+import inspect, os
+from datetime import datetime
+from wowza.bulk import run_many
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HOWS = ('mean', 'min', 'max', 'sum', 'count')
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('numpy needs to be installed to use wowza.uptime.')
+
+
+def metric_records(response):
+    """
+    Returns the list of metric samples in a historic metrics response: the
+    first list of objects found, looking through nested objects
+    """
+    if isinstance(response, list):
+        return response
+    pending = [response]
+    while pending:
+        value = pending.pop(0)
+        if isinstance(value, list) and (not value or isinstance(value[0], dict)):
+            return value
+        if hasattr(value, 'values'):
+            pending.extend(value.values())
+    return []
+
+
+def _number(value):
+    """
+    Returns a metric value as a float: the API gives either numbers or
+    objects with a value
+    """
+    if hasattr(value, 'get'):
+        value = value.get('value')
+    if value is None or isinstance(value, bool):
+        return numpy.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return numpy.nan
+
+
+def parse_times(values):
+    """
+    Converts timestamps (epoch seconds or ISO 8601 strings) to an array of
+    epoch seconds
+    """
+    values = list(values)
+    if not values or not isinstance(values[0], str):
+        return numpy.array(values, dtype='float64')
+    try:
+        stamps = numpy.array([v[:-1] if v.endswith('Z') else v for v in values],
+            dtype='datetime64[ms]')
+        return stamps.astype('int64') / 1000.0
+    except ValueError:
+        # Offsets other than Z
+        return numpy.array([datetime.fromisoformat(v.replace('Z', '+00:00'))
+            .timestamp() for v in values])
+
+
+class UptimeMetrics(object):
+    """
+    Health metrics as columns: #times holds the sample times in epoch
+    seconds, sorted, and #columns a float64 array per metric, aligned on
+    #times. Missing values are NaN.
+    """
+
+    def __init__(self, times, columns):
+        _require_numpy()
+        order = numpy.argsort(times, kind='stable')
+        self.times = numpy.asarray(times, dtype='float64')[order]
+        self.columns = dict((name, numpy.asarray(column, dtype='float64')[order])
+            for name, column in columns.items())
+
+    @classmethod
+    def from_records(cls, records, time_key='timestamp'):
+        """
+        Builds the columns from a list of samples like
+        {'timestamp': ..., 'cpu': 12, 'bits_in_rate': {'value': 3000}}
+        """
+        _require_numpy()
+        names = []
+        seen = set([time_key])
+        for record in records:
+            for name in record:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        count = len(records)
+        columns = dict((name, numpy.fromiter(
+            (_number(record.get(name)) for record in records), 'float64', count))
+            for name in names)
+        # Drop the columns without a single number, i.e. ids and labels
+        columns = dict((name, column) for name, column in columns.items()
+            if not numpy.isnan(column).all())
+        return cls(parse_times(r.get(time_key) for r in records), columns)
+
+    @classmethod
+    def from_response(cls, response, time_key='timestamp'):
+        return cls.from_records(metric_records(response), time_key)
+
+    @classmethod
+    def concat(cls, frames):
+        """
+        Merges the samples of several instances, i.e. of many transcoders,
+        into one
+        """
+        frames = list(frames)
+        _require_numpy()
+        names = []
+        for frame in frames:
+            names.extend(n for n in frame.columns if n not in names)
+        times = numpy.concatenate([f.times for f in frames]) if frames \
+            else numpy.empty(0)
+        columns = dict((name, numpy.concatenate([
+            f.columns[name] if name in f.columns else numpy.full(len(f), numpy.nan)
+            for f in frames])) for name in names)
+        return cls(times, columns)
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def metrics(self):
+        return list(self.columns)
+
+    def between(self, start=None, end=None):
+        """
+        Returns the samples taken from start (included) to end (excluded),
+        in epoch seconds
+        """
+        low = 0 if start is None else numpy.searchsorted(self.times, start)
+        high = len(self) if end is None else numpy.searchsorted(self.times, end)
+        return UptimeMetrics(self.times[low:high], dict(
+            (name, column[low:high]) for name, column in self.columns.items()))
+
+    def resample(self, period, how='mean'):
+        """
+        Aggregates the samples into buckets of period seconds, aligned on
+        the epoch. how is one of mean, min, max, sum or count; NaNs are
+        ignored. The times of the result are the starts of the buckets.
+        """
+        if how not in HOWS:
+            raise ValueError('Unknown aggregation [{}]. Valid ones are: {}'
+                .format(how, list(HOWS)))
+        buckets = numpy.floor(self.times / period)
+        if not len(buckets):
+            return UptimeMetrics(buckets, dict((name, buckets)
+                for name in self.columns))
+        # The times are sorted: every bucket is a run of samples
+        bounds = numpy.flatnonzero(numpy.r_[True, buckets[1:] != buckets[:-1]])
+        columns = {}
+        for name, column in self.columns.items():
+            present = ~numpy.isnan(column)
+            if how in ('mean', 'sum', 'count'):
+                counts = numpy.add.reduceat(present, bounds, dtype='float64')
+                if how == 'count':
+                    columns[name] = counts
+                    continue
+                sums = numpy.add.reduceat(numpy.where(present, column, 0), bounds)
+                if how == 'sum':
+                    columns[name] = sums
+                    continue
+                with numpy.errstate(invalid='ignore', divide='ignore'):
+                    columns[name] = sums / counts
+            else:
+                # fmin/fmax ignore NaNs
+                ufunc = numpy.fmin if how == 'min' else numpy.fmax
+                columns[name] = ufunc.reduceat(column, bounds)
+        return UptimeMetrics(buckets[bounds] * period, columns)
+
+    def rollup(self, how='mean'):
+        """
+        Aggregates every metric over all the samples. Returns a dictionary
+        of floats by metric (NaN when a metric has no values).
+        """
+        if how not in HOWS:
+            raise ValueError('Unknown aggregation [{}]. Valid ones are: {}'
+                .format(how, list(HOWS)))
+        rollup = {}
+        for name, column in self.columns.items():
+            present = column[~numpy.isnan(column)]
+            if how == 'count':
+                rollup[name] = float(len(present))
+            elif how == 'sum':
+                rollup[name] = float(present.sum())
+            elif not len(present):
+                rollup[name] = numpy.nan
+            else:
+                rollup[name] = float(getattr(present, how)())
+        return rollup
+
+    def save(self, path):
+        """
+        Saves the columns to a .npz file
+        """
+        numpy.savez(path, __times__=self.times, **self.columns)
+
+    @classmethod
+    def load(cls, path):
+        _require_numpy()
+        with numpy.load(path) as data:
+            columns = dict((name, data[name]) for name in data.files
+                if name != '__times__')
+            return cls(data['__times__'], columns)
+
+
+class UptimeLoader(object):
+    """
+    Loads the historic metrics of transcoder uptimes as UptimeMetrics, and
+    keeps them so that each uptime is only fetched and converted once. With
+    cache_dir set, they are also saved there as .npz files and reused
+    across runs.
+    Only use the cache for uptimes that are over: the metrics of a running
+    transcoder keep growing.
+    transcoders: a wowza.Transcoders instance. The loader is synchronous,
+        wowza.aio endpoints aren't supported.
+    """
+
+    def __init__(self, transcoders, cache_dir=None, max_workers=10):
+        _require_numpy()
+        if inspect.iscoroutinefunction(transcoders.uptime_metrics):
+            raise TypeError('UptimeLoader needs a wowza.Transcoders instance, '
+                'not an async one.')
+        self.transcoders = transcoders
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        # Errors of the last #load_many(), by (transcoder id, uptime id)
+        self.errors = {}
+        self._cache = {}
+
+    def _path(self, tran_id, uptime_id):
+        return os.path.join(self.cache_dir, '{}_{}.npz'.format(tran_id, uptime_id))
+
+    def load(self, tran_id, uptime_id):
+        key = (tran_id, uptime_id)
+        metrics = self._cache.get(key)
+        if metrics is not None:
+            return metrics
+        path = self._path(tran_id, uptime_id) if self.cache_dir else None
+        if path and os.path.exists(path):
+            metrics = UptimeMetrics.load(path)
+        else:
+            metrics = self.transcoders.uptime_metrics(tran_id, uptime_id)
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                metrics.save(path)
+        self._cache[key] = metrics
+        return metrics
+
+    def load_many(self, uptimes, deadline=None):
+        """
+        Loads several (transcoder id, uptime id) pairs in parallel. Returns a
+        dictionary of UptimeMetrics by pair; failed pairs are left out and
+        their errors kept in #errors.
+        """
+        result = run_many(lambda key: self.load(*key),
+            [tuple(key) for key in uptimes], self.max_workers, deadline)
+        self.errors = result.errors
+        return result.results
+
+    def clear(self):
+        self._cache.clear()
@@ -1,12 +1,220 @@
-import json, time
-from . import session
-from . import WOWZA_API_KEY, WOWZA_ACCESS_KEY, WOWZA_BASE_URL
+import copy, functools, time
+from wowza.bulk import iter_many, run_many
+from wowza.client import Client, default_transport
 from wowza.exceptions import InvalidParamDict, InvalidParameter, MissingParameter, \
-    InvalidInteraction, InvalidStateChange, TokenAuthBusy, GeoblockingBusy, \
-    LimitReached
+    InvalidInteraction, InvalidStateChange, TokenAuthBusy, GeoblockingBusy
+from wowza.index import ResourceIndex
+from wowza.polling import StateWaiter
+from wowza.reports import ViewerReport
+from wowza.retry import RetryPolicy, busy_policy
 
 
-class LiveStreams(object):
+class Resource(object):
+    """
+    Base class for the Wowza endpoint classes.
+    Every call goes through #_request() and the client, so the path building
+    and validation in the subclasses can be reused on top of another HTTP
+    layer (see wowza.aio).
+    Without a client, the instance gets its own client on the default
+    transport (wowza.session), configured from wowza.config.
+    """
+
+    endpoint = ''
+    client_class = Client
+    retry_policy = None
+    # Key of the list endpoint and of a single record in responses,
+    # i.e. 'live_streams' and 'live_stream'
+    collection = None
+    record = None
+    # Whether the records of the list endpoint carry their state. None
+    # until the first list call tells.
+    _list_has_state = None
+
+    def __init__(self,
+        base_url=None,
+        api_key=None,
+        access_key=None,
+        codec=None,
+        client=None):
+        if client is None:
+            client = self.client_class(
+                api_key=api_key,
+                access_key=access_key,
+                codec=codec,
+                transport=self._default_transport()
+            )
+        self.client = client
+        if base_url is None:
+            base_url = client.base_url + self.endpoint
+        self.base_url = base_url
+        self.headers = client.headers
+        self.codec = client.codec
+
+    def _default_transport(self):
+        return default_transport()
+
+    def retrying(self, policy=None):
+        """
+        Returns a copy of this instance whose calls are retried according to
+        policy (a default wowza.retry.RetryPolicy if not given):
+
+            live_streams.retrying().start(stream_id)
+        """
+        resource = copy.copy(self)
+        resource.retry_policy = policy or RetryPolicy()
+        return resource
+
+    def _request(self, method, path, param_dict=None, raw=False, params=None,
+        retry_policy=None):
+        """
+        Sends a request to the API, with param_dict as the JSON body.
+        Returns the decoded JSON response, or the response itself when raw
+        is set (i.e. for DELETE calls). API errors are raised as the
+        matching exception from wowza.exceptions.
+        """
+        return self.client.request(method, path, param_dict, raw, params,
+            retry_policy or self.retry_policy)
+
+    def _iter_many(self, func, ids, max_workers, deadline):
+        return iter_many(func, ids, max_workers, deadline)
+
+    def _run_many(self, func, ids, max_workers, deadline):
+        return run_many(func, ids, max_workers, deadline)
+
+    def _state(self, resource_id):
+        return self.info(resource_id, 'state')[self.record]['state']
+
+    def _states(self, ids):
+        """
+        Returns the current state of every id. Several ids are looked up
+        with a single list call when the list records carry their state,
+        the rest with one state call each.
+        """
+        states = {}
+        if len(ids) > 1 and self._list_has_state is not False:
+            wanted = set(ids)
+            for record in getattr(self, 'iter_' + self.collection)(prefetch=False):
+                if 'state' not in record:
+                    self._list_has_state = False
+                    break
+                self._list_has_state = True
+                if record.get('id') in wanted:
+                    states[record['id']] = record['state']
+        missing = [i for i in ids if i not in states]
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(10, len(missing))) as executor:
+                states.update(zip(missing, executor.map(self._state, missing)))
+        return states
+
+    def _wait_for_state(self, ids, target_state, timeout, interval, max_interval):
+        waiter = StateWaiter(ids, target_state, timeout, interval, max_interval)
+        while not waiter.update(self._states(waiter.pending)):
+            time.sleep(waiter.next_delay())
+        return waiter.states
+
+    def _fetch_page(self, path, key, page, per_page):
+        response = self._request('GET', path,
+            params={'page': page, 'per_page': per_page})
+        return response[key]
+
+    def _stream(self, path, key, params=None):
+        """
+        Yields the elements of the array at key in the response to a GET,
+        decoding them as the body arrives (see wowza.client.Client#stream())
+        """
+        return self.client.stream('GET', path, key, params=params)
+
+    def _stream_page(self, path, key, page, per_page):
+        return self._stream(path, key, {'page': page, 'per_page': per_page})
+
+    def _paginate(self, path, key, per_page=1000, prefetch=True, stream=False):
+        """
+        Yields the records of a list endpoint one at a time, walking its
+        pages. With prefetch set, the next page is requested in a background
+        thread while the records of the current one are consumed. With
+        stream set, every page is decoded incrementally as it is received,
+        and only one record at a time is held in memory.
+        """
+        if not prefetch or stream:
+            page = 1
+            while True:
+                records = self._stream_page(path, key, page, per_page) \
+                    if stream else self._fetch_page(path, key, page, per_page)
+                count = 0
+                for record in records:
+                    count += 1
+                    yield record
+                if count < per_page:
+                    return
+                page += 1
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = 1
+            future = executor.submit(self._fetch_page, path, key, page, per_page)
+            while future is not None:
+                records = future.result()
+                page += 1
+                future = executor.submit(self._fetch_page, path, key, page,
+                    per_page) if len(records) >= per_page else None
+                for record in records:
+                    yield record
+
+    def _index(self):
+        if self.client.index is None:
+            self.client.index = ResourceIndex()
+        return self.client.index
+
+    def refresh_index(self):
+        """
+        Lists the whole collection into the index of the client, dropping
+        the resources that are gone
+        """
+        index = self._index()
+        ids = []
+        for record in getattr(self, 'iter_' + self.collection)():
+            index.update(self.collection, record['id'], record)
+            ids.append(record['id'])
+        index.retain(self.collection, ids)
+
+    def filter(self, **criteria):
+        """
+        Returns the ids of the resources whose indexed fields (see
+        wowza.index.ResourceIndex) equal the given values, without calling
+        the API: filter(state='started', broadcast_location='eu_germany').
+        A list of values matches any of them. The first lookup lists the
+        collection to fill the index; after that it follows the responses
+        of the client, see #refresh_index() for changes made elsewhere.
+        """
+        if not self._index().is_complete(self.collection):
+            self.refresh_index()
+        return self._index().filter(self.collection, **criteria)
+
+    def find_by_name(self, name):
+        """
+        Returns the id of the resource named name, None if there is none.
+        Names aren't unique: use #filter(name=name) to get every match.
+        """
+        ids = self.filter(name=name)
+        return ids[0] if ids else None
+
+    def _busy_update(self, path, param_dict, wait, busy_error, message):
+        """
+        PATCHes a resource that can be locked by the API while it processes a
+        previous request (i.e. token auth, geoblocking). With wait set, the
+        update is retried with backoff until the resource frees up. wait can
+        also be a wowza.retry.RetryPolicy to use instead of the default one.
+        """
+        if wait:
+            policy = wait if isinstance(wait, RetryPolicy) else busy_policy(busy_error)
+            return self._request('PATCH', path, param_dict, retry_policy=policy)
+        try:
+            return self._request('PATCH', path, param_dict)
+        except busy_error:
+            raise busy_error({'message': message})
+
+
+class LiveStreams(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/live_streams/
@@ -14,17 +222,12 @@ class LiveStreams(object):
     /api/v1/stream_targets/
     """
 
-    def __init__(self,
-        base_url=WOWZA_BASE_URL,
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = ''
+    collection = 'live_streams'
+    record = 'live_stream'
+    # When set, delete() and stop() skip the state check and rely on the
+    # API rejecting invalid calls. Can be overridden per call.
+    optimistic = False
 
     def info(self, stream_id=None, options=None):
         """
@@ -44,8 +247,15 @@ class LiveStreams(object):
             path = path + stream_id
         if options:
             path = path + "/{}".format(options)
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
+
+    def iter_live_streams(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all live streams associated with the account without
+        loading the whole list at once
+        """
+        return self._paginate(self.base_url + 'live_streams/', 'live_streams',
+            per_page, prefetch, stream)
 
     def create(self, param_dict):
         """
@@ -68,12 +278,7 @@ class LiveStreams(object):
             'live_stream': param_dict
         }
         path = self.base_url + 'live_streams/'
-        response = session.post(
-            path,
-            json.dumps(param_dict),
-            headers=self.headers
-        )
-        return response.json()
+        return self._request('POST', path, param_dict)
 
     def update(self, stream_id, param_dict):
         """
@@ -86,8 +291,7 @@ class LiveStreams(object):
                 'live_stream': param_dict
             }
             path = self.base_url + 'live_streams/{}'.format(stream_id)
-            response = session.patch(path, json.dumps(param_dict), headers=self.headers)
-            return response.json()
+            return self._request('PATCH', path, param_dict)
         else:
             raise InvalidParamDict({
                 'message': 'Desired parameters for update should be passed in \
@@ -95,16 +299,27 @@ class LiveStreams(object):
                 i.e. {\'transcoder_type\': \'transcoded\'}'
             })
 
-    def delete(self, stream_id):
+    def delete(self, stream_id, optimistic=None):
         """
         Used to delete a live stream.
+        Unless optimistic is set, the state of the stream is checked first.
+        Otherwise the DELETE is sent right away and the API answers with
+        InvalidInteraction if the stream is running.
         """
-        state = self.info(stream_id, 'state')['live_stream']['state']
-        if state is not 'started':
-            path = self.base_url + 'live_streams/{}'.format(stream_id)
-            response = session.delete(path, headers=self.headers)
-            return response
-        else:
+        if not self._optimistic(optimistic):
+            self._check_delete(self.info(stream_id, 'state'))
+        path = self.base_url + 'live_streams/{}'.format(stream_id)
+        return self._request('DELETE', path, raw=True)
+
+    def _optimistic(self, optimistic):
+        return self.optimistic if optimistic is None else optimistic
+
+    def _check_delete(self, response):
+        """
+        Makes sure the live stream isn't running before deleting it
+        """
+        state = response['live_stream']['state']
+        if state == 'started':
             raise InvalidInteraction({
                 'message': 'Cannot delete a running event. Stop the event first \
                 and try again.'
@@ -115,48 +330,94 @@ class LiveStreams(object):
         Used to start a live stream
         """
         path = self.base_url + "live_streams/{}/start".format(stream_id)
-        response = session.put(path, data='', headers=self.headers)
-        return response.json()
+        return self._request('PUT', path)
 
     def reset(self, stream_id):
         """
         Used to reset a live stream
         """
         path = self.base_url + "live_streams/{}/reset".format(stream_id)
-        response = session.put(path, data='', headers=self.headers)
-        if 'meta' in response.json():
-            if response.json()['meta']['code'] == 'ERR-422-InvalidInteraction':
-                raise InvalidInteraction({
-                    'message': 'Unable to reset stream. Invalid state for resetting.'
-                }) 
-        return response.json()
+        return self._request('PUT', path)
 
-    def stop(self, stream_id):
+    def stop(self, stream_id, optimistic=None):
         """
-        Used to stop a live stream
+        Used to stop a live stream.
+        Unless optimistic is set, the state of the stream is checked first.
+        Either way, InvalidStateChange is raised if the stream isn't running.
         """
-        state = self.info(stream_id, 'state')['live_stream']['state']
-        if state == 'started':
-            path = self.base_url + "live_streams/{}/stop".format(stream_id)
-            response = session.put(path, data='', headers=self.headers)
-            if 'meta' in response.json():
-                if response.json()['meta']['code'] == 'ERR-422-InvalidInteraction':
-                    raise InvalidInteraction({
-                        'message': 'Unable to stop stream. Invalid state for stopping.'
-                    }) 
-        else:
-            raise InvalidStateChange({
-                'message': 'Cannot stop a live stream that is not running.'
-            })
-        return response.json()
+        path = self.base_url + "live_streams/{}/stop".format(stream_id)
+        if not self._optimistic(optimistic):
+            self._check_stop(self.info(stream_id, 'state'))
+            return self._request('PUT', path)
+        try:
+            return self._request('PUT', path)
+        except InvalidInteraction:
+            raise self._not_running()
+
+    def _check_stop(self, response):
+        """
+        Makes sure the live stream is running before stopping it
+        """
+        if response['live_stream']['state'] != 'started':
+            raise self._not_running()
+
+    def _not_running(self):
+        return InvalidStateChange({
+            'message': 'Cannot stop a live stream that is not running.'
+        })
+
+    def wait_for_state(self, stream_ids, target_state='started', timeout=300,
+        interval=1, max_interval=15):
+        """
+        Waits until every live stream in stream_ids (or a single stream id)
+        reaches target_state, and returns a dictionary of their states.
+        Polls every interval seconds at first, backing off to max_interval.
+        Raises DeadlineExceeded after timeout seconds.
+        """
+        return self._wait_for_state(stream_ids, target_state, timeout,
+            interval, max_interval)
+
+    def start_many(self, stream_ids, max_workers=10, deadline=None):
+        """
+        Starts several live streams in parallel, on at most max_workers
+        threads. Returns a wowza.bulk.BulkResult with the response or error
+        for every id. With deadline (in seconds) set, streams that haven't
+        been handled by then are reported as DeadlineExceeded errors, or
+        DeadlineInFlight for the calls still running, which may still go
+        through.
+        """
+        return self._run_many(self.start, stream_ids, max_workers, deadline)
+
+    def stop_many(self, stream_ids, max_workers=10, deadline=None,
+        optimistic=None):
+        """
+        Stops several live streams in parallel. See #start_many() and #stop()
+        """
+        return self._run_many(functools.partial(self.stop, optimistic=optimistic),
+            stream_ids, max_workers, deadline)
+
+    def delete_many(self, stream_ids, max_workers=10, deadline=None,
+        optimistic=None):
+        """
+        Deletes several live streams in parallel. See #start_many() and
+        #delete()
+        """
+        return self._run_many(functools.partial(self.delete, optimistic=optimistic),
+            stream_ids, max_workers, deadline)
 
     def stats(self, stream_id):
         """
         This operation returns a hash of metrics keys, each of which identifies a status, text description, unit, and value
         """
         path = self.base_url + "live_streams/{}/stats".format(stream_id)
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
+
+    def stats_many(self, stream_ids, max_workers=10, deadline=None):
+        """
+        Fetches the stats of several live streams in parallel. See
+        #start_many() and wowza.stats.StatsCollector
+        """
+        return self._run_many(self.stats, stream_ids, max_workers, deadline)
 
 
     def new_code(self, stream_id):
@@ -164,8 +425,7 @@ class LiveStreams(object):
         Used to generate a new connection code for a live stream
         """
         path = self.base_url + "live_streams/{}/regenerate_connection_code".format(stream_id)
-        response = session.put(path, data='', headers=self.headers)
-        return response.json()
+        return self._request('PUT', path)
 
     def regenerate_connection_code(self, stream_id):
         """
@@ -174,33 +434,31 @@ class LiveStreams(object):
         return self.new_code(stream_id)
 
 
-class StreamSources(object):
+class StreamSources(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/stream_sources/
     """
 
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'stream_sources/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'stream_sources/'
+    collection = 'stream_sources'
+    record = 'stream_source'
 
     def info(self, source_id=None):
         """
         Used to get information regarding all stream sources or to get
         information on a particular source
         """
-        path = self.base_url
-        path = "{}/{}".format(path, source_id) if source_id else path
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        path = self.base_url + source_id if source_id else self.base_url
+        return self._request('GET', path)
+
+    def iter_stream_sources(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all stream sources without loading the whole list at
+        once
+        """
+        return self._paginate(self.base_url, 'stream_sources', per_page, prefetch,
+            stream)
 
     def source(self, source_id):
         """
@@ -217,9 +475,7 @@ class StreamSources(object):
             param_dict = {
                 'stream_source': param_dict
             }
-            response = session.post(path, json.dumps(param_dict),
-                headers=self.headers)
-            return response.json()
+            return self._request('POST', path, param_dict)
         else:
             return InvalidParamDict({
                     'message': 'The provided parameter dictionary is not valid.'
@@ -234,9 +490,7 @@ class StreamSources(object):
             param_dict = {
                 'stream_source': param_dict
             }
-            response = session.patch(path, json.dumps(param_dict),
-                headers=self.headers)
-            return response.json()
+            return self._request('PATCH', path, param_dict)
         else:
             return InvalidParamDict({
                     'message': 'The provided parameter dictionary is not valid.'
@@ -247,27 +501,18 @@ class StreamSources(object):
         Used to delete a particular source
         """
         path = self.base_url + source_id
-        response = session.delete(path, headers=self.headers)
-        return response
+        return self._request('DELETE', path, raw=True)
 
 
-class StreamTargets(object):
+class StreamTargets(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/stream_targets
     """
 
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'stream_targets/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'stream_targets/'
+    collection = 'stream_targets'
+    record = 'stream_target'
 
     def info(self, stream_target_id=None):
         """
@@ -276,8 +521,15 @@ class StreamTargets(object):
         """
         path = self.base_url
         path = "{}{}".format(path, stream_target_id) if stream_target_id else path
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
+
+    def iter_stream_targets(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all stream targets without loading the whole list at
+        once
+        """
+        return self._paginate(self.base_url, 'stream_targets', per_page, prefetch,
+            stream)
 
     def create(self, param_dict):
         """
@@ -288,14 +540,7 @@ class StreamTargets(object):
             param_dict = {
                 'stream_target': param_dict
             }
-            response = session.post(path, json.dumps(param_dict), 
-                headers=self.headers)
-            if 'meta' in response.json():
-                if 'LimitReached' in response.json()['meta']['code']:
-                    raise LimitReached({
-                        'message': response.json()['meta']['message']
-                    })
-            return response.json()
+            return self._request('POST', path, param_dict)
         else:
             return InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
@@ -310,9 +555,7 @@ class StreamTargets(object):
             param_dict = {
                 'stream_target': param_dict
             }
-            response = session.patch(path, json.dumps(param_dict),
-                headers=self.headers)
-            return response.json()
+            return self._request('PATCH', path, param_dict)
         else:
             raise InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
@@ -323,16 +566,22 @@ class StreamTargets(object):
         Used to delete a given stream target by ID
         """
         path = self.base_url + stream_target_id
-        response = session.delete(path, headers=self.headers)
-        return response
+        return self._request('DELETE', path, raw=True)
+
+    def delete_many(self, stream_target_ids, max_workers=10, deadline=None):
+        """
+        Deletes several stream targets in parallel, on at most max_workers
+        threads. Returns a wowza.bulk.BulkResult.
+        """
+        return self._run_many(self.delete, stream_target_ids, max_workers,
+            deadline)
 
     def new_code(self, stream_target_id):
         """
         Used to create a new connection code for a stream target
         """
         path = self.base_url + '{}/regenerate_connection_code'.format(stream_target_id)
-        response = session.put(path, data='', headers=self.headers)
-        return response.json()
+        return self._request('PUT', path)
 
     def regenerate_connection_code(self, stream_target_id):
         """Same as #new_code()"""
@@ -343,8 +592,7 @@ class StreamTargets(object):
         Get the details of the token authorization applied to a stream target
         """
         path = self.base_url + '{}/token_auth'.format(stream_target_id)
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
     def token_auth(self, stream_target_id):
         """Same as #token_auth_info()"""
@@ -359,9 +607,7 @@ class StreamTargets(object):
             param_dict = {
                 'token_auth': param_dict
             }
-            response = session.post(path, json.dumps(param_dict),
-                headers=self.headers)
-            return response.json()
+            return self._request('POST', path, param_dict)
         else:
             raise InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
@@ -369,29 +615,19 @@ class StreamTargets(object):
 
     def update_token_auth(self, stream_target_id, param_dict, wait=False):
         """
-        Used to update details associated with a token authorization
+        Used to update details associated with a token authorization.
+        With wait set, retries with backoff while the stream target is still
+        processing a previous token auth request.
         """
         if isinstance(param_dict, dict):
             path = self.base_url + '{}/token_auth'.format(stream_target_id)
             param_dict = {
                 'token_auth': param_dict
             }
-            response = session.patch(path, json.dumps(param_dict),
-                headers=self.headers)
-            if ('meta' in response.json()) and wait: # if we want to try again
-                if response.json()['meta']['code'] == 'ERR-423-TokenAuthBusy':
-                    while 'meta' in response.json():
-                        response = session.patch(path, json.dumps(param_dict),
-                            headers=self.headers)
-                        time.sleep(5)
-                    return response.json()
-            else:
-                raise TokenAuthBusy({
-                    'message': 'The stream target is already processing a \
-                    token auth request. Please try again later, or try \
-                    submitting your request with the wait=True parameter.'
-                    })
-            return response.json()
+            return self._busy_update(path, param_dict, wait, TokenAuthBusy,
+                'The stream target is already processing a \
+                token auth request. Please try again later, or try \
+                submitting your request with the wait=True parameter.')
         else:
             raise InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
@@ -404,8 +640,7 @@ class StreamTargets(object):
         """
         path = self.base_url + '{}/properties'.format(stream_target_id)
         path = "{}/{}".format(path, property_id) if property_id else path
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
     def create_property(self, stream_target_id, param_dict):
         """
@@ -416,9 +651,7 @@ class StreamTargets(object):
             param_dict = {
                 'property': param_dict
             }
-            response = session.post(path, json.dumps(param_dict),
-                headers=self.headers)
-            return response.json()
+            return self._request('POST', path, param_dict)
         else:
             raise InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
@@ -430,8 +663,7 @@ class StreamTargets(object):
         """
         path = self.base_url + '{}/properties/{}'\
             .format(stream_target_id, property_id)
-        response = session.delete(path, headers=self.headers)
-        return response
+        return self._request('DELETE', path, raw=True)
 
     def geoblock(self, stream_target_id):
         """
@@ -439,8 +671,7 @@ class StreamTargets(object):
         NOTE: WOWZA ALPHA FEATURE
         """
         path = self.base_url + '{}/geoblock'.format(stream_target_id)
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
     def create_geoblock(self, stream_target_id, param_dict):
         """
@@ -452,61 +683,43 @@ class StreamTargets(object):
             param_dict = {
                 'geoblock': param_dict
             }
-            response = session.post(path, json.dumps(param_dict),
-                headers=self.headers)
-            return response.json()
+            return self._request('POST', path, param_dict)
         else:
             raise InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
             })
 
     def update_geoblock(self, stream_target_id, param_dict, wait=False):
-        """ Updates a geoblocked location """
+        """
+        Updates a geoblocked location.
+        With wait set, retries with backoff while the stream target is still
+        processing a previous geoblocking request.
+        """
         if isinstance(param_dict, dict):
             path = self.base_url + '{}/geoblock'.format(stream_target_id)
             param_dict = {
                 'geoblock': param_dict
             }
-            response = session.patch(path, json.dumps(param_dict),
-                headers=self.headers)
             # if we want to wait until we're able to make the update
             # it may take up to 30 minutes for mutability after creation
-            if ('meta' in response.json()) and wait:
-                if response.json()['meta']['code'] == 'ERR-423-GeoblockingBusy':
-                    while 'meta' in response.json():
-                        response = session.patch(path, json.dumps(param_dict),
-                            headers=self.headers)
-                        time.sleep(5)
-                    return response.json()
-            else:
-                raise GeoblockingBusy({
-                    'message': 'The stream target is already processing a \
-                    geoblocking request. Please try again later, or try \
-                    submitting your request with the wait=True parameter.'
-                    })
-            return response.json()
+            return self._busy_update(path, param_dict, wait, GeoblockingBusy,
+                'The stream target is already processing a \
+                geoblocking request. Please try again later, or try \
+                submitting your request with the wait=True parameter.')
         else:
             raise InvalidParamDict({
                 'message': 'Invalid parameter dictionary provided.'
             })
 
 
-class Players(object):
+class Players(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/players/
     """
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'players/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'players/'
+    collection = 'players'
+    record = 'player'
 
     def info(self, player_id=None, option=None):
         """
@@ -517,8 +730,14 @@ class Players(object):
         path = self.base_url
         path = "{}{}".format(path, player_id) if player_id else path
         path = "{}/{}".format(path, option) if option else path
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
+
+    def iter_players(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all players without loading the whole list at once
+        """
+        return self._paginate(self.base_url, 'players', per_page, prefetch,
+            stream)
 
     def update(self, player_id, param_dict):
         """
@@ -538,16 +757,14 @@ class Players(object):
             'player': param_dict
         }
         path = "{}{}".format(self.base_url, player_id)
-        response = session.patch(path, json.dumps(param_dict), headers=self.headers)
-        return response.json()
+        return self._request('PATCH', path, param_dict)
 
     def rebuild(self, player_id):
         """
         Used to rebuild a given player
         """
         path = "{}{}/rebuild".format(self.base_url, player_id)
-        response = session.post(path, data='', headers=self.headers)
-        return response.json()
+        return self._request('POST', path)
 
     def urls(self, player_id, option=None, url_id=None, param_dict=None):
         """
@@ -569,18 +786,17 @@ class Players(object):
                 param_dict = {
                     'url': param_dict
                 }
-                response = session.post(path, data=json.dumps(param_dict), headers=self.headers)
+                return self._request('POST', path, param_dict)
             elif url_id and not option:
                 # No option + URL ID = GET on that URL by ID
-                response = session.get(path, headers=self.headers)
+                return self._request('GET', path)
             elif option.upper() == 'delete'.upper(): # DELETE is a keyword
                 if not url_id:
                     raise MissingParameter({
                         'message': 'URL_ID needs to be provided when deleting a player URL.'
                     })
                 path = path + url_id
-                response = session.delete(path, headers=self.headers)
-                return response
+                return self._request('DELETE', path, raw=True)
             elif option.upper() == 'update'.upper(): # UPDATE is a keyword
                 missing_params = [
                     'URL ID' if not url_id else None,
@@ -597,12 +813,11 @@ class Players(object):
                 param_dict = {
                     'url': param_dict
                 }
-                response = session.patch(path, json.dumps(param_dict),headers=self.headers)
+                return self._request('PATCH', path, param_dict)
         else:
             if url_id:
                 path = path + url_id
-            response = session.get(path, headers=self.headers)
-        return response.json()
+            return self._request('GET', path)
 
     def url_delete(self, player_id, url_id):
         """
@@ -611,22 +826,14 @@ class Players(object):
         return self.urls(player_id, 'delete', url_id)
 
 
-class Recordings(object):
+class Recordings(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/recordings/
     """
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'recordings/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'recordings/'
+    collection = 'recordings'
+    record = 'recording'
 
     def info(self, rec_id=None, option=None):
         """
@@ -641,34 +848,40 @@ class Recordings(object):
                     'message': 'Recording ID needs to be provided when \
                     getting the state of a recording.'
                 })
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
-    def delete(info, rec_id):
+    def iter_recordings(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all recordings without loading the whole list at once
+        """
+        return self._paginate(self.base_url, 'recordings', per_page, prefetch,
+            stream)
+
+    def wait_for_state(self, rec_ids, target_state='completed', timeout=3600,
+        interval=2, max_interval=30):
+        """
+        Waits until every recording in rec_ids (or a single recording id)
+        reaches target_state. See LiveStreams#wait_for_state()
+        """
+        return self._wait_for_state(rec_ids, target_state, timeout,
+            interval, max_interval)
+
+    def delete(self, rec_id):
         """
         Used to delete a recording
         """
         path = self.base_url + rec_id
-        response = session.delete(path, headers=self.headers)
-        return response
+        return self._request('DELETE', path, raw=True)
 
 
-class Schedules(object):
+class Schedules(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/schedules/
     """
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'schedules/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'schedules/'
+    collection = 'schedules'
+    record = 'schedule'
 
     def info(self, sched_id=None, option=None):
         """
@@ -683,8 +896,14 @@ class Schedules(object):
                     'message': 'Need schedule ID if getting the state of a schedule.'
                 })
             path = path + "/state"
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
+
+    def iter_schedules(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all schedules without loading the whole list at once
+        """
+        return self._paginate(self.base_url, 'schedules', per_page, prefetch,
+            stream)
 
     def create(self, param_dict):
         """
@@ -706,8 +925,7 @@ class Schedules(object):
         param_dict = {
             'schedule': param_dict
         }
-        response = session.post(path, json.dumps(param_dict), headers=self.headers)
-        return response.json()
+        return self._request('POST', path, param_dict)
 
     def update(self, sched_id, param_dict):
         """
@@ -718,8 +936,7 @@ class Schedules(object):
             param_dict = {
                 'schedule': param_dict
             }
-            response = session.patch(path, json.dumps(param_dict), headers=self.headers)
-            return response.json()
+            return self._request('PATCH', path, param_dict)
         else:
             raise InvalidParamDict({
                 'message': 'Param_dict needs to be a valid dictionary.'
@@ -730,16 +947,14 @@ class Schedules(object):
         Used to delete a particular schedule
         """
         path = "{}{}/delete".format(self.base_url, sched_id)
-        response = session.delete(path, headers=self.headers)
-        return response
+        return self._request('DELETE', path, raw=True)
 
     def enable(self, sched_id):
         """
         Used to enable a particular schedule
         """
         path = "{}{}/enable".format(self.base_url, sched_id)
-        response = session.put(path, data='', headers=self.headers)
-        return response.json()
+        return self._request('PUT', path)
 
     def start(self, sched_id):
         """
@@ -747,13 +962,19 @@ class Schedules(object):
         """
         return self.enable(sched_id)
 
+    def enable_many(self, sched_ids, max_workers=10, deadline=None):
+        """
+        Enables several schedules in parallel, on at most max_workers
+        threads. Returns a wowza.bulk.BulkResult.
+        """
+        return self._run_many(self.enable, sched_ids, max_workers, deadline)
+
     def disable(self, sched_id):
         """
         Used to disable a particular schedule
         """
         path = "{}{}/disable".format(self.base_url, sched_id)
-        response = session.put(path, data='', headers=self.headers)
-        return response.json()
+        return self._request('PUT', path)
 
     def stop(self, sched_id):
         """
@@ -761,6 +982,12 @@ class Schedules(object):
         """
         return self.disable(sched_id)
 
+    def disable_many(self, sched_ids, max_workers=10, deadline=None):
+        """
+        Disables several schedules in parallel. See #enable_many()
+        """
+        return self._run_many(self.disable, sched_ids, max_workers, deadline)
+
     def toggle(self, sched_id):
         """
         Toggles the state of a schedule
@@ -773,22 +1000,14 @@ class Schedules(object):
             return self.enable(sched_id)
 
 
-class Transcoders(object):
+class Transcoders(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/transcoders/
     """
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'transcoders/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'transcoders/'
+    collection = 'transcoders'
+    record = 'transcoder'
 
     def info(self, tran_id=None, option=None, uptime_id=None):
         """
@@ -811,24 +1030,57 @@ class Transcoders(object):
                     'message': 'Option provided is invalid. Valid options are: {}'\
                         .format(valid_options)
                 })
-            path = path + option
-        response = session.get(path, headers=self.headers)
-        return response.json()
+            path = path + '/' + option
+        return self._request('GET', path)
+
+    def iter_transcoders(self, per_page=1000, prefetch=True, stream=False):
+        """
+        Iterates over all transcoders without loading the whole list at once
+        """
+        return self._paginate(self.base_url, 'transcoders', per_page, prefetch,
+            stream)
+
+    def wait_for_state(self, tran_ids, target_state='started', timeout=300,
+        interval=1, max_interval=15):
+        """
+        Waits until every transcoder in tran_ids (or a single transcoder id)
+        reaches target_state. See LiveStreams#wait_for_state()
+        """
+        return self._wait_for_state(tran_ids, target_state, timeout,
+            interval, max_interval)
 
     def uptime(self, tran_id, uptime_id=None, options=None):
         """
-        Get details and health metrics for a particular transcoder
+        Get the uptimes of a transcoder, the details of one of them, or
+        its health metrics
         Valid options = current, historic
         """
-        path = self.base_url + "{}/uptimes/"
-        if options == "current":
-            path = path + tran_id + "/metrics/current"
-        elif options == "historic":
-            path = path + tran_id + "/metrics/historic"
-        else:
-            path = path + tran_id
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        path = self.base_url + "{}/uptimes".format(tran_id)
+        if uptime_id:
+            path = path + "/" + uptime_id
+        if options:
+            valid_options = ['current', 'historic']
+            if options not in valid_options:
+                raise InvalidParameter({
+                    'message': 'Option provided is invalid. Valid options are: {}'\
+                        .format(valid_options)
+                })
+            if not uptime_id:
+                raise MissingParameter({
+                    'message': 'Uptime ID is also needed when passing in an \
+                    option'
+                })
+            path = path + "/metrics/" + options
+        return self._request('GET', path)
+
+    def uptime_metrics(self, tran_id, uptime_id):
+        """
+        Returns the historic health metrics of an uptime as columns, see
+        wowza.uptime.UptimeMetrics
+        """
+        from wowza.uptime import UptimeMetrics
+        return UptimeMetrics.from_response(
+            self.uptime(tran_id, uptime_id, 'historic'))
 
     def create(self, param_dict):
         """
@@ -845,8 +1097,7 @@ class Transcoders(object):
         param_dict = {
             'transcoder': param_dict
         }
-        response = session.post(path, json.dumps(param_dict), headers=self.headers)
-        return response.json()
+        return self._request('POST', path, param_dict)
 
     def delete(self, tran_id):
         """
@@ -854,26 +1105,17 @@ class Transcoders(object):
         Usage => delete('5jfg91m')
         """
         path = self.base_url + tran_id
-        response = session.delete(path, headers=self.headers)
-        return response
+        return self._request('DELETE', path, raw=True)
 
 
-class Usage(object):
+class Usage(Resource):
     """
     Class to interface with the following Wowza endpoints:
     /api/v1/usage/
     """
-    def __init__(self,
-        base_url=WOWZA_BASE_URL + 'usage/',
-        api_key=WOWZA_API_KEY,
-        access_key=WOWZA_ACCESS_KEY):
-        self.id = id
-        self.base_url = base_url
-        self.headers = {
-            'wsc-api-key': WOWZA_API_KEY,
-            'wsc-access-key': WOWZA_ACCESS_KEY,
-            'content-type': 'application/json'
-        }
+    endpoint = 'usage/'
+    # Used to list the stream targets of #viewer_report()
+    stream_targets_class = StreamTargets
 
     def network(self, option):
         """
@@ -889,24 +1131,21 @@ class Usage(object):
         path_suffix = "stream_sources" if option == "sources" else \
             ("stream_targets" if option == "targets" else option)
         path = self.base_url + path_suffix
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
     def storage(self):
         """
         Used to get the peak recording storage for the account
         """
         path = self.base_url + 'storage/peak_recording'
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
     def transcoders(self):
         """
         Used to get the stream processing time for the account
         """
         path = self.base_url + 'time/transcoders'
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
 
     def viewer_data(self, stream_target_id):
         """
@@ -914,5 +1153,53 @@ class Usage(object):
         """
         path = self.base_url + 'viewer_data/stream_targets/{}'\
             .format(stream_target_id)
-        response = session.get(path, headers=self.headers)
-        return response.json()
+        return self._request('GET', path)
+
+    def iter_viewer_data(self, stream_target_id, key):
+        """
+        Iterates over an array of the viewer data of a stream target,
+        decoding it as the response arrives rather than loading the whole
+        body at once.
+        key: key of the array in the response, or a tuple of keys leading
+            to it through nested objects
+        """
+        path = self.base_url + 'viewer_data/stream_targets/{}'\
+            .format(stream_target_id)
+        return self._stream(path, key)
+
+    def _stream_target_ids(self):
+        """
+        Yields the ids of all the stream targets of the account, page by page
+        """
+        stream_targets = self.stream_targets_class(client=self.client)
+        for stream_target in stream_targets.iter_stream_targets():
+            yield stream_target['id']
+
+    def iter_viewer_report(self, stream_target_ids=None, max_workers=10,
+        deadline=None):
+        """
+        Fetches the viewer data of many stream targets concurrently (all of
+        them by default), and yields (stream_target_id, viewer_data, error)
+        tuples as the calls complete. Targets are fetched while their list
+        is still being paged through.
+        Requests stay within the rate limiter of the client, if any.
+        """
+        if stream_target_ids is None:
+            stream_target_ids = self._stream_target_ids()
+        return self._iter_many(self.viewer_data, stream_target_ids,
+            max_workers, deadline)
+
+    def viewer_report(self, stream_target_ids=None, max_workers=10,
+        deadline=None, report=None):
+        """
+        Returns a wowza.reports.ViewerReport with the viewer data of many
+        stream targets (all of them by default), fetched concurrently. See
+        #iter_viewer_report().
+        report: a ViewerReport to fill, which can be read from another
+            thread while the calls are in progress
+        """
+        report = ViewerReport() if report is None else report
+        for stream_target_id, data, error in self.iter_viewer_report(
+            stream_target_ids, max_workers, deadline):
+            report.add(stream_target_id, data, error)
+        return report